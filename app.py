@@ -2,7 +2,14 @@
 
 import streamlit as st
 from components.styles.theme import apply_theme
-from components.data_loader import load_data, display_data_preview
+from components import profiling, settings, sql_backend
+from components.data_loader import (
+    load_data,
+    load_data_streaming,
+    load_data_sql,
+    display_data_preview,
+    display_cache_info
+)
 from components.download_section import display_download_section
 from components.analysis import (
     display_rfm_analysis,
@@ -22,6 +29,9 @@ st.set_page_config(
 # Apply theme
 apply_theme()
 
+# Rekam waktu dan memori per stage untuk rerun ini
+profile_run = profiling.start_run()
+
 # Header
 st.markdown("<h1 style='text-align: center;'>🛒 Customer Behavior Analysis Dashboard</h1>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; font-size: 1.2em;'>Analisis perilaku pelanggan menggunakan RFM Analysis</p>", unsafe_allow_html=True)
@@ -53,41 +63,80 @@ with col2:
         </a>
     """, unsafe_allow_html=True)
 
-# Create tabs
+# Create tabs: hanya tab yang sedang dibuka yang dijalankan (lazy)
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📊 Overview",
     "👥 RFM Analysis",
     "📉 Churn Analysis",
     "🛍️ Market Basket",
     "💰 Customer Lifetime Value"
-])
+], key="active_tab", on_change="rerun")
+
+# Cara membaca data: in-memory, streaming per chunk, atau SQL engine (opsional)
+load_modes = {
+    'memory': "In-memory (pandas)",
+    'stream': "🌊 Streaming",
+    'sql': "🦆 SQL engine (DuckDB)"
+}
+if not sql_backend.AVAILABLE:
+    del load_modes['sql']
+
+# File yang lebih besar dari RAM otomatis dibaca per chunk atau dengan SQL engine
+large_file = uploaded_file is not None and uploaded_file.size > settings.STREAMING_THRESHOLD_MB * 1024 * 1024
+default_mode = ('sql' if sql_backend.AVAILABLE else 'stream') if large_file else 'memory'
+load_mode = st.sidebar.radio(
+    "Load mode",
+    list(load_modes),
+    index=list(load_modes).index(default_mode),
+    format_func=load_modes.get,
+    help="Streaming membaca CSV per chunk dan hanya menyimpan agregat per customer. "
+         "SQL engine menghitung agregat dengan DuckDB (multi-thread, spill ke disk) dan hasilnya "
+         "sama dengan mode in-memory. Association rules hanya tersedia pada mode in-memory."
+)
+loaders = {'memory': load_data, 'stream': load_data_streaming, 'sql': load_data_sql}
 
 # Load data
-df = load_data(uploaded_file)
-
-if df is not None:
-    # Overview Tab
-    with tab1:
-        st.markdown("## 📊 Overview")
-        display_data_preview(df)
-    
-    # RFM Analysis Tab
-    with tab2:
-        display_rfm_analysis(df)
-    
-    # Churn Analysis Tab
-    with tab3:
-        display_churn_analysis(df)
-    
-    # Market Basket Analysis Tab
-    with tab4:
-        display_market_basket_analysis(df)
-    
-    # Customer Lifetime Value Tab
-    with tab5:
-        display_clv_analysis(df)
-else:
-    # Show upload prompt in each tab
-    for tab in [tab1, tab2, tab3, tab4, tab5]:
-        with tab:
+with profiling.stage('load_data'):
+    df = loaders[load_mode](uploaded_file)
+
+@st.fragment
+def render_analysis(display, df):
+    """Run one analysis as a fragment so its widgets only rerun this tab."""
+    # Rerun fragment saja direkam sebagai run tersendiri
+    with profiling.run_scope('fragment') as (run, started), profiling.stage(display.__name__):
+        display(df)
+    if started:
+        profiling.remember_run(run)
+
+def display_overview(df):
+    st.markdown("## 📊 Overview")
+    display_data_preview(df)
+
+# Dataset cache statistics
+with st.sidebar.expander("🗄️ Dataset Cache"):
+    display_cache_info()
+
+analyses = [
+    (tab1, display_overview),
+    (tab2, display_rfm_analysis),
+    (tab3, display_churn_analysis),
+    (tab4, display_market_basket_analysis),
+    (tab5, display_clv_analysis)
+]
+
+for tab, display in analyses:
+    # Analisis di tab yang tidak dibuka tidak dihitung sama sekali
+    if not tab.open:
+        continue
+    with tab:
+        if df is not None:
+            render_analysis(display, df)
+        else:
+            # Show upload prompt
             st.info("📤 Upload dataset untuk memulai analisis!")
+
+# Profiling panel (opsional)
+profiling.remember_run(profiling.finish_run(profile_run))
+if st.sidebar.toggle("⏱️ Profiling", key="profiling", help="Waktu, jumlah baris dan perubahan memori per stage"):
+    with st.sidebar.expander("⏱️ Profiling", expanded=True):
+        profiling.display_profile_panel(st.session_state['profile_runs'])
@@ -0,0 +1,69 @@
+"""Benchmark customer aggregation: per-group lambdas vs the shared vectorized table.
+
+Usage:
+    python -m benchmarks.bench_customer_aggregates --customers 1000 10000 100000
+"""
+
+import argparse
+
+import pandas as pd
+
+from components.aggregates import build_aggregates
+from components.analysis.churn_analysis import calculate_churn
+from components.analysis.clv_analysis import calculate_clv
+from components.analysis.rfm_analysis import calculate_rfm, score_rfm
+
+from .common import best_time, synthetic_transactions
+
+
+def legacy_customer_analyses(df: pd.DataFrame):
+    """The pre-vectorization implementation: three groupbys with Python callbacks."""
+    reference_date = df['InvoiceDate'].max() + pd.DateOffset(days=1)
+    rfm = df.groupby('CustomerID', observed=True).agg({
+        'InvoiceDate': lambda x: (reference_date - x.max()).days,
+        'InvoiceNo': 'count',
+        'TotalAmount': 'sum'
+    }).reset_index()
+    rfm.columns = ['CustomerID', 'Recency', 'Frequency', 'Monetary']
+    score_rfm(rfm)
+
+    reference_date = df['InvoiceDate'].max()
+    last_purchase = df.groupby('CustomerID', observed=True)['InvoiceDate'].max().reset_index()
+    last_purchase['DaysSinceLastPurchase'] = (reference_date - last_purchase['InvoiceDate']).dt.days
+    last_purchase['Churned'] = last_purchase['DaysSinceLastPurchase'].apply(lambda x: 1 if x > 90 else 0)
+
+    clv = df.groupby('CustomerID', observed=True).agg({
+        'InvoiceDate': lambda x: (reference_date - x.max()).days,
+        'InvoiceNo': 'count',
+        'TotalAmount': 'sum'
+    }).reset_index()
+    clv.columns = ['CustomerID', 'Recency', 'Frequency', 'Monetary']
+    clv['Churn_Probability'] = clv['Recency'].apply(lambda x: min(x + 1, 365)) / 365
+
+
+def vectorized_customer_analyses(df: pd.DataFrame):
+    """Current implementation: one aggregate pass shared by RFM, Churn and CLV."""
+    aggregates = build_aggregates(df)
+    calculate_rfm(aggregates)
+    calculate_churn(aggregates)
+    calculate_clv(aggregates)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--customers', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--rows-per-customer', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'customers':>10} {'rows':>10} {'lambda (s)':>11} {'vectorized (s)':>15} {'speedup':>8}")
+    for customers in args.customers:
+        rows = customers * args.rows_per_customer
+        df = synthetic_transactions(rows, customers)
+        before = best_time(legacy_customer_analyses, df, repeat=args.repeat)
+        after = best_time(vectorized_customer_analyses, df, repeat=args.repeat)
+        print(f"{customers:>10,} {rows:>10,} {before:>11.3f} {after:>15.3f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
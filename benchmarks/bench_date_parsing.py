@@ -0,0 +1,56 @@
+"""Benchmark InvoiceDate parsing: format inference by pandas vs detected format with fallback.
+
+The dates are written like the OnlineRetail file (``12/1/2010 8:26``); a
+fraction of them uses another format to exercise the fallback parser.
+
+Usage:
+    python -m benchmarks.bench_date_parsing --rows 100000 1000000 --odd-fraction 0.001
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from components.date_formats import parse_dates
+
+from .common import best_time, synthetic_transactions
+
+
+def date_strings(rows: int, odd_fraction: float, seed: int = 0) -> pd.Series:
+    """InvoiceDate column as read from the CSV, before parsing."""
+    dates = pd.Series(synthetic_transactions(rows, max(rows // 10, 1), seed=seed)['InvoiceDate'])
+    strings = (
+        dates.dt.month.astype(str) + '/' + dates.dt.day.astype(str) + '/' + dates.dt.year.astype(str) + ' '
+        + dates.dt.hour.astype(str) + ':' + dates.dt.strftime('%M')
+    )
+    odd = np.random.default_rng(seed).random(rows) < odd_fraction
+    strings[odd] = dates[odd].dt.strftime('%Y-%m-%d %H:%M:%S')
+    return strings
+
+
+def legacy_parse(values: pd.Series) -> pd.Series:
+    """The previous implementation: pandas infers the format from the first value."""
+    return pd.to_datetime(values, errors='coerce')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--odd-fraction', type=float, default=0.001, help="Share of dates in another format")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'unique':>8} {'legacy (s)':>11} {'detected (s)':>13} {'rows/s':>12} "
+          f"{'fallback':>9} {'legacy NaT':>11} {'NaT':>5}")
+    for rows in args.rows:
+        values = date_strings(rows, args.odd_fraction)
+        before = best_time(legacy_parse, values, repeat=args.repeat)
+        after = best_time(parse_dates, values, repeat=args.repeat)
+        _, stats = parse_dates(values)
+        print(f"{rows:>10,} {stats['unique_values']:>8,} {before:>11.3f} {after:>13.3f} {rows / after:>12,.0f} "
+              f"{stats['fallback_rows']:>9,} {int(legacy_parse(values).isna().sum()):>11,} {stats['coerced_rows']:>5,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark incremental itemset maintenance against mining from scratch.
+
+Usage:
+    python -m benchmarks.bench_incremental_itemsets --rows 2000000 --delta 0.03 --support 0.005
+"""
+
+import argparse
+import time
+
+from components.analysis.incremental_itemsets import build_itemset_state, update_itemset_state
+from components.analysis.itemsets import mine_frequent_itemsets
+from components.analysis.market_basket import prepare_basket_data
+from components.analysis.sparse_basket import build_sparse_basket
+
+from .common import synthetic_transactions
+
+
+def _basket(df):
+    df_filtered, _ = prepare_basket_data(df)
+    return build_sparse_basket(df_filtered)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--delta', type=float, default=0.03, help='Fraction of invoices appended')
+    parser.add_argument('--support', type=float, default=0.005)
+    parser.add_argument('--engines', nargs='+', default=['eclat', 'apriori'])
+    args = parser.parse_args(argv)
+
+    df = synthetic_transactions(args.rows, args.customers, products=args.products)
+    invoices = df['InvoiceNo'].unique()
+    appended = df['InvoiceNo'].isin(invoices[int(len(invoices) * (1 - args.delta)):])
+    state = build_itemset_state(_basket(df[~appended]), args.support)
+
+    start = time.perf_counter()
+    updated, report = update_itemset_state(state, _basket(df[appended]))
+    incremental = time.perf_counter() - start
+    result = updated.frequent_itemsets()
+    result = dict(zip(result['itemsets'], result['support']))
+
+    print(f"{report['new_transactions']:,} new invoices on {state.n_transactions:,}, support {args.support}: "
+          f"{report['rescanned_candidates']:,} candidates rescanned, "
+          f"{report['added']:,} itemsets added, {report['removed']:,} removed")
+    print(f"{'method':>12} {'seconds':>9} {'identical':>10}")
+    print(f"{'incremental':>12} {incremental:>9.3f} {'':>10}")
+    for engine in args.engines:
+        start = time.perf_counter()
+        reference = mine_frequent_itemsets(_basket(df), args.support, engine=engine)
+        seconds = time.perf_counter() - start
+        reference = dict(zip(reference['itemsets'], reference['support']))
+        identical = 'yes' if reference.keys() == result.keys() and all(
+            abs(reference[key] - result[key]) < 1e-12 for key in reference
+        ) else 'NO'
+        print(f"{engine:>12} {seconds:>9.3f} {identical:>10}")
+
+
+if __name__ == '__main__':
+    main()
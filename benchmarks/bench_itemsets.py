@@ -0,0 +1,52 @@
+"""Benchmark the frequent itemset engines at several support levels.
+
+Every engine's result is checked against the apriori reference.
+
+Usage:
+    python -m benchmarks.bench_itemsets --rows 200000 --products 1000 --supports 0.05 0.02 0.01 0.005
+"""
+
+import argparse
+
+from components.analysis.itemsets import ITEMSET_ENGINES, choose_engine, mine_frequent_itemsets
+from components.analysis.market_basket import prepare_basket_data
+from components.analysis.sparse_basket import build_sparse_basket
+
+from .common import best_time, synthetic_transactions
+
+
+def _as_dict(itemsets):
+    return dict(zip(itemsets['itemsets'], itemsets['support']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--customers', type=int, default=5000)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--supports', type=float, nargs='+', default=[0.05, 0.02, 0.01, 0.005])
+    parser.add_argument('--engines', nargs='+', default=list(ITEMSET_ENGINES))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    df = synthetic_transactions(args.rows, args.customers, products=args.products)
+    df_filtered, _ = prepare_basket_data(df)
+    basket = build_sparse_basket(df_filtered)
+    print(f"{basket.n_transactions:,} transactions x {basket.n_items:,} products, density {basket.density:.4f}")
+
+    header = f"{'support':>8} {'itemsets':>9} {'auto':>7}" + ''.join(f" {engine:>10}" for engine in args.engines)
+    print(header)
+    for min_support in args.supports:
+        reference = _as_dict(mine_frequent_itemsets(basket, min_support, engine='apriori'))
+        cells = []
+        for engine in args.engines:
+            result = _as_dict(mine_frequent_itemsets(basket, min_support, engine=engine))
+            seconds = best_time(mine_frequent_itemsets, basket, min_support, engine=engine, repeat=args.repeat)
+            mark = '' if result == reference else '!'
+            cells.append(f" {seconds:>9.3f}{mark or 's'}")
+        print(f"{min_support:>8} {len(reference):>9,} {choose_engine(basket, min_support):>7}" + ''.join(cells))
+    print("(s = seconds, ! = result differs from apriori)")
+
+
+if __name__ == '__main__':
+    main()
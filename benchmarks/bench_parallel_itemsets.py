@@ -0,0 +1,55 @@
+"""Benchmark SON-style parallel itemset mining against a single process.
+
+Usage:
+    python -m benchmarks.bench_parallel_itemsets --rows 2000000 --workers 1 2 4 --support 0.002
+"""
+
+import argparse
+
+from components.analysis.itemsets import mine_frequent_itemsets
+from components.analysis.market_basket import prepare_basket_data
+from components.analysis.parallel_itemsets import mine_frequent_itemsets_parallel
+from components.analysis.sparse_basket import build_sparse_basket
+
+from .common import best_time, synthetic_transactions
+
+
+def _as_dict(itemsets):
+    return dict(zip(itemsets['itemsets'], itemsets['support']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--products', type=int, default=4000)
+    parser.add_argument('--support', type=float, default=0.002)
+    parser.add_argument('--engine', default='eclat')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    df = synthetic_transactions(args.rows, args.customers, products=args.products)
+    df_filtered, _ = prepare_basket_data(df)
+    basket = build_sparse_basket(df_filtered)
+    print(f"{basket.n_transactions:,} transactions x {basket.n_items:,} products, "
+          f"support {args.support}, engine {args.engine}")
+
+    reference = _as_dict(mine_frequent_itemsets(basket, args.support, engine=args.engine))
+    baseline = best_time(mine_frequent_itemsets, basket, args.support, engine=args.engine, repeat=args.repeat)
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+    print(f"{'single':>8} {baseline:>9.3f} {1.0:>7.1f}x {'yes':>10}")
+    for workers in args.workers:
+        result = _as_dict(mine_frequent_itemsets_parallel(basket, args.support, engine=args.engine, workers=workers))
+        seconds = best_time(
+            mine_frequent_itemsets_parallel, basket, args.support,
+            engine=args.engine, workers=workers, repeat=args.repeat
+        )
+        identical = 'yes' if result.keys() == reference.keys() and all(
+            abs(result[key] - reference[key]) < 1e-12 for key in reference
+        ) else 'NO'
+        print(f"{workers:>8} {seconds:>9.3f} {baseline / seconds:>7.1f}x {identical:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark recommendation lookups: rule index vs scanning the rules frame.
+
+Usage:
+    python -m benchmarks.bench_recommendations --rows 4000000 --products 2000 --support 0.00001
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from components.analysis.market_basket import prepare_basket_data
+from components.analysis.pair_rules import pairwise_rules
+from components.analysis.recommendations import RuleIndex
+from components.analysis.sparse_basket import build_sparse_basket
+
+from .common import synthetic_transactions
+
+
+def scan(rules, product, k):
+    """Reference lookup: filter the full rules frame for every query."""
+    matches = rules[rules['antecedents'] == frozenset([product])]
+    return matches.sort_values(['lift', 'confidence'], ascending=False).head(k)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=4000000)
+    parser.add_argument('--customers', type=int, default=20000)
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--support', type=float, default=0.00001)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('-k', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = synthetic_transactions(args.rows, args.customers, products=args.products)
+    df_filtered, _ = prepare_basket_data(df)
+    rules = pairwise_rules(build_sparse_basket(df_filtered), args.support)
+
+    start = time.perf_counter()
+    index = RuleIndex(rules)
+    build = time.perf_counter() - start
+    print(f"{len(rules):,} rules, {len(index.items):,} antecedent products, index built in {build:.2f}s")
+
+    products = np.random.default_rng(0).choice(index.items, args.queries)
+    start = time.perf_counter()
+    results = [index.recommend([product], k=args.k) for product in products]
+    indexed = (time.perf_counter() - start) / args.queries
+
+    scanned_queries = products[:max(1, args.queries // 20)]
+    start = time.perf_counter()
+    references = [scan(rules, product, args.k) for product in scanned_queries]
+    scanned = (time.perf_counter() - start) / len(scanned_queries)
+
+    identical = all(
+        list(result['consequents']) == list(reference['consequents'])
+        for result, reference in zip(results, references)
+    )
+    print(f"{'method':>8} {'ms/query':>9}")
+    print(f"{'index':>8} {indexed * 1000:>9.3f}")
+    print(f"{'scan':>8} {scanned * 1000:>9.3f}")
+    print(f"identical top-{args.k}: {'yes' if identical else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Shared helpers for the benchmarks."""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_transactions(rows: int, customers: int, products: int = 500, seed: int = 0) -> pd.DataFrame:
+    """Build a cleaned, compact transaction frame with the dashboard schema."""
+    rng = np.random.default_rng(seed)
+    invoices = max(rows // 10, 1)
+
+    invoice_ids = np.sort(rng.integers(0, invoices, rows))
+    # Setiap invoice milik satu customer, tanggal naik mengikuti nomor invoice
+    invoice_customer = rng.integers(0, customers, invoices)
+    invoice_minutes = np.sort(rng.integers(0, 365 * 24 * 60, invoices))
+    product_ids = rng.zipf(1.5, rows) % products
+
+    product_names = pd.Categorical.from_codes(
+        product_ids, [f"PRODUCT {i}" for i in range(products)]
+    )
+    df = pd.DataFrame({
+        'InvoiceNo': pd.Categorical.from_codes(
+            invoice_ids, [str(536365 + i) for i in range(invoices)]
+        ),
+        'StockCode': pd.Categorical.from_codes(
+            product_ids, [f"{10000 + i}" for i in range(products)]
+        ),
+        'Description': product_names,
+        'Quantity': rng.integers(1, 13, rows).astype('int16'),
+        'InvoiceDate': pd.Timestamp('2010-12-01') + pd.to_timedelta(invoice_minutes[invoice_ids], unit='m'),
+        'UnitPrice': np.round(rng.gamma(2.0, 2.0, rows) + 0.1, 2),
+        'CustomerID': pd.Categorical.from_codes(
+            invoice_customer[invoice_ids], [str(12346 + i) for i in range(customers)]
+        ),
+        'Country': pd.Categorical.from_codes(
+            rng.integers(0, 5, rows), ['United Kingdom', 'Germany', 'France', 'EIRE', 'Spain']
+        )
+    })
+    df['TotalAmount'] = df['Quantity'] * df['UnitPrice']
+    return df
+
+
+def best_time(func, *args, repeat: int = 3, **kwargs) -> float:
+    """Return the best wall time in seconds over ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,210 @@
+"""Parity check: results of the optional engines against the pandas path.
+
+Every dataset is loaded with ``load_transactions`` (pandas) and compared with:
+
+* sql: ``sql_aggregates`` twice, once from the CSV and once from the Parquet
+  dataset cache entry written by the pandas load.
+* polars: ``load_transactions`` and ``stream_aggregates`` with
+  ``DASHBOARD_ENGINE=polars``; the cleaned frame must be identical. Streamed
+  customer sums are merged from partial sums, so they are compared with the
+  summary statistics tolerance, like chunked pandas streaming.
+
+Customer aggregates, the RFM, churn and CLV tables, the overview numbers and
+the Market Basket item statistics must be equal; summary statistics (mean,
+std, quartiles) may differ by floating point rounding only.
+
+Usage:
+    python -m benchmarks.parity OnlineRetail.csv
+    python -m benchmarks.parity --sizes 10k 1M --engines polars
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from components import dataset_cache, memo, polars_engine, settings, sql_backend
+from components.aggregates import NUMERIC_COLUMNS, build_aggregates
+from components.analysis.churn_analysis import calculate_churn
+from components.analysis.clv_analysis import calculate_clv
+from components.analysis.market_basket import build_basket
+from components.analysis.rfm_analysis import calculate_rfm
+from components.data_loader import load_transactions, sql_aggregates, stream_aggregates
+
+from .suite import dataset_path, parse_size
+
+# Toleransi relatif untuk statistik ringkasan (mean, std, kuartil)
+DESCRIBE_RTOL = 1e-9
+
+ENGINES = {'sql': sql_backend.AVAILABLE, 'polars': polars_engine.AVAILABLE}
+
+# Tabel per pelanggan yang dibandingkan persis
+TABLES = {
+    'customers': lambda data: data.customers if hasattr(data, 'customers') else build_aggregates(data).customers,
+    'rfm': calculate_rfm,
+    'churn': calculate_churn,
+    'clv': calculate_clv
+}
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Text columns as plain strings, so categorical and object columns compare equal."""
+    frame = frame.copy()
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype) or frame[column].dtype == object:
+            frame[column] = frame[column].astype(str)
+    return frame.reset_index(drop=True)
+
+
+def _item_stats(item_stats: pd.DataFrame) -> pd.DataFrame:
+    """Item statistics with ties in Transaction_Count ordered by Description."""
+    frame = _normalize(item_stats.reset_index())
+    return frame.sort_values(['Transaction_Count', 'Description'], ascending=[False, True]).reset_index(drop=True)
+
+
+@contextlib.contextmanager
+def use_engine(engine: str):
+    """Temporarily switch ``settings.ENGINE``; memoized results of the other engine are dropped."""
+    previous = settings.ENGINE
+    settings.ENGINE = engine
+    memo.clear()
+    try:
+        yield
+    finally:
+        settings.ENGINE = previous
+        memo.clear()
+
+
+def _table_check(expected: pd.DataFrame, actual: pd.DataFrame, exact: bool = True):
+    tolerance = {'check_exact': True} if exact else {'rtol': DESCRIBE_RTOL}
+    return lambda: pd.testing.assert_frame_equal(_normalize(expected), _normalize(actual), **tolerance)
+
+
+def _run_checks(checks: dict) -> list:
+    failed = []
+    for name, check in checks.items():
+        try:
+            check()
+        except AssertionError as e:
+            print(f"    {name}: MISMATCH\n{e}", file=sys.stderr)
+            failed.append(name)
+    return failed
+
+
+def compare(df: pd.DataFrame, aggregates, exact: bool = True) -> list:
+    """Return the names of the results that differ between the pandas frame and the aggregates."""
+    checks = {name: _table_check(table(df), table(aggregates), exact) for name, table in TABLES.items()}
+    checks['overview'] = lambda: _assert_overview(df, aggregates.overview)
+    checks['describe'] = lambda: pd.testing.assert_frame_equal(
+        df[NUMERIC_COLUMNS].describe(), aggregates.overview['describe'],
+        check_dtype=False, rtol=DESCRIBE_RTOL)
+    if 'item_stats' in aggregates.overview:
+        checks['basket items'] = lambda: pd.testing.assert_frame_equal(
+            _item_stats(build_basket(df)[0]), _item_stats(aggregates.overview['item_stats']), check_exact=True)
+        checks['basket summary'] = lambda: _assert_basket_summary(df, aggregates.overview['basket_summary'])
+    return _run_checks(checks)
+
+
+def _assert_overview(df: pd.DataFrame, overview: dict):
+    expected = {
+        'records': len(df),
+        'min_date': df['InvoiceDate'].min(),
+        'max_date': df['InvoiceDate'].max(),
+        'customers': df['CustomerID'].nunique()
+    }
+    actual = {key: overview[key] for key in expected}
+    assert actual == expected, f"{actual} != {expected}"
+
+
+def _assert_basket_summary(df: pd.DataFrame, summary: dict):
+    expected = dict(build_basket(df)[1])
+    expected.pop('limited')
+    assert summary == expected, f"{summary} != {expected}"
+
+
+def _report(label: str, mismatches: list) -> list:
+    print(f"  {label}: {'OK' if not mismatches else 'MISMATCH ' + ', '.join(mismatches)}")
+    return [f"{label}: {name}" for name in mismatches]
+
+
+def check_sql(path: str) -> list:
+    """Compare both SQL inputs (CSV and Parquet cache) with the pandas path for one file."""
+    failed = []
+    dataset_cache.clear()
+    memo.clear()
+    with open(path, 'rb') as f:
+        from_csv = sql_aggregates(f)
+        df = load_transactions(f)
+        from_cache = sql_aggregates(f)
+    for aggregates in (from_csv, from_cache):
+        failed += _report(f"sql ({aggregates.attrs['load_report']['sql_input']})", compare(df, aggregates))
+    return failed
+
+
+def check_polars(path: str) -> list:
+    """Compare the Polars load, customer tables and streaming aggregates with the pandas path."""
+    dataset_cache.clear()
+    with open(path, 'rb') as f:
+        with use_engine('pandas'):
+            df = load_transactions(f)
+            expected = {name: table(df) for name, table in TABLES.items()}
+        # Tanpa cache, supaya engine polars benar-benar membaca CSV
+        dataset_cache.clear()
+        with use_engine('polars'):
+            polars_df = load_transactions(f)
+            actual = {name: table(polars_df) for name, table in TABLES.items()}
+            streamed = stream_aggregates(f)
+    engine = polars_df.attrs['load_report'].get('engine', 'pandas fallback')
+
+    checks = {
+        'transactions': lambda: pd.testing.assert_frame_equal(df, polars_df, check_exact=True)
+    }
+    checks.update({name: _table_check(expected[name], actual[name]) for name in TABLES})
+    failed = _report(f"polars load ({engine})", _run_checks(checks))
+    with use_engine('pandas'):
+        engine = streamed.attrs['load_report'].get('engine', 'pandas fallback')
+        failed += _report(f"polars stream ({engine})", compare(df, streamed, exact=False))
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='*', help="Transaction CSV files")
+    parser.add_argument('--sizes', nargs='+', default=[], help="Synthetic datasets, e.g. 10k 1M")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'dashboard-benchmarks'),
+                        help="Where the synthetic CSVs are generated and reused")
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+                        default=[engine for engine, available in ENGINES.items() if available],
+                        help="Engines to check, default: every installed one")
+    args = parser.parse_args(argv)
+
+    missing = [engine for engine in args.engines if not ENGINES[engine]]
+    if missing or not args.engines:
+        parser.error(f"engine(s) not installed: {', '.join(missing) or 'duckdb, polars'}")
+    checks = {'sql': check_sql, 'polars': check_polars}
+    inputs = args.inputs + [dataset_path(parse_size(size), args.data_dir) for size in args.sizes]
+    if not inputs:
+        parser.error("no input files or --sizes given")
+
+    # Cache dataset parity terpisah dari cache dashboard
+    cache_dir = settings.CACHE_DIR
+    settings.CACHE_DIR = tempfile.mkdtemp(prefix='parity-cache-')
+    failed = []
+    try:
+        for path in inputs:
+            print(path)
+            for engine in args.engines:
+                failed.extend(f"{path} {name}" for name in checks[engine](path))
+    finally:
+        dataset_cache.clear()
+        os.rmdir(settings.CACHE_DIR)
+        settings.CACHE_DIR = cache_dir
+    print(f"{len(failed)} mismatch(es)")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
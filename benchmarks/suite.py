@@ -0,0 +1,232 @@
+"""Benchmark suite: ingestion and every analysis step at several dataset sizes.
+
+Each step is timed (best of ``--repeat`` runs, memo cleared before every
+run) and run once more under ``tracemalloc`` for its peak memory. Results
+are written as JSON; ``compare`` flags steps that got slower or use more
+memory than a baseline by more than a threshold.
+
+Usage:
+    python -m benchmarks.suite run --sizes 10k 100k 1M --output baseline.json
+    python -m benchmarks.suite run --sizes 10k 100k 1M --output current.json --compare baseline.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from components import dataset_cache, memo, settings
+from components.analysis.churn_analysis import calculate_churn
+from components.analysis.clv_analysis import calculate_clv
+from components.analysis.market_basket import mine_rules, optimize_basket_data, prepare_basket_data
+from components.analysis.rfm_analysis import calculate_rfm
+from components.analysis.sparse_basket import build_sparse_basket
+from components.data_loader import load_data
+from components.sample_data import write_sample_csv
+
+# Versi format file hasil; naikkan jika struktur JSON berubah
+RESULTS_VERSION = 1
+
+STEPS = [
+    'load_data', 'load_data_cached', 'calculate_rfm', 'calculate_churn', 'calculate_clv',
+    'prepare_basket_data', 'optimize_basket_data', 'mine_rules'
+]
+
+# Support untuk langkah apriori/rules (default slider Market Basket)
+RULES_SUPPORT = 0.02
+
+_SUFFIXES = {'k': 1000, 'm': 1000000}
+
+
+def parse_size(text: str) -> int:
+    """'10k' -> 10000, '1M' -> 1000000."""
+    suffix = text[-1].lower()
+    if suffix in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[suffix])
+    return int(text)
+
+
+def dataset_path(rows: int, data_dir: str) -> str:
+    """Synthetic CSV of ``rows`` lines, generated once and reused across runs."""
+    customers = min(max(rows // 100, 500), 200000)
+    products = min(max(rows // 500, 100), 5000)
+    path = os.path.join(data_dir, f"transactions_{rows}_{customers}_{products}.csv")
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        print(f"generating {rows:,} rows -> {path}", file=sys.stderr)
+        write_sample_csv(path + '.tmp', rows, customers=customers, products=products, seed=0)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def measure(func, repeat: int) -> dict:
+    """Best wall time over ``repeat`` runs and the traced peak memory of one more run."""
+    timings = []
+    for _ in range(repeat):
+        memo.clear()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    memo.clear()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(timings), 'peak_mb': peak / (1024 * 1024)}
+
+
+def run_size(path: str, repeat: int) -> dict:
+    """Time every step on one dataset."""
+    def load_cold():
+        dataset_cache.clear()
+        with open(path, 'rb') as f:
+            # Tanpa st.cache_data, supaya setiap run benar-benar membaca file
+            return load_data.__wrapped__(f)
+
+    def load_cached():
+        with open(path, 'rb') as f:
+            return load_data.__wrapped__(f)
+
+    # Input setiap langkah disiapkan sekali, di luar pengukuran
+    df = load_cold()
+    df_filtered, item_stats = prepare_basket_data(df)
+    optimized = optimize_basket_data(df_filtered, item_stats)
+    basket = build_sparse_basket(optimized)
+
+    steps = {
+        'load_data': load_cold,
+        'load_data_cached': load_cached,
+        'calculate_rfm': lambda: calculate_rfm(df),
+        'calculate_churn': lambda: calculate_churn(df),
+        'calculate_clv': lambda: calculate_clv(df),
+        'prepare_basket_data': lambda: prepare_basket_data(df),
+        'optimize_basket_data': lambda: optimize_basket_data(df_filtered, item_stats),
+        'mine_rules': lambda: mine_rules(basket, RULES_SUPPORT, 'apriori', 1)
+    }
+    results = {}
+    for name in STEPS:
+        results[name] = measure(steps[name], repeat)
+        print(f"  {name:<22}{results[name]['seconds']:>10.3f}s{results[name]['peak_mb']:>10.1f} MB", file=sys.stderr)
+    return {'rows': len(df), 'steps': results}
+
+
+def run(sizes, repeat: int, data_dir: str) -> dict:
+    """Run the suite at every size and return the results document."""
+    document = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat
+        },
+        'results': {}
+    }
+    # Cache dataset benchmark terpisah dari cache dashboard
+    cache_dir = settings.CACHE_DIR
+    settings.CACHE_DIR = os.path.join(data_dir, 'dataset-cache')
+    try:
+        for size in sizes:
+            print(f"{size} rows", file=sys.stderr)
+            document['results'][size] = run_size(dataset_path(parse_size(size), data_dir), repeat)
+    finally:
+        dataset_cache.clear()
+        settings.CACHE_DIR = cache_dir
+    return document
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_seconds: float) -> list:
+    """Print a comparison table and return the regressions.
+
+    A step regresses when its time or peak memory grew by more than
+    ``threshold`` (0.2 = 20%). Steps faster than ``min_seconds`` in the
+    baseline are only checked for memory, their timing is mostly noise.
+    """
+    regressions = []
+    print(f"{'size':<8}{'step':<22}{'base s':>10}{'now s':>10}{'time':>9}{'base MB':>10}{'now MB':>10}{'memory':>9}")
+    for size, result in current['results'].items():
+        if size not in baseline['results']:
+            continue
+        for step, now in result['steps'].items():
+            base = baseline['results'][size]['steps'].get(step)
+            if base is None:
+                continue
+            time_change = now['seconds'] / base['seconds'] - 1 if base['seconds'] else 0.0
+            memory_change = now['peak_mb'] / base['peak_mb'] - 1 if base['peak_mb'] else 0.0
+            flags = []
+            if base['seconds'] >= min_seconds and time_change > threshold:
+                flags.append('time')
+            if memory_change > threshold:
+                flags.append('memory')
+            if flags:
+                regressions.append({'size': size, 'step': step, 'regressed': flags,
+                                    'time_change': time_change, 'memory_change': memory_change})
+            print(f"{size:<8}{step:<22}{base['seconds']:>10.3f}{now['seconds']:>10.3f}{time_change:>+9.0%}"
+                  f"{base['peak_mb']:>10.1f}{now['peak_mb']:>10.1f}{memory_change:>+9.0%}"
+                  + (f"  REGRESSION ({', '.join(flags)})" if flags else ''))
+    return regressions
+
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        document = json.load(f)
+    if document.get('version') != RESULTS_VERSION:
+        raise SystemExit(f"{path}: unsupported results version {document.get('version')}")
+    return document
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="Run the suite and write the results")
+    run_parser.add_argument('--sizes', nargs='+', default=['10k', '100k', '1M'], help="e.g. 10k 100k 1M 10M")
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', '-o', default='benchmark_results.json')
+    run_parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'dashboard-benchmarks'),
+                            help="Where the synthetic CSVs are generated and reused")
+    run_parser.add_argument('--compare', metavar='BASELINE', help="Compare against a baseline after the run")
+
+    compare_parser = commands.add_parser('compare', help="Compare two result files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+
+    for sub_parser in (run_parser, compare_parser):
+        sub_parser.add_argument('--threshold', type=float, default=0.2, help="Allowed growth (0.2 = 20%%)")
+        sub_parser.add_argument('--min-seconds', type=float, default=0.01,
+                                help="Ignore timing changes of steps faster than this in the baseline")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        current = run(args.sizes, args.repeat, args.data_dir)
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"results written to {args.output}", file=sys.stderr)
+        if not args.compare:
+            return 0
+        baseline = _load(args.compare)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    regressions = compare(baseline, current, args.threshold, args.min_seconds)
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Shared per-customer aggregates for the customer analyses.
+
+RFM, Churn and CLV all read one per-customer table built in a single
+groupby pass. The same table can be built incrementally from chunks
+(streaming ingestion), so peak memory depends on the number of customers
+instead of the number of rows.
+"""
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from .memo import memoize
+
+# Kolom numerik yang diringkas untuk tab Overview
+NUMERIC_COLUMNS = ['Quantity', 'UnitPrice', 'TotalAmount']
+
+# Jumlah baris sample acak yang disimpan untuk estimasi kuartil
+SAMPLE_ROWS = 10000
+
+# Agregat per customer: nama kolom -> (kolom sumber, fungsi agregasi).
+# Metrik per customer baru ditambahkan di sini supaya ikut terhitung dalam
+# satu pass yang sama, bukan dengan groupby tambahan di modul analisis.
+CUSTOMER_AGGREGATIONS = {
+    'FirstPurchaseDate': ('InvoiceDate', 'min'),
+    'LastPurchaseDate': ('InvoiceDate', 'max'),
+    'Frequency': ('InvoiceNo', 'count'),  # Jumlah baris transaksi
+    'Monetary': ('TotalAmount', 'sum')
+}
+
+# Cara menggabungkan hasil agregasi parsial (misalnya dari beberapa chunk).
+# Hanya reduksi bawaan pandas (vektor, tanpa callback Python per grup) yang didukung.
+_MERGE_FUNCTIONS = {'min': 'min', 'max': 'max', 'count': 'sum', 'sum': 'sum'}
+
+
+class TransactionAggregates:
+    """Aggregated view of a cleaned transaction set.
+
+    Attributes:
+        customers: DataFrame with CustomerID and the columns of
+            ``CUSTOMER_AGGREGATIONS``
+        overview: dict with records, min_date, max_date and customers;
+            streamed aggregates also carry describe, head and sample_rows,
+            SQL engine aggregates describe, head, item_stats and basket_summary
+        attrs: Free-form metadata, mirrors ``pd.DataFrame.attrs``
+    """
+
+    def __init__(self, customers: pd.DataFrame, overview: dict):
+        self.customers = customers
+        self.overview = overview
+        self.attrs = {}
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the aggregates, used as cache key."""
+        if self._fingerprint is None:
+            row_hashes = pd.util.hash_pandas_object(self.customers, index=False)
+            self._fingerprint = f"{self.overview['records']}-{int(row_hashes.sum())}"
+        return self._fingerprint
+
+    @property
+    def reference_date(self):
+        """Last transaction date in the dataset."""
+        return self.overview['max_date']
+
+    def recency_days(self, offset_days: int = 0) -> pd.Series:
+        """Whole days between each customer's last purchase and the reference date.
+
+        Args:
+            offset_days: Days added to the reference date before subtracting
+        """
+        reference_date = self.reference_date + pd.Timedelta(days=offset_days)
+        return (reference_date - self.customers['LastPurchaseDate']).dt.days
+
+
+def customer_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate transactions per customer in one groupby pass.
+
+    Runs on Polars' multi-threaded group-by when ``settings.ENGINE`` is 'polars'.
+
+    Returns:
+        pd.DataFrame: One row per CustomerID (index) with the columns of
+        ``CUSTOMER_AGGREGATIONS``
+    """
+    unsupported = [
+        column for column, (_, function) in CUSTOMER_AGGREGATIONS.items()
+        if function not in _MERGE_FUNCTIONS
+    ]
+    if unsupported:
+        # Lambda per grup dipanggil sekali per customer dan sangat lambat
+        raise ValueError(f"Customer aggregations must use built-in reductions: {unsupported}")
+
+    # Import lokal: polars_engine memakai konstanta dari modul ini
+    from . import polars_engine
+    if polars_engine.enabled():
+        return polars_engine.customer_table(df)
+
+    if 'TotalAmount' not in df.columns:
+        df = df.assign(TotalAmount=df['Quantity'] * df['UnitPrice'])
+    return df.groupby('CustomerID', observed=True).agg(**CUSTOMER_AGGREGATIONS)
+
+
+def merge_customer_tables(tables) -> pd.DataFrame:
+    """Combine partial customer tables built from disjoint transaction sets."""
+    merge = {
+        column: _MERGE_FUNCTIONS[function]
+        for column, (_, function) in CUSTOMER_AGGREGATIONS.items()
+    }
+    return pd.concat(tables).groupby(level=0).agg(merge)
+
+
+def _finish_customer_table(customers: pd.DataFrame) -> pd.DataFrame:
+    """Turn the CustomerID index into a regular column."""
+    return customers.reset_index().rename(columns={'index': 'CustomerID'})
+
+
+def build_aggregates(df: pd.DataFrame) -> TransactionAggregates:
+    """Build the shared customer aggregates from an in-memory transaction frame."""
+    customers = _finish_customer_table(customer_table(df))
+    overview = {
+        'records': len(df),
+        'min_date': df['InvoiceDate'].min(),
+        'max_date': df['InvoiceDate'].max(),
+        'customers': len(customers)
+    }
+    return TransactionAggregates(customers, overview)
+
+
+@memoize
+def _cached_aggregates(df: pd.DataFrame) -> TransactionAggregates:
+    return build_aggregates(df)
+
+
+def get_aggregates(df: Union[pd.DataFrame, TransactionAggregates]) -> TransactionAggregates:
+    """Return the cached customer aggregates for a dataset.
+
+    Aggregates that were already built (streaming mode) are returned as is.
+    """
+    if isinstance(df, TransactionAggregates):
+        return df
+    return _cached_aggregates(df)
+
+
+def _chunk_moments(values: pd.Series):
+    """Return (count, mean, M2, min, max) for one chunk of values."""
+    values = values.to_numpy(dtype='float64')
+    count = len(values)
+    mean = values.mean()
+    return count, mean, ((values - mean) ** 2).sum(), values.min(), values.max()
+
+
+def _merge_moments(left, right):
+    """Merge two (count, mean, M2, min, max) tuples (Chan et al.)."""
+    n_a, mean_a, m2_a, min_a, max_a = left
+    n_b, mean_b, m2_b, min_b, max_b = right
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta ** 2 * n_a * n_b / n
+    return n, mean, m2, min(min_a, min_b), max(max_a, max_b)
+
+
+class AggregateAccumulator:
+    """Fold cleaned transaction chunks into a ``TransactionAggregates``."""
+
+    def __init__(self, sample_rows: int = SAMPLE_ROWS, seed: int = 0):
+        self.sample_rows = sample_rows
+        self._rng = np.random.default_rng(seed)
+        self._customers = None
+        self._records = 0
+        self._min_date = None
+        self._max_date = None
+        self._moments = {}
+        self._sample = None
+        self._head = None
+
+    def update(self, chunk: pd.DataFrame):
+        """Add one cleaned chunk of transactions."""
+        if chunk.empty:
+            return
+
+        partial = customer_table(chunk)
+        if self._customers is None:
+            self._customers = partial
+        else:
+            self._customers = merge_customer_tables([self._customers, partial])
+
+        self._records += len(chunk)
+        chunk_min = chunk['InvoiceDate'].min()
+        chunk_max = chunk['InvoiceDate'].max()
+        self._min_date = chunk_min if self._min_date is None else min(self._min_date, chunk_min)
+        self._max_date = chunk_max if self._max_date is None else max(self._max_date, chunk_max)
+
+        for column in NUMERIC_COLUMNS:
+            moments = _chunk_moments(chunk[column])
+            if column in self._moments:
+                moments = _merge_moments(self._moments[column], moments)
+            self._moments[column] = moments
+
+        if self._head is None:
+            self._head = chunk.head()
+
+        self._update_sample(chunk)
+
+    def _update_sample(self, chunk: pd.DataFrame):
+        """Keep a uniform random sample using random priorities (bottom-k)."""
+        priority = self._rng.random(len(chunk))
+        if self._sample is not None and len(self._sample) >= self.sample_rows:
+            # Hanya baris dengan prioritas lebih kecil dari sample saat ini yang bisa masuk
+            keep = priority < self._sample['_priority'].max()
+            chunk, priority = chunk[keep], priority[keep]
+
+        candidates = chunk[NUMERIC_COLUMNS].assign(_priority=priority)
+        if self._sample is not None:
+            candidates = pd.concat([self._sample, candidates])
+        self._sample = candidates.nsmallest(self.sample_rows, '_priority')
+
+    def _describe(self) -> pd.DataFrame:
+        """Summary statistics: exact moments, quartiles estimated from the sample."""
+        stats = {}
+        for column in NUMERIC_COLUMNS:
+            count, mean, m2, minimum, maximum = self._moments[column]
+            quartiles = self._sample[column].quantile([0.25, 0.5, 0.75]).to_numpy()
+            stats[column] = [
+                count,
+                mean,
+                np.sqrt(m2 / (count - 1)) if count > 1 else np.nan,
+                minimum,
+                quartiles[0],
+                quartiles[1],
+                quartiles[2],
+                maximum
+            ]
+        return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def result(self) -> TransactionAggregates:
+        """Return the aggregates accumulated so far."""
+        if self._customers is None:
+            raise ValueError("No valid transactions found")
+
+        customers = _finish_customer_table(self._customers)
+        overview = {
+            'records': self._records,
+            'min_date': self._min_date,
+            'max_date': self._max_date,
+            'customers': len(customers),
+            'describe': self._describe(),
+            'head': self._head,
+            'sample_rows': len(self._sample)
+        }
+        return TransactionAggregates(customers, overview)
@@ -1,28 +1,81 @@
 """Churn Analysis component."""
 
+from typing import Union
 import streamlit as st
+import numpy as np
 import pandas as pd
 import altair as alt
+from ..aggregates import TransactionAggregates, get_aggregates
+from ..chart_data import histogram, mean_value
+from ..memo import memoize
 from ..metrics_card import metric_card
+from ..paged_table import display_paged_table
+from ..profiling import stage
 
-def calculate_churn(df: pd.DataFrame, churn_days: int = 90):
-    """Calculate churn metrics."""
-    # Calculate last purchase date
-    last_purchase = df.groupby('CustomerID')['InvoiceDate'].max().reset_index()
-    last_purchase.columns = ['CustomerID', 'LastPurchaseDate']
+@memoize
+def calculate_churn(df: Union[pd.DataFrame, TransactionAggregates], churn_days: int = 90):
+    """Calculate churn metrics from the shared customer aggregates."""
+    aggregates = get_aggregates(df)
     
-    # Reference date = last transaction date in dataset
-    reference_date = df['InvoiceDate'].max()
+    # Last purchase date per customer
+    last_purchase = aggregates.customers[['CustomerID', 'LastPurchaseDate']].copy()
     
-    # Calculate days since last purchase
-    last_purchase['DaysSinceLastPurchase'] = (reference_date - last_purchase['LastPurchaseDate']).dt.days
+    # Days since last purchase, relative to the last transaction date in dataset
+    last_purchase['DaysSinceLastPurchase'] = aggregates.recency_days()
     
-    # Flag churn: Not purchased in last 90 days
-    last_purchase['Churned'] = last_purchase['DaysSinceLastPurchase'].apply(lambda x: 1 if x > churn_days else 0)
+    # Flag churn: Not purchased in the last `churn_days` days
+    last_purchase['Churned'] = (last_purchase['DaysSinceLastPurchase'] > churn_days).astype(int)
     
     return last_purchase
 
-def display_churn_analysis(df: pd.DataFrame):
+class RecencyIndex:
+    """Sorted days-since-last-purchase of every customer.
+    
+    Churn counts for any threshold come from a binary search instead of a
+    pass over the customer table.
+    """
+    
+    def __init__(self, days_since_last_purchase):
+        self.sorted_days = np.sort(np.asarray(days_since_last_purchase, dtype='int64'))
+    
+    def __len__(self):
+        return len(self.sorted_days)
+    
+    def churned_count(self, churn_days: int) -> int:
+        """Number of customers whose last purchase is more than ``churn_days`` days ago."""
+        return len(self.sorted_days) - int(np.searchsorted(self.sorted_days, churn_days, side='right'))
+    
+    def churn_rate(self, churn_days: int) -> float:
+        """Churn rate in percent for a given threshold."""
+        if len(self.sorted_days) == 0:
+            return 0.0
+        return self.churned_count(churn_days) / len(self.sorted_days) * 100
+
+@memoize
+def build_churn_index(df: Union[pd.DataFrame, TransactionAggregates]):
+    """Build the customer churn table and its recency index once per dataset.
+    
+    Returns:
+        tuple: (customer table from ``calculate_churn``, RecencyIndex)
+    """
+    last_purchase = calculate_churn(df)
+    return last_purchase, RecencyIndex(last_purchase['DaysSinceLastPurchase'])
+
+def churn_table(df: Union[pd.DataFrame, TransactionAggregates], churn_days: int) -> pd.DataFrame:
+    """Customer churn table with Churned and Status labels for one churn window.
+    
+    Not memoized: the labels are one vectorized comparison on the memoized
+    table, and a memo entry per slider position would evict expensive results.
+    """
+    last_purchase, _ = build_churn_index(df)
+    # Hasil memo dipakai bersama, jadi kolom diubah pada view dangkal
+    last_purchase = last_purchase.copy(deep=False)
+    churned = last_purchase['DaysSinceLastPurchase'] > churn_days
+    last_purchase['Churned'] = churned.astype(int)
+    last_purchase['Status'] = np.where(churned, 'Churned', 'Active')
+    return last_purchase
+
+def display_churn_analysis(df: Union[pd.DataFrame, TransactionAggregates]):
     """Display Churn Analysis section."""
     st.markdown("## 📉 Churn Analysis")
     
@@ -31,7 +84,7 @@ def display_churn_analysis(df: pd.DataFrame):
         **Churn Analysis** adalah analisis untuk mengidentifikasi customer yang tidak aktif (churned).
         
         Dalam analisis ini:
-        - 🔴 **Churned**: Customer yang tidak berbelanja dalam 90 hari terakhir
+        - 🔴 **Churned**: Customer yang tidak berbelanja dalam N hari terakhir (default 90, bisa diatur)
         - 🟢 **Active**: Customer yang masih aktif berbelanja
         
         Metrics penting:
@@ -40,9 +93,20 @@ def display_churn_analysis(df: pd.DataFrame):
         - **Customer Status**: Active atau Churned
         """)
     
+    # Churn window
+    churn_days = st.slider(
+        "Churn window (days)",
+        min_value=1,
+        max_value=365,
+        value=90,
+        help="Customer dianggap churned jika tidak berbelanja lebih lama dari jumlah hari ini"
+    )
+    
     # Calculate churn metrics
-    last_purchase = calculate_churn(df)
-    churn_rate = last_purchase['Churned'].mean() * 100
+    last_purchase, recency_index = build_churn_index(df)
+    total_customers = len(recency_index)
+    churned_customers = recency_index.churned_count(churn_days)
+    churn_rate = recency_index.churn_rate(churn_days)
     active_rate = 100 - churn_rate
     
     # Display metrics
@@ -61,12 +125,24 @@ def display_churn_analysis(df: pd.DataFrame):
             "Persentase customer yang masih aktif"
         )
     
+    # Churn rate for common windows
+    windows = [30, 60, 90, 180]
+    st.dataframe(
+        pd.DataFrame({
+            'Churn Window': [f"{days} days" for days in windows],
+            'Churned Customers': [recency_index.churned_count(days) for days in windows],
+            'Churn Rate': [f"{recency_index.churn_rate(days):.1f}%" for days in windows]
+        }),
+        hide_index=True
+    )
+    
     # Customer Status Distribution
     st.markdown("### 📊 Customer Status Distribution")
-    churn_counts = last_purchase['Churned'].value_counts().reset_index()
-    churn_counts.columns = ['Churned', 'Count']
-    churn_counts['Churned'] = churn_counts['Churned'].map({0: 'Active', 1: 'Churned'})
-    churn_counts['Percent'] = (churn_counts['Count'] / churn_counts['Count'].sum()) * 100
+    churn_counts = pd.DataFrame({
+        'Churned': ['Active', 'Churned'],
+        'Count': [total_customers - churned_customers, churned_customers]
+    })
+    churn_counts['Percent'] = (churn_counts['Count'] / total_customers) * 100 if total_customers else 0.0
     
     pie = alt.Chart(churn_counts).mark_arc(innerRadius=50).encode(
         theta=alt.Theta('Count:Q', stack=True),
@@ -81,48 +157,55 @@ def display_churn_analysis(df: pd.DataFrame):
         ]
     ).properties(height=300)
     
-    st.altair_chart(pie, use_container_width=True)
+    with stage('chart: churn status', rows=len(churn_counts)):
+        st.altair_chart(pie, use_container_width=True)
     
     # Days Since Last Purchase Distribution
     st.markdown("### 📈 Days Since Last Purchase Distribution")
-    hist = alt.Chart(last_purchase).mark_bar().encode(
-        x=alt.X('DaysSinceLastPurchase:Q', 
-               bin=alt.Bin(maxbins=30),
+    # Bin dan rata-rata dihitung di server; browser hanya menerima satu baris per bin
+    days = last_purchase['DaysSinceLastPurchase']
+    hist = alt.Chart(histogram(days, maxbins=30)).mark_bar().encode(
+        x=alt.X('bin_start:Q', 
+               bin='binned',
                title='Days Since Last Purchase'),
-        y=alt.Y('count():Q', 
+        x2='bin_end:Q',
+        y=alt.Y('count:Q', 
                title='Number of Customers'),
         color=alt.value('#1f77b4'),
         tooltip=[
-            alt.Tooltip('count():Q', title='Count'),
-            alt.Tooltip('DaysSinceLastPurchase:Q', title='Days', bin=alt.Bin(maxbins=30))
+            alt.Tooltip('count:Q', title='Count'),
+            alt.Tooltip('bin_start:Q', title='Days From'),
+            alt.Tooltip('bin_end:Q', title='Days To')
         ]
     ).properties(height=300)
     
     # Add mean line
-    mean_line = alt.Chart(last_purchase).mark_rule(color='red').encode(
-        x='mean(DaysSinceLastPurchase):Q',
+    mean_line = alt.Chart(mean_value(days)).mark_rule(color='red').encode(
+        x='mean:Q',
         size=alt.value(2),
-        tooltip=[alt.Tooltip('mean(DaysSinceLastPurchase):Q', title='Mean Days', format='.1f')]
+        tooltip=[alt.Tooltip('mean:Q', title='Mean Days', format='.1f')]
     )
     
-    st.altair_chart(hist + mean_line, use_container_width=True)
+    with stage('chart: days since last purchase', rows=len(hist.data)):
+        st.altair_chart(hist + mean_line, use_container_width=True)
     
-    # Customer Details
+    # Customer Details: hanya label status yang diperbarui saat window berubah
     st.markdown("### 📋 Customer Details")
-    last_purchase['Status'] = last_purchase['Churned'].map({0: 'Active', 1: 'Churned'})
+    last_purchase = churn_table(df, churn_days)
     
-    def style_status(val):
-        if val == 'Active':
-            return 'color: #00ff00'
-        return 'color: #ff4b4b'
+    def style_status(status):
+        return np.where(status == 'Active', 'color: #00ff00', 'color: #ff4b4b')
     
-    st.dataframe(
-        last_purchase.style
-        .format({
+    display_paged_table(
+        last_purchase,
+        key="churn_table",
+        formats={
             'DaysSinceLastPurchase': '{:.0f}',
             'LastPurchaseDate': lambda x: x.strftime('%Y-%m-%d')
-        })
-        .applymap(style_status, subset=['Status'])
+        },
+        styles={'Status': style_status},
+        search_column='CustomerID',
+        default_sort='DaysSinceLastPurchase'
     )
     
     return last_purchase
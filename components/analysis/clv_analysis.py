@@ -1,31 +1,33 @@
 """Customer Lifetime Value Analysis component."""
 
+from typing import Union
 import streamlit as st
 import pandas as pd
 import altair as alt
+from ..aggregates import TransactionAggregates, get_aggregates
+from ..chart_data import histogram, mean_value, stratified_sample
+from ..memo import memoize
 from ..metrics_card import metric_card
+from ..profiling import stage
 
-def calculate_clv(df: pd.DataFrame):
-    """Calculate Customer Lifetime Value metrics."""
-    # Calculate total amount for each transaction
-    df['TotalAmount'] = df['Quantity'] * df['UnitPrice']
-    
-    # Calculate reference date
-    reference_date = df['InvoiceDate'].max()
-    
-    # Calculate customer metrics
-    customer_metrics = df.groupby('CustomerID').agg({
-        'InvoiceDate': lambda x: (reference_date - x.max()).days,  # Recency
-        'InvoiceNo': 'count',  # Frequency
-        'TotalAmount': 'sum'  # Monetary
-    }).reset_index()
-    
-    customer_metrics.columns = ['CustomerID', 'Recency', 'Frequency', 'Monetary']
+@memoize
+def calculate_clv(df: Union[pd.DataFrame, TransactionAggregates]):
+    """Calculate Customer Lifetime Value metrics from the shared customer aggregates."""
+    aggregates = get_aggregates(df)
+    customers = aggregates.customers
+    
+    # Calculate customer metrics (Recency relative to the last transaction date)
+    customer_metrics = pd.DataFrame({
+        'CustomerID': customers['CustomerID'],
+        'Recency': aggregates.recency_days(),
+        'Frequency': customers['Frequency'],
+        'Monetary': customers['Monetary']
+    })
     
     # Calculate CLV
     # Using a simple formula: Average Order Value * Purchase Frequency * (1 / Churn Probability)
     customer_metrics['Avg_Order_Value'] = customer_metrics['Monetary'] / customer_metrics['Frequency']
-    customer_metrics['Churn_Probability'] = customer_metrics['Recency'].apply(lambda x: min(x + 1, 365)) / 365
+    customer_metrics['Churn_Probability'] = (customer_metrics['Recency'] + 1).clip(upper=365) / 365
     customer_metrics['CLV'] = customer_metrics['Avg_Order_Value'] * customer_metrics['Frequency'] * (1 / customer_metrics['Churn_Probability'])
     
     # Remove extreme outliers (clip at 95th percentile)
@@ -33,7 +35,7 @@ def calculate_clv(df: pd.DataFrame):
     
     return customer_metrics
 
-def display_clv_analysis(df: pd.DataFrame):
+def display_clv_analysis(df: Union[pd.DataFrame, TransactionAggregates]):
     """Display Customer Lifetime Value analysis section."""
     st.markdown("## 💰 Customer Lifetime Value Analysis")
     
@@ -83,32 +85,36 @@ def display_clv_analysis(df: pd.DataFrame):
     st.markdown("### 📊 Distribusi Customer Lifetime Value")
     
     # Histogram CLV
-    hist = alt.Chart(clv_data).mark_bar().encode(
-        x=alt.X('CLV:Q', 
-               bin=alt.Bin(maxbins=30),
+    hist = alt.Chart(histogram(clv_data['CLV'], maxbins=30)).mark_bar().encode(
+        x=alt.X('bin_start:Q', 
+               bin='binned',
                title='Customer Lifetime Value ($)'),
-        y=alt.Y('count():Q', 
+        x2='bin_end:Q',
+        y=alt.Y('count:Q', 
                title='Number of Customers'),
         color=alt.value('#1f77b4'),
         tooltip=[
-            alt.Tooltip('count():Q', title='Count'),
-            alt.Tooltip('CLV:Q', title='CLV', format='$.2f')
+            alt.Tooltip('count:Q', title='Count'),
+            alt.Tooltip('bin_start:Q', title='CLV From', format='$.2f'),
+            alt.Tooltip('bin_end:Q', title='CLV To', format='$.2f')
         ]
     ).properties(height=300)
     
     # Add mean line
-    mean_line = alt.Chart(clv_data).mark_rule(color='red').encode(
-        x='mean(CLV):Q',
+    mean_line = alt.Chart(mean_value(clv_data['CLV'])).mark_rule(color='red').encode(
+        x='mean:Q',
         size=alt.value(2),
-        tooltip=[alt.Tooltip('mean(CLV):Q', title='Mean CLV', format='$.2f')]
+        tooltip=[alt.Tooltip('mean:Q', title='Mean CLV', format='$.2f')]
     )
     
-    st.altair_chart(hist + mean_line, use_container_width=True)
+    with stage('chart: CLV distribution', rows=len(hist.data)):
+        st.altair_chart(hist + mean_line, use_container_width=True)
     
     # Customer Segmentation
     st.markdown("### 👥 Customer Segmentation by CLV")
     
-    # Define segments based on CLV percentiles
+    # Define segments based on CLV percentiles (view dangkal, hasil memo dipakai bersama)
+    clv_data = clv_data.copy(deep=False)
     clv_data['Segment'] = pd.qcut(clv_data['CLV'], 
                                 q=3, 
                                 labels=['Low Value', 'Medium Value', 'High Value'])
@@ -144,7 +150,9 @@ def display_clv_analysis(df: pd.DataFrame):
     
     # Scatter plot of Frequency vs Monetary colored by CLV
     st.markdown("### 📈 Frequency vs Monetary Analysis")
-    scatter = alt.Chart(clv_data).mark_circle(size=60).encode(
+    # Sample per segmen agar jumlah titik yang dikirim ke browser tetap terbatas
+    points = stratified_sample(clv_data[['CustomerID', 'Frequency', 'Monetary', 'CLV', 'Segment']], strata='Segment')
+    scatter = alt.Chart(points).mark_circle(size=60).encode(
         x=alt.X('Frequency:Q', title='Purchase Frequency'),
         y=alt.Y('Monetary:Q', title='Total Spent ($)'),
         color=alt.Color('CLV:Q', 
@@ -159,7 +167,10 @@ def display_clv_analysis(df: pd.DataFrame):
         ]
     ).properties(height=400)
     
-    st.altair_chart(scatter, use_container_width=True)
+    with stage('chart: frequency vs monetary', rows=len(points)):
+        st.altair_chart(scatter, use_container_width=True)
+    if len(points) < len(clv_data):
+        st.caption(f"Menampilkan sample {len(points):,} dari {len(clv_data):,} customer (proporsional per segmen)")
     
     return clv_data
 
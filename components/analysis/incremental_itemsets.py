@@ -0,0 +1,194 @@
+"""Incremental frequent itemset maintenance for appended invoices (FUP).
+
+An ``ItemsetState`` keeps the absolute count of every frequent itemset of
+the invoices seen so far. When new invoices arrive, the update follows the
+FUP algorithm (Cheung et al., 1996) level by level:
+
+- itemsets that were frequent only need their count in the new invoices;
+- an itemset that was not frequent can only become frequent if it is
+  frequent within the new invoices, so only those candidates are counted
+  in the old invoices.
+
+The result equals mining the combined invoices from scratch.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .itemsets import mine_frequent_itemsets
+from .sparse_basket import SparseBasket, concat_baskets
+
+Itemset = Tuple[str, ...]
+
+
+class ItemsetState:
+    """Frequent itemsets of a basket with absolute transaction counts.
+
+    Attributes:
+        basket: All invoices seen so far
+        min_support: Support threshold the counts were maintained for
+        counts: Sorted tuple of item names -> number of invoices containing it
+    """
+
+    def __init__(self, basket: SparseBasket, min_support: float, counts: Dict[Itemset, int]):
+        self.basket = basket
+        self.min_support = min_support
+        self.counts = counts
+
+    @property
+    def n_transactions(self) -> int:
+        return self.basket.n_transactions
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the state, used as cache key."""
+        return f"{self.basket.fingerprint}-{self.min_support!r}"
+
+    def frequent_itemsets(self) -> pd.DataFrame:
+        """Frequent itemsets in the layout of ``mine_frequent_itemsets``."""
+        itemsets = sorted(self.counts, key=lambda itemset: (len(itemset), itemset))
+        return pd.DataFrame({
+            'support': [self.counts[itemset] / self.n_transactions for itemset in itemsets],
+            'itemsets': [frozenset(itemset) for itemset in itemsets]
+        })
+
+
+class _TidLists:
+    """Sorted invoice-id lists of the itemsets of one basket (tuples of item names).
+
+    With ``cache=True`` the list of every counted itemset is kept, so a
+    k-itemset only needs one intersection with the list of its (k-1)-prefix.
+    """
+
+    def __init__(self, basket: SparseBasket, cache: bool = False):
+        self._csc = basket.matrix.tocsc()
+        self._csc.sort_indices()
+        self._columns = dict(zip(basket.items, range(basket.n_items)))
+        self._cache = {} if cache else None
+        self._empty = np.zeros(0, dtype=self._csc.indices.dtype)
+        self._pair_counts = None
+
+    def _column(self, item):
+        column = self._columns.get(item)
+        if column is None:
+            # Produk belum pernah muncul di basket ini
+            return self._empty
+        return self._csc.indices[self._csc.indptr[column]:self._csc.indptr[column + 1]]
+
+    def tids(self, itemset: Itemset) -> np.ndarray:
+        if self._cache is not None and itemset in self._cache:
+            return self._cache[itemset]
+
+        if len(itemset) == 1:
+            tids = self._column(itemset[0])
+        else:
+            tids = self.tids(itemset[:-1])
+            if len(tids):
+                tids = np.intersect1d(tids, self._column(itemset[-1]), assume_unique=True)
+
+        if self._cache is not None:
+            self._cache[itemset] = tids
+        return tids
+
+    def _count_pairs(self, pairs) -> np.ndarray:
+        """Pair counts from one sparse co-occurrence product instead of one intersection per pair."""
+        if self._pair_counts is None:
+            matrix = self._csc.astype(np.int32)
+            self._pair_counts = (matrix.T @ matrix).tocsr()
+        missing = len(self._columns)
+        first = np.array([self._columns.get(pair[0], missing) for pair in pairs])
+        second = np.array([self._columns.get(pair[1], missing) for pair in pairs])
+        known = (first < missing) & (second < missing)
+        counts = np.zeros(len(pairs), dtype=np.int64)
+        counts[known] = np.asarray(self._pair_counts[first[known], second[known]]).ravel()
+        return counts
+
+    def count(self, itemsets) -> np.ndarray:
+        """Number of invoices containing each itemset."""
+        if itemsets and all(len(itemset) == 2 for itemset in itemsets):
+            return self._count_pairs(itemsets)
+        return np.array([len(self.tids(itemset)) for itemset in itemsets], dtype=np.int64)
+
+
+def _candidates(frequent):
+    """Apriori join and prune: k-itemsets whose (k-1)-subsets are all frequent."""
+    frequent = sorted(frequent)
+    known = set(frequent)
+    candidates = []
+    for position, first in enumerate(frequent):
+        for second in frequent[position + 1:]:
+            if first[:-1] != second[:-1]:
+                break
+            candidate = first + (second[-1],)
+            if all(candidate[:drop] + candidate[drop + 1:] in known for drop in range(len(candidate) - 2)):
+                candidates.append(candidate)
+    return candidates
+
+
+def build_itemset_state(basket: SparseBasket, min_support: float, engine: str = 'auto') -> ItemsetState:
+    """Mine a basket from scratch and keep the counts for later updates."""
+    frequent = mine_frequent_itemsets(basket, min_support, engine=engine)
+    counts = np.rint(frequent['support'].to_numpy() * basket.n_transactions).astype(np.int64)
+    return ItemsetState(
+        basket,
+        min_support,
+        {tuple(sorted(itemset)): int(count) for itemset, count in zip(frequent['itemsets'], counts)}
+    )
+
+
+def update_itemset_state(state: ItemsetState, delta: SparseBasket):
+    """Add new invoices to an ``ItemsetState`` without mining from scratch.
+
+    Returns:
+        tuple: (updated ItemsetState, report dict with the number of new
+        invoices, candidates counted in the old invoices, and itemsets added
+        and removed)
+    """
+    if delta.n_transactions == 0:
+        return state, {'new_transactions': 0, 'rescanned_candidates': 0, 'added': 0, 'removed': 0}
+
+    min_support = state.min_support
+    n_old, n_delta = state.n_transactions, delta.n_transactions
+    n_total = n_old + n_delta
+
+    # Invoice baru sedikit, jadi daftar invoice-id per itemset disimpan untuk level berikutnya
+    delta_tids = _TidLists(delta, cache=True)
+    old_tids = None
+
+    counts = {}
+    rescanned = 0
+    level = [(item,) for item in state.basket.items.union(delta.items)]
+    while level:
+        delta_counts = delta_tids.count(level)
+
+        # Itemset yang sebelumnya frequent: cukup tambahkan hitungan dari invoice baru
+        totals = {}
+        new_candidates = []
+        for itemset, delta_count in zip(level, delta_counts):
+            if itemset in state.counts:
+                totals[itemset] = state.counts[itemset] + delta_count
+            elif delta_count / n_delta >= min_support:
+                new_candidates.append((itemset, delta_count))
+
+        # Itemset baru hanya bisa frequent jika frequent di invoice baru; hanya ini yang dihitung di data lama
+        if new_candidates:
+            rescanned += len(new_candidates)
+            if old_tids is None:
+                old_tids = _TidLists(state.basket)
+            old_counts = old_tids.count([itemset for itemset, _ in new_candidates])
+            for (itemset, delta_count), old_count in zip(new_candidates, old_counts):
+                totals[itemset] = old_count + delta_count
+
+        frequent = [itemset for itemset, total in totals.items() if total / n_total >= min_support]
+        counts.update((itemset, int(totals[itemset])) for itemset in frequent)
+        level = _candidates(frequent)
+
+    report = {
+        'new_transactions': n_delta,
+        'rescanned_candidates': rescanned,
+        'added': len(counts.keys() - state.counts.keys()),
+        'removed': len(state.counts.keys() - counts.keys())
+    }
+    return ItemsetState(concat_baskets(state.basket, delta), min_support, counts), report
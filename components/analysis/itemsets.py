@@ -0,0 +1,173 @@
+"""Frequent itemset mining on sparse basket matrices.
+
+Several interchangeable engines produce the same result layout as
+``mlxtend.frequent_patterns.apriori(use_colnames=True)``:
+
+- ``eclat``: depth-first search over sorted invoice-id lists (CSC columns)
+- ``bitset``: the same search over packed invoice bitsets
+- ``fpgrowth``: mlxtend FP-Growth on a sparse DataFrame
+- ``apriori``: mlxtend Apriori on a sparse DataFrame (reference engine)
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import apriori, fpgrowth
+
+from .sparse_basket import SparseBasket
+
+# Popcount per byte, dipakai jika numpy tidak punya np.bitwise_count
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+# Bitset lebih hemat dari daftar invoice-id (int32) jika item muncul di lebih dari 1/32 transaksi
+BITSET_MIN_DENSITY = 1 / 32
+
+
+def _popcount(bits: np.ndarray) -> int:
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(bits).sum())
+    return int(_POPCOUNT[bits.view(np.uint8)].sum())
+
+
+def _eclat(prefix, candidates, intersect, n_transactions, min_support, max_len, out):
+    """Depth-first Eclat search.
+
+    Args:
+        candidates: list of (item, cover, count) tuples extending ``prefix``
+        intersect: function (cover, cover) -> (cover, count)
+    """
+    for position, (item, cover, count) in enumerate(candidates):
+        itemset = prefix + (item,)
+        out.append((count / n_transactions, itemset))
+        if max_len is not None and len(itemset) >= max_len:
+            continue
+
+        extensions = []
+        for other, other_cover, _ in candidates[position + 1:]:
+            common, common_count = intersect(cover, other_cover)
+            if common_count / n_transactions >= min_support:
+                extensions.append((other, common, common_count))
+        if extensions:
+            _eclat(itemset, extensions, intersect, n_transactions, min_support, max_len, out)
+
+
+def _frequent_columns(basket: SparseBasket, min_support: float):
+    """Return the CSC matrix and frequent item columns, rarest first."""
+    csc = basket.matrix.tocsc()
+    csc.sort_indices()
+    counts = np.diff(csc.indptr)
+    frequent = np.flatnonzero(counts / basket.n_transactions >= min_support)
+    # Item jarang diproses dulu supaya irisan tetap kecil
+    frequent = frequent[np.argsort(counts[frequent], kind='stable')]
+    return csc, counts, frequent
+
+
+def _to_frame(basket: SparseBasket, found) -> pd.DataFrame:
+    items = basket.items
+    return pd.DataFrame({
+        'support': [support for support, _ in found],
+        'itemsets': [frozenset(items[list(itemset)]) for _, itemset in found]
+    })
+
+
+def _mine_eclat(basket: SparseBasket, min_support: float, max_len: Optional[int]) -> pd.DataFrame:
+    """Eclat over sorted invoice-id lists taken from the CSC matrix."""
+    csc, counts, frequent = _frequent_columns(basket, min_support)
+    candidates = [
+        (item, csc.indices[csc.indptr[item]:csc.indptr[item + 1]], counts[item])
+        for item in frequent
+    ]
+
+    def intersect(left, right):
+        common = np.intersect1d(left, right, assume_unique=True)
+        return common, len(common)
+
+    found = []
+    _eclat((), candidates, intersect, basket.n_transactions, min_support, max_len, found)
+    return _to_frame(basket, found)
+
+
+def _mine_bitset(basket: SparseBasket, min_support: float, max_len: Optional[int]) -> pd.DataFrame:
+    """Eclat over packed invoice bitsets (one bit per transaction)."""
+    csc, counts, frequent = _frequent_columns(basket, min_support)
+
+    # Bitset per item dalam word 64-bit
+    n_words = (basket.n_transactions + 63) // 64
+    candidates = []
+    for item in frequent:
+        bits = np.zeros(n_words * 64, dtype=bool)
+        bits[csc.indices[csc.indptr[item]:csc.indptr[item + 1]]] = True
+        packed = np.packbits(bits).view(np.uint64)
+        candidates.append((item, packed, counts[item]))
+
+    def intersect(left, right):
+        common = np.bitwise_and(left, right)
+        return common, _popcount(common)
+
+    found = []
+    _eclat((), candidates, intersect, basket.n_transactions, min_support, max_len, found)
+    return _to_frame(basket, found)
+
+
+def _sparse_frame(basket: SparseBasket) -> pd.DataFrame:
+    """Sparse boolean DataFrame in the layout mlxtend expects."""
+    frame = pd.DataFrame.sparse.from_spmatrix(basket.matrix.astype(np.uint8), columns=basket.items)
+    return frame.astype(pd.SparseDtype(bool, False))
+
+
+def _mine_fpgrowth(basket: SparseBasket, min_support: float, max_len: Optional[int]) -> pd.DataFrame:
+    """mlxtend FP-Growth on a sparse DataFrame."""
+    return fpgrowth(_sparse_frame(basket), min_support=min_support, use_colnames=True, max_len=max_len)
+
+
+def _mine_apriori(basket: SparseBasket, min_support: float, max_len: Optional[int]) -> pd.DataFrame:
+    """mlxtend Apriori on a sparse DataFrame."""
+    return apriori(_sparse_frame(basket), min_support=min_support, use_colnames=True, max_len=max_len)
+
+
+ITEMSET_ENGINES = {
+    'eclat': _mine_eclat,
+    'bitset': _mine_bitset,
+    'fpgrowth': _mine_fpgrowth,
+    'apriori': _mine_apriori
+}
+
+
+def choose_engine(basket: SparseBasket, min_support: float) -> str:
+    """Pick an engine from the density of the frequent items.
+
+    Dense frequent columns are cheaper as bitsets; sparse ones as invoice-id
+    lists.
+    """
+    counts = basket.item_counts()
+    if basket.n_transactions == 0:
+        return 'eclat'
+    support = counts / basket.n_transactions
+    frequent = support[support >= min_support]
+    if len(frequent) and frequent.mean() > BITSET_MIN_DENSITY:
+        return 'bitset'
+    return 'eclat'
+
+
+def mine_frequent_itemsets(basket: SparseBasket, min_support: float,
+                           max_len: Optional[int] = None, engine: str = 'auto') -> pd.DataFrame:
+    """Mine frequent itemsets from a sparse basket.
+
+    Args:
+        basket: Sparse invoice x product matrix
+        min_support: Minimum fraction of transactions containing the itemset
+        max_len: Maximum itemset length, None for no limit
+        engine: One of ``ITEMSET_ENGINES`` or ``'auto'``
+
+    Returns:
+        pd.DataFrame: ``support`` and ``itemsets`` (frozensets of item names)
+    """
+    if engine == 'auto':
+        engine = choose_engine(basket, min_support)
+    if engine not in ITEMSET_ENGINES:
+        raise ValueError(f"Unknown itemset engine: {engine}")
+
+    if basket.n_transactions == 0:
+        return pd.DataFrame({'support': [], 'itemsets': []})
+    return ITEMSET_ENGINES[engine](basket, min_support, max_len)
@@ -1,21 +1,43 @@
 """Market Basket Analysis component."""
 
+import os
+import time
+from typing import Union
 import streamlit as st
 import pandas as pd
 import altair as alt
-from mlxtend.frequent_patterns import apriori, association_rules
+from mlxtend.frequent_patterns import association_rules
+from .. import settings
+from ..aggregates import TransactionAggregates
+from ..chart_data import density_grid
+from ..data_loader import load_data
+from ..memo import memoize
 from ..metrics_card import metric_card
+from ..profiling import stage
+from .incremental_itemsets import ItemsetState, build_itemset_state, update_itemset_state
+from .itemsets import ITEMSET_ENGINES, choose_engine, mine_frequent_itemsets
+from .pair_rules import pairwise_rules
+from .recommendations import RuleIndex
+from .parallel_itemsets import mine_frequent_itemsets_parallel
+from .sparse_basket import SparseBasket, build_sparse_basket
 
+# Mode analisis rules: mining itemset (semua ukuran) atau pasangan produk dari Xᵀ·X
+RULE_MODES = {
+    'itemsets': "Frequent itemsets (semua ukuran)",
+    'pairs': "Product pairs (Xᵀ·X, seluruh data)"
+}
+
+@memoize
 def prepare_basket_data(df: pd.DataFrame):
     """Prepare data for market basket analysis."""
     # Filter valid transactions
     df_filtered = df[
         (df['Quantity'] > 0) &  # Only positive quantities
-        (~df['InvoiceNo'].astype(str).str.contains('C', na=False))  # Exclude cancelled orders
+        (~df['InvoiceNo'].str.contains('C', na=False))  # Exclude cancelled orders
     ].copy()
     
     # Calculate item statistics
-    item_stats = df_filtered.groupby('Description').agg({
+    item_stats = df_filtered.groupby('Description', observed=True).agg({
         'Quantity': ['count', 'sum'],
         'InvoiceNo': 'nunique'
     }).sort_values(('InvoiceNo', 'nunique'), ascending=False)
@@ -36,9 +58,165 @@ def optimize_basket_data(df_filtered, item_stats):
         recent_transactions = df_filtered['InvoiceNo'].unique()[-5000:]  # Ambil 5000 transaksi terakhir
         df_filtered = df_filtered[df_filtered['InvoiceNo'].isin(recent_transactions)]
     
+    # Buang kategori yang tidak terpakai supaya crosstab tidak membuat kolom kosong
+    df_filtered = df_filtered.assign(**{
+        column: df_filtered[column].cat.remove_unused_categories()
+        for column in ['InvoiceNo', 'Description']
+        if isinstance(df_filtered[column].dtype, pd.CategoricalDtype)
+    })
+    
     return df_filtered
 
-def display_market_basket_analysis(df: pd.DataFrame):
+@memoize
+def build_basket(df: pd.DataFrame):
+    """Filter transactions and build the sparse basket matrix once per dataset.
+    
+    Returns:
+        tuple: (item_stats, summary dict, full SparseBasket, SparseBasket for
+        itemset mining); the mining basket is cut down to the top products and
+        latest transactions if the full one exceeds the memory budget
+    """
+    df_filtered, item_stats = prepare_basket_data(df)
+    summary = {
+        'total_transactions': df_filtered['InvoiceNo'].nunique(),
+        'total_products': len(df_filtered['Description'].unique()),
+        'avg_basket_size': df_filtered.groupby('InvoiceNo', observed=True)['Description'].nunique().mean()
+    }
+    
+    # Create sparse basket matrix dari seluruh produk dan transaksi
+    basket = build_sparse_basket(df_filtered)
+    mining_basket = basket
+    summary['limited'] = basket.memory_bytes > settings.BASKET_MEMORY_BUDGET_MB * 1024 * 1024
+    if summary['limited']:
+        mining_basket = build_sparse_basket(optimize_basket_data(df_filtered, item_stats))
+    return item_stats, summary, basket, mining_basket
+
+@memoize
+def mine_rules(basket: SparseBasket, floor_support: float, engine: str, workers: int):
+    """Mine frequent itemsets at ``floor_support`` and derive every rule with lift >= 1.
+    
+    Rules for any higher support, confidence or lift threshold are a subset of
+    this result and come from ``filter_rules`` without mining again.
+    
+    Returns:
+        tuple: (frequent itemsets, rules, mining seconds)
+    """
+    start = time.perf_counter()
+    if workers > 1:
+        freq_items = mine_frequent_itemsets_parallel(basket, min_support=floor_support, engine=engine, workers=workers)
+    else:
+        freq_items = mine_frequent_itemsets(basket, min_support=floor_support, engine=engine)
+    
+    rules = None
+    if not freq_items.empty:
+        rules = association_rules(freq_items, metric="lift", min_threshold=1)
+    return freq_items, rules, time.perf_counter() - start
+
+@memoize
+def mine_pair_rules(basket: SparseBasket, floor_support: float):
+    """Pair rules of the full basket at ``floor_support``, see ``mine_rules``.
+    
+    Returns:
+        tuple: (rules, seconds)
+    """
+    start = time.perf_counter()
+    rules = pairwise_rules(basket, floor_support)
+    return rules, time.perf_counter() - start
+
+@memoize
+def build_delta_basket(df: pd.DataFrame) -> SparseBasket:
+    """Sparse basket of a file with newly appended invoices."""
+    df_filtered, _ = prepare_basket_data(df)
+    return build_sparse_basket(df_filtered)
+
+@memoize
+def itemset_state(basket: SparseBasket, floor_support: float, engine: str) -> ItemsetState:
+    """Frequent itemset counts of the base dataset, the starting point for incremental updates."""
+    return build_itemset_state(basket, floor_support, engine=engine)
+
+@memoize
+def append_invoices(state: ItemsetState, delta: SparseBasket):
+    """Update cached itemset counts with new invoices and derive the rules.
+    
+    Returns:
+        tuple: (updated ItemsetState, update report, rules)
+    """
+    state, report = update_itemset_state(state, delta)
+    freq_items = state.frequent_itemsets()
+    rules = association_rules(freq_items, metric="lift", min_threshold=1) if not freq_items.empty else None
+    return state, report, rules
+
+@memoize
+def rule_index(rules_key: tuple, _rules: pd.DataFrame) -> RuleIndex:
+    """Recommendation index of a rule set, built once per ``rules_key``.
+    
+    The rules frame itself is not hashed; ``rules_key`` identifies where it
+    came from (mode, basket or state fingerprint, floor support, engine).
+    """
+    return RuleIndex(_rules)
+
+def filter_rules(rules: pd.DataFrame, min_support: float, min_confidence: float, min_lift: float) -> pd.DataFrame:
+    """Select the rules that meet all thresholds, strongest lift first."""
+    # Support rule = support itemset gabungan, jadi filter ini sama dengan mining ulang pada min_support
+    mask = (
+        (rules['support'] >= min_support) &
+        (rules['confidence'] >= min_confidence) &
+        (rules['lift'] >= min_lift)
+    )
+    return rules[mask].sort_values("lift", ascending=False)
+
+def rules_chart(rules: pd.DataFrame) -> alt.Chart:
+    """Confidence vs lift chart: one point per rule, or a density grid when there are too many rules."""
+    if len(rules) <= settings.CHART_MAX_POINTS:
+        # Hanya kolom yang dipakai chart, itemset sebagai teks
+        points = pd.DataFrame({
+            'antecedents': rules['antecedents'].map(', '.join),
+            'consequents': rules['consequents'].map(', '.join),
+            'support': rules['support'],
+            'confidence': rules['confidence'],
+            'lift': rules['lift']
+        })
+        return alt.Chart(points).mark_circle(size=60).encode(
+            x=alt.X('confidence:Q', 
+                   title='Confidence',
+                   axis=alt.Axis(format='%')),
+            y=alt.Y('lift:Q',
+                   title='Lift'),
+            color=alt.Color('support:Q',
+                          title='Support',
+                          scale=alt.Scale(scheme='viridis')),
+            tooltip=[
+                alt.Tooltip('antecedents:N', title='If Purchase'),
+                alt.Tooltip('consequents:N', title='Then Likely to Purchase'),
+                alt.Tooltip('support:Q', title='Support', format='.1%'),
+                alt.Tooltip('confidence:Q', title='Confidence', format='.1%'),
+                alt.Tooltip('lift:Q', title='Lift', format='.2f')
+            ]
+        ).properties(
+            height=400,
+            width="container"  # Gunakan width="container" untuk mengisi lebar container
+        )
+
+    # Terlalu banyak rule untuk digambar satu per satu: agregasi ke grid confidence x lift
+    grid = density_grid(rules['confidence'], rules['lift'], rules['support'], maxbins=40)
+    return alt.Chart(grid).mark_rect().encode(
+        x=alt.X('x_start:Q', bin='binned', title='Confidence', axis=alt.Axis(format='%')),
+        x2='x_end:Q',
+        y=alt.Y('y_start:Q', bin='binned', title='Lift'),
+        y2='y_end:Q',
+        color=alt.Color('count:Q', title='Number of Rules', scale=alt.Scale(scheme='viridis')),
+        tooltip=[
+            alt.Tooltip('count:Q', title='Number of Rules'),
+            alt.Tooltip('value_mean:Q', title='Mean Support', format='.1%'),
+            alt.Tooltip('x_start:Q', title='Confidence From', format='.1%'),
+            alt.Tooltip('y_start:Q', title='Lift From', format='.2f')
+        ]
+    ).properties(
+        height=400,
+        width="container"
+    )
+
+def display_market_basket_analysis(df: Union[pd.DataFrame, TransactionAggregates]):
     """Display Market Basket Analysis section."""
     st.markdown("## 🛍️ Market Basket Analysis")
     
@@ -58,13 +236,20 @@ def display_market_basket_analysis(df: pd.DataFrame):
         - Promosi yang lebih efektif
         """)
     
-    # Prepare data
-    df_filtered, item_stats = prepare_basket_data(df)
+    if isinstance(df, TransactionAggregates):
+        if 'item_stats' not in df.overview:
+            st.info("ℹ️ Market Basket Analysis membutuhkan data per transaksi dan tidak tersedia pada mode streaming.")
+            return None
+        # SQL engine: statistik produk sudah dihitung, tanpa basket matrix
+        item_stats, summary = df.overview['item_stats'], df.overview['basket_summary']
+    else:
+        # Prepare data
+        item_stats, summary, full_basket, mining_basket = build_basket(df)
     
     # Display metrics
-    total_transactions = df_filtered['InvoiceNo'].nunique()
-    total_products = len(df_filtered['Description'].unique())
-    avg_basket_size = df_filtered.groupby('InvoiceNo')['Description'].nunique().mean()
+    total_transactions = summary['total_transactions']
+    total_products = summary['total_products']
+    avg_basket_size = summary['avg_basket_size']
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -108,26 +293,145 @@ def display_market_basket_analysis(df: pd.DataFrame):
         width="container"  # Gunakan width="container" untuk mengisi lebar container
     )
     
-    st.altair_chart(chart, use_container_width=True)
+    with stage('chart: top products', rows=len(top_10_products)):
+        st.altair_chart(chart, use_container_width=True)
     
     # Market Basket Analysis
     st.markdown("### 🔍 Association Rules Analysis")
-    st.warning("⚠️ Analisis dibatasi pada 100 produk teratas dan 5000 transaksi terakhir untuk efisiensi memori")
     
-    # Optimize data untuk market basket analysis
-    df_optimized = optimize_basket_data(df_filtered, item_stats)
+    if isinstance(df, TransactionAggregates):
+        st.info("ℹ️ Association rules membutuhkan basket matrix per transaksi dan tidak tersedia pada SQL engine.")
+        return None
     
-    # Create basket matrix
-    basket = pd.crosstab(index=df_optimized['InvoiceNo'], columns=df_optimized['Description'])
-    basket_encoded = (basket > 0).astype(int)
+    mode = st.radio(
+        "Rule mode",
+        list(RULE_MODES),
+        format_func=RULE_MODES.get,
+        horizontal=True,
+        help="Product pairs menghitung semua rule 1 → 1 secara eksak tanpa batas memori mining"
+    )
+    
+    if mode == 'itemsets':
+        col1, col2 = st.columns(2)
+        with col1:
+            engine = st.selectbox(
+                "Itemset mining engine",
+                ['auto'] + list(ITEMSET_ENGINES),
+                help="auto memilih bitset atau eclat berdasarkan kepadatan data"
+            )
+        with col2:
+            workers = st.number_input(
+                "Parallel workers",
+                min_value=1,
+                max_value=max(os.cpu_count() or 1, settings.BASKET_WORKERS),
+                value=settings.BASKET_WORKERS,
+                help="Transaksi dibagi ke beberapa proses; 1 = tanpa paralel. "
+                     "Untuk data kecil overhead proses lebih besar dari waktu mining"
+            )
+        
+        with st.expander("📅 Incremental update (invoice baru)"):
+            st.markdown(
+                "Upload file berisi invoice baru saja (misalnya transaksi harian). "
+                "Hitungan itemset dari data yang sudah ada diperbarui dengan invoice baru "
+                "tanpa mining ulang seluruh data."
+            )
+            delta_files = st.file_uploader(
+                "Invoice baru (CSV)",
+                type=['csv'],
+                accept_multiple_files=True,
+                help="File diterapkan berurutan; invoice yang sudah ada di data akan ditolak"
+            )
+    else:
+        delta_files = []
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        min_support = st.slider(
+            "Minimum support",
+            min_value=0.001,
+            max_value=0.2,
+            value=0.02,
+            step=0.001,
+            format="%.3f",
+            help=f"Support di bawah {settings.BASKET_SUPPORT_FLOOR:g} memicu mining ulang"
+        )
+    with col2:
+        min_confidence = st.slider(
+            "Minimum confidence",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.0,
+            step=0.05
+        )
+    with col3:
+        min_lift = st.slider(
+            "Minimum lift",
+            min_value=1.0,
+            max_value=10.0,
+            value=1.0,
+            step=0.1
+        )
+    
+    basket = full_basket if mode == 'pairs' else mining_basket
+    if basket is mining_basket and summary['limited']:
+        st.warning(
+            f"⚠️ Basket matrix ({full_basket.memory_bytes / (1024 * 1024):,.0f} MB) melebihi budget memori "
+            f"{settings.BASKET_MEMORY_BUDGET_MB:,} MB. Analisis dibatasi pada 100 produk teratas "
+            "dan 5000 transaksi terakhir."
+        )
+    
+    st.caption(
+        f"Basket matrix: {basket.n_transactions:,} transaksi × {basket.n_items:,} produk · "
+        f"sparse {basket.memory_bytes / (1024 * 1024):,.1f} MB "
+        f"(dense {basket.dense_bytes / (1024 * 1024):,.0f} MB)"
+    )
+    
+    # Itemset di-mining sekali pada support floor; slider di atas floor hanya memfilter cache
+    floor_support = min(settings.BASKET_SUPPORT_FLOOR, min_support)
     
     try:
-        # Generate frequent itemsets dengan support yang lebih tinggi
-        freq_items = apriori(basket_encoded, min_support=0.02, use_colnames=True)
+        if mode == 'pairs':
+            # Semua pasangan produk dari satu perkalian matriks sparse
+            all_rules, mining_seconds = mine_pair_rules(basket, floor_support)
+            source = f"Xᵀ·X: {len(all_rules):,} pair rules"
+            rules_key = ('pairs', basket.fingerprint, floor_support)
+        else:
+            if engine == 'auto':
+                engine = choose_engine(basket, floor_support)
+            # Generate frequent itemsets langsung dari matriks sparse
+            freq_items, all_rules, mining_seconds = mine_rules(basket, floor_support, engine, int(workers))
+            source = f"Engine `{engine}` · {int(workers)} worker(s): {len(freq_items):,} frequent itemsets"
+            rules_key = ('itemsets', basket.fingerprint, floor_support, engine)
+            
+            if delta_files and summary['limited']:
+                st.info("ℹ️ Incremental update membutuhkan basket lengkap dan tidak tersedia saat analisis dibatasi budget memori.")
+            elif delta_files:
+                start = time.perf_counter()
+                state = itemset_state(basket, floor_support, engine)
+                new_transactions = rescanned = 0
+                for delta_file in delta_files:
+                    delta_df = load_data(delta_file)
+                    if delta_df is None:
+                        continue
+                    state, report, all_rules = append_invoices(state, build_delta_basket(delta_df))
+                    rules_key = ('incremental', state.fingerprint)
+                    new_transactions += report['new_transactions']
+                    rescanned += report['rescanned_candidates']
+                mining_seconds = time.perf_counter() - start
+                source = (
+                    f"Incremental: +{new_transactions:,} invoice dari {len(delta_files)} file, "
+                    f"{rescanned:,} kandidat baru dihitung ulang di data lama · "
+                    f"{len(state.counts):,} frequent itemsets"
+                )
+        
+        start = time.perf_counter()
+        rules = filter_rules(all_rules, min_support, min_confidence, min_lift) if all_rules is not None else None
+        st.caption(
+            f"{source} pada support ≥ {floor_support:g} dalam {mining_seconds:.2f}s (cached) · "
+            f"filter rules {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
         
-        if not freq_items.empty:
-            rules = association_rules(freq_items, metric="lift", min_threshold=1)
-            rules = rules.sort_values("lift", ascending=False)
+        if rules is not None and not rules.empty:
             
             # Format rules untuk tampilan yang lebih sederhana
             formatted_rules = []
@@ -146,28 +450,8 @@ def display_market_basket_analysis(df: pd.DataFrame):
             st.dataframe(rules_formatted, width='stretch')
             
             # Visualization
-            scatter = alt.Chart(rules).mark_circle(size=60).encode(
-                x=alt.X('confidence:Q', 
-                       title='Confidence',
-                       axis=alt.Axis(format='%')),
-                y=alt.Y('lift:Q',
-                       title='Lift'),
-                color=alt.Color('support:Q',
-                              title='Support',
-                              scale=alt.Scale(scheme='viridis')),
-                tooltip=[
-                    alt.Tooltip('antecedents:N', title='If Purchase'),
-                    alt.Tooltip('consequents:N', title='Then Likely to Purchase'),
-                    alt.Tooltip('support:Q', title='Support', format='.1%'),
-                    alt.Tooltip('confidence:Q', title='Confidence', format='.1%'),
-                    alt.Tooltip('lift:Q', title='Lift', format='.2f')
-                ]
-            ).properties(
-                height=400,
-                width="container"  # Gunakan width="container" untuk mengisi lebar container
-            )
-            
-            st.altair_chart(scatter, use_container_width=True)
+            with stage('chart: rules', rows=len(rules)):
+                st.altair_chart(rules_chart(rules), use_container_width=True)
             
             # Insights
             st.markdown("### 🎯 Key Insights")
@@ -196,8 +480,48 @@ def display_market_basket_analysis(df: pd.DataFrame):
                     f"{max_confidence:.1f}%",
                     "Probabilitas tertinggi"
                 )
+            
+            # Product Recommendations
+            st.markdown("### 🧭 Product Recommendations")
+            index = rule_index(rules_key, all_rules)
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                products = st.multiselect(
+                    "Produk di keranjang",
+                    index.items,
+                    help="Rekomendasi diambil dari rules dengan threshold yang sama seperti tabel di atas"
+                )
+            with col2:
+                top_k = st.number_input("Jumlah rekomendasi", min_value=1, max_value=50, value=5)
+            
+            if products:
+                start = time.perf_counter()
+                suggestions = index.recommend(
+                    products,
+                    k=int(top_k),
+                    min_support=min_support,
+                    min_confidence=min_confidence,
+                    min_lift=min_lift
+                )
+                lookup_ms = (time.perf_counter() - start) * 1000
+                
+                if suggestions.empty:
+                    st.info("Tidak ada rekomendasi untuk produk ini pada threshold saat ini.")
+                else:
+                    st.dataframe(
+                        pd.DataFrame({
+                            'Recommended': suggestions['consequents'].map(', '.join),
+                            'Because Of': suggestions['antecedents'].map(', '.join),
+                            'Support': (suggestions['support'] * 100).map('{:.1f}%'.format),
+                            'Confidence': (suggestions['confidence'] * 100).map('{:.1f}%'.format),
+                            'Lift': suggestions['lift'].map('{:.2f}'.format)
+                        }),
+                        hide_index=True,
+                        width='stretch'
+                    )
+                st.caption(f"Lookup {lookup_ms:.2f} ms dari index {len(index):,} rules")
         else:
-            st.error("Tidak cukup data untuk menghasilkan association rules. Coba kurangi minimum support.")
+            st.error("Tidak ada association rules yang memenuhi threshold. Coba kurangi minimum support, confidence atau lift.")
             
     except Exception as e:
         st.error(f"Error dalam analisis: {str(e)}")
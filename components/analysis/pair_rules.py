@@ -0,0 +1,60 @@
+"""Exact 1 -> 1 association rules from a sparse co-occurrence product.
+
+For a boolean invoice x product matrix X, ``Xᵀ·X`` holds the number of
+invoices containing every pair of products (and each product alone on the
+diagonal). Support, confidence and lift of every product pair follow from
+those counts, over the complete basket and without itemset mining.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .sparse_basket import SparseBasket
+
+
+def pair_counts(basket: SparseBasket) -> sp.coo_matrix:
+    """Co-occurrence counts of every product pair (upper triangle, i < j)."""
+    matrix = basket.matrix.astype(np.int32)
+    return sp.triu(matrix.T @ matrix, k=1).tocoo()
+
+
+def pairwise_rules(basket: SparseBasket, min_support: float) -> pd.DataFrame:
+    """All pair rules A -> B (both directions) with support >= ``min_support``.
+
+    Returns:
+        pd.DataFrame: antecedents, consequents (frozensets of item names),
+        antecedent support, consequent support, support, confidence and lift,
+        as in ``mlxtend.frequent_patterns.association_rules``
+    """
+    n_transactions = basket.n_transactions
+    if n_transactions == 0:
+        return pd.DataFrame(columns=[
+            'antecedents', 'consequents', 'antecedent support', 'consequent support',
+            'support', 'confidence', 'lift'
+        ])
+
+    item_support = basket.item_counts() / n_transactions
+    counts = pair_counts(basket)
+    keep = counts.data / n_transactions >= min_support
+    first, second = counts.row[keep], counts.col[keep]
+    pair_support = counts.data[keep] / n_transactions
+
+    # Setiap pasangan menghasilkan dua rule: A -> B dan B -> A
+    antecedents = np.concatenate([first, second])
+    consequents = np.concatenate([second, first])
+    support = np.concatenate([pair_support, pair_support])
+    antecedent_support = item_support[antecedents]
+    consequent_support = item_support[consequents]
+    confidence = support / antecedent_support
+
+    items = basket.items
+    return pd.DataFrame({
+        'antecedents': [frozenset([item]) for item in items[antecedents]],
+        'consequents': [frozenset([item]) for item in items[consequents]],
+        'antecedent support': antecedent_support,
+        'consequent support': consequent_support,
+        'support': support,
+        'confidence': confidence,
+        'lift': confidence / consequent_support
+    })
@@ -0,0 +1,97 @@
+"""Multi-core frequent itemset mining over invoice shards (SON algorithm).
+
+Invoices are split into contiguous shards. Each worker process mines the
+itemsets that are frequent inside its shard; an itemset that is frequent
+overall must be locally frequent in at least one shard, so the union of
+local results is a complete candidate set. A second pass counts every
+candidate in every shard to get the exact global support.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .itemsets import mine_frequent_itemsets
+from .sparse_basket import SparseBasket
+
+# Toleransi pembulatan supaya itemset yang tepat di batas support tidak hilang di shard
+_LOCAL_SUPPORT_TOLERANCE = 1e-9
+
+
+def _shard_bounds(n_transactions: int, shards: int):
+    edges = np.linspace(0, n_transactions, shards + 1).astype(int)
+    return [(start, end) for start, end in zip(edges[:-1], edges[1:]) if end > start]
+
+
+def _mine_shard(args):
+    """Phase 1: itemsets (as tuples of item positions) frequent within one shard."""
+    matrix, min_support, max_len, engine = args
+    shard = SparseBasket(matrix, pd.RangeIndex(matrix.shape[0]), pd.RangeIndex(matrix.shape[1]))
+    local = mine_frequent_itemsets(shard, min_support, max_len=max_len, engine=engine)
+    return [tuple(sorted(itemset)) for itemset in local['itemsets']]
+
+
+def _count_shard(args):
+    """Phase 2: number of transactions in one shard containing each candidate."""
+    matrix, candidates = args
+    csc = matrix.tocsc()
+    csc.sort_indices()
+
+    def column(item):
+        return csc.indices[csc.indptr[item]:csc.indptr[item + 1]]
+
+    counts = np.zeros(len(candidates), dtype=np.int64)
+    for position, itemset in enumerate(candidates):
+        tids = column(itemset[0])
+        for item in itemset[1:]:
+            if len(tids) == 0:
+                break
+            tids = np.intersect1d(tids, column(item), assume_unique=True)
+        counts[position] = len(tids)
+    return counts
+
+
+def mine_frequent_itemsets_parallel(basket: SparseBasket, min_support: float,
+                                    max_len: Optional[int] = None, engine: str = 'auto',
+                                    workers: Optional[int] = None) -> pd.DataFrame:
+    """Mine frequent itemsets with a process pool, with exact global support.
+
+    Args:
+        basket: Sparse invoice x product matrix
+        min_support: Minimum fraction of transactions containing the itemset
+        max_len: Maximum itemset length, None for no limit
+        engine: Itemset engine used inside each shard
+        workers: Number of worker processes (and shards), defaults to the CPU count
+
+    Returns:
+        pd.DataFrame: Same layout and values as ``mine_frequent_itemsets``
+    """
+    workers = workers or os.cpu_count() or 1
+    n_transactions = basket.n_transactions
+    if workers <= 1 or n_transactions < 2 * workers:
+        return mine_frequent_itemsets(basket, min_support, max_len=max_len, engine=engine)
+
+    matrix = basket.matrix
+    shards = [matrix[start:end] for start, end in _shard_bounds(n_transactions, workers)]
+    local_support = min_support * (1 - _LOCAL_SUPPORT_TOLERANCE)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        local_results = executor.map(
+            _mine_shard,
+            [(shard, local_support, max_len, engine) for shard in shards]
+        )
+        candidates = sorted(set().union(*local_results), key=lambda itemset: (len(itemset), itemset))
+
+        shard_counts = executor.map(_count_shard, [(shard, candidates) for shard in shards])
+        counts = np.sum(list(shard_counts), axis=0) if candidates else np.zeros(0, dtype=np.int64)
+
+    support = counts / n_transactions
+    keep = np.flatnonzero(support >= min_support)
+    items = basket.items
+    return pd.DataFrame({
+        'support': support[keep],
+        'itemsets': [frozenset(items[list(candidates[position])]) for position in keep]
+    })
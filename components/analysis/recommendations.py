@@ -0,0 +1,90 @@
+"""Product recommendations from association rules.
+
+``RuleIndex`` groups a rules frame by antecedent once, with the consequents
+of every antecedent ranked by lift. A lookup is then a dictionary access
+plus a scan of that antecedent's own rules, independent of the total
+number of rules.
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# Kolom metrik yang disimpan per rule
+_METRICS = ['support', 'confidence', 'lift']
+
+
+class RuleIndex:
+    """Inverted index from antecedent itemsets to their ranked consequents.
+
+    Attributes:
+        items: Sorted product names that appear in any antecedent
+    """
+
+    def __init__(self, rules: pd.DataFrame):
+        codes, antecedents = pd.factorize(rules['antecedents'])
+        lift = rules['lift'].to_numpy()
+        confidence = rules['confidence'].to_numpy()
+        # Urutkan per antecedent, lalu lift dan confidence tertinggi dulu
+        order = np.lexsort((-confidence, -lift, codes))
+
+        self._consequents = rules['consequents'].to_numpy()[order]
+        self._metrics = {metric: rules[metric].to_numpy()[order] for metric in _METRICS}
+        bounds = np.searchsorted(codes[order], np.arange(len(antecedents) + 1))
+        self._entries = {
+            antecedent: (bounds[code], bounds[code + 1])
+            for code, antecedent in enumerate(antecedents)
+        }
+        self.items = sorted({item for antecedent in antecedents for item in antecedent})
+
+    def __len__(self):
+        return len(self._consequents)
+
+    def _lookup(self, key, exclude, k, min_support, min_confidence, min_lift):
+        """Positions of the top-k rules of one antecedent that pass the thresholds."""
+        if key not in self._entries:
+            return []
+        start, end = self._entries[key]
+        valid = (
+            (self._metrics['support'][start:end] >= min_support) &
+            (self._metrics['confidence'][start:end] >= min_confidence) &
+            (self._metrics['lift'][start:end] >= min_lift)
+        )
+        positions = []
+        for position in start + np.flatnonzero(valid):
+            if exclude.isdisjoint(self._consequents[position]):
+                positions.append(position)
+                if len(positions) == k:
+                    break
+        return positions
+
+    def recommend(self, products: Iterable[str], k: int = 5, min_support: float = 0.0,
+                  min_confidence: float = 0.0, min_lift: float = 0.0) -> pd.DataFrame:
+        """Top-k consequents for a set of products, strongest lift first.
+
+        Rules whose antecedent is exactly ``products`` are used, plus the
+        rules of each single product; consequents already in ``products``
+        are skipped.
+
+        Returns:
+            pd.DataFrame: consequents, antecedents, support, confidence and lift
+        """
+        query = frozenset(products)
+        keys = [query] + [frozenset([product]) for product in query if len(query) > 1]
+
+        best = {}
+        for key in keys:
+            for position in self._lookup(key, query, k, min_support, min_confidence, min_lift):
+                consequent = self._consequents[position]
+                # Consequent yang sama dari beberapa antecedent: ambil rule dengan lift tertinggi
+                if consequent not in best or self._metrics['lift'][position] > best[consequent][1]:
+                    best[consequent] = (key, self._metrics['lift'][position], position)
+
+        ranked = sorted(best.items(), key=lambda entry: -entry[1][1])[:k]
+        positions = [position for _, (_, _, position) in ranked]
+        return pd.DataFrame({
+            'consequents': [consequent for consequent, _ in ranked],
+            'antecedents': [key for _, (key, _, _) in ranked],
+            **{metric: self._metrics[metric][positions] for metric in _METRICS}
+        })
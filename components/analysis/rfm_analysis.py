@@ -1,26 +1,18 @@
 """RFM Analysis component."""
 
+from typing import Union
 import streamlit as st
+import numpy as np
 import pandas as pd
 import altair as alt
+from ..aggregates import TransactionAggregates, get_aggregates
+from ..memo import memoize
 from ..metrics_card import metric_card
+from ..paged_table import display_paged_table
+from ..profiling import stage
 
-def calculate_rfm(df: pd.DataFrame):
-    """Calculate RFM metrics."""
-    # Calculate reference date
-    reference_date = df['InvoiceDate'].max() + pd.DateOffset(days=1)
-    
-    # Calculate RFM metrics
-    df['TotalAmount'] = df['Quantity'] * df['UnitPrice']
-    rfm = df.groupby('CustomerID').agg({
-        'InvoiceDate': lambda x: (reference_date - x.max()).days,  # Recency
-        'InvoiceNo': 'count',  # Frequency
-        'TotalAmount': 'sum'  # Monetary
-    }).reset_index()
-    
-    rfm.columns = ['CustomerID', 'Recency', 'Frequency', 'Monetary']
-    
-    # Calculate RFM scores
+def score_rfm(rfm: pd.DataFrame):
+    """Add R, F, M and total RFM scores to a per-customer RFM frame."""
     rfm['R_Score'] = pd.qcut(rfm['Recency'], 4, labels=[4, 3, 2, 1])
     rfm['F_Score'] = pd.qcut(rfm['Frequency'].rank(method='first'), 4, labels=[1, 2, 3, 4])
     rfm['M_Score'] = pd.qcut(rfm['Monetary'], 4, labels=[1, 2, 3, 4])
@@ -28,7 +20,23 @@ def calculate_rfm(df: pd.DataFrame):
     
     return rfm
 
-def display_rfm_analysis(df: pd.DataFrame):
+@memoize
+def calculate_rfm(df: Union[pd.DataFrame, TransactionAggregates]):
+    """Calculate RFM metrics from the shared customer aggregates."""
+    aggregates = get_aggregates(df)
+    customers = aggregates.customers
+    
+    # Calculate RFM metrics (reference date = one day after the last transaction)
+    rfm = pd.DataFrame({
+        'CustomerID': customers['CustomerID'],
+        'Recency': aggregates.recency_days(offset_days=1),
+        'Frequency': customers['Frequency'],
+        'Monetary': customers['Monetary']
+    })
+    
+    return score_rfm(rfm)
+
+def display_rfm_analysis(df: Union[pd.DataFrame, TransactionAggregates]):
     """Display RFM analysis section."""
     st.markdown("## 👥 RFM Analysis")
     
@@ -77,25 +85,25 @@ def display_rfm_analysis(df: pd.DataFrame):
     # RFM Score Table
     st.markdown("### 📊 Tabel RFM Score")
     
-    def style_rfm_scores(val):
-        if isinstance(val, (int, float)):
-            if val >= 10:
-                return 'background-color: #00ff0020'
-            elif val >= 7:
-                return 'background-color: #ffff0020'
-            else:
-                return 'background-color: #ff000020'
-        return ''
-    
-    st.dataframe(
-        rfm.style
-        .format({
+    def style_rfm_scores(scores):
+        return np.select(
+            [scores >= 10, scores >= 7],
+            ['background-color: #00ff0020', 'background-color: #ffff0020'],
+            'background-color: #ff000020'
+        )
+    
+    display_paged_table(
+        rfm,
+        key="rfm_table",
+        formats={
             'Recency': '{:.0f}',
             'Frequency': '{:.0f}',
             'Monetary': '${:,.2f}',
             'RFM_Score': '{:.0f}'
-        })
-        .applymap(style_rfm_scores, subset=['RFM_Score'])
+        },
+        styles={'RFM_Score': style_rfm_scores},
+        search_column='CustomerID',
+        default_sort='RFM_Score'
     )
     
     # Visualisasi
@@ -112,7 +120,8 @@ def display_rfm_analysis(df: pd.DataFrame):
         color=alt.Color('RFM Score:Q', scale=alt.Scale(scheme='viridis'))
     ).properties(height=300)
     
-    st.altair_chart(chart, use_container_width=True)
+    with stage('chart: RFM score distribution', rows=len(chart_data)):
+        st.altair_chart(chart, use_container_width=True)
     
     # Insights
     st.markdown("### 🎯 Key Insights")
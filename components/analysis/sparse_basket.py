@@ -0,0 +1,120 @@
+"""Sparse invoice x product basket matrix."""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+class SparseBasket:
+    """Invoice x product incidence matrix stored as CSR.
+
+    Attributes:
+        matrix: Boolean ``scipy.sparse.csr_matrix``, one row per invoice and
+            one column per product
+        invoices: Invoice numbers in row order
+        items: Product descriptions in column order
+    """
+
+    def __init__(self, matrix: sp.csr_matrix, invoices: pd.Index, items: pd.Index):
+        self.matrix = matrix
+        self.invoices = invoices
+        self.items = items
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the matrix and item names, used as cache key."""
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=20)
+            digest.update(np.asarray(self.matrix.shape, dtype='int64').tobytes())
+            digest.update(self.matrix.indptr.tobytes())
+            digest.update(self.matrix.indices.tobytes())
+            digest.update(pd.util.hash_pandas_object(self.items, index=False).to_numpy().tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    @property
+    def n_transactions(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def n_items(self) -> int:
+        return self.matrix.shape[1]
+
+    @property
+    def density(self) -> float:
+        """Fraction of non-zero cells."""
+        cells = self.n_transactions * self.n_items
+        return self.matrix.nnz / cells if cells else 0.0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated working set: the CSR matrix plus one column-major copy for mining."""
+        csr_bytes = self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes
+        return 2 * csr_bytes
+
+    @property
+    def dense_bytes(self) -> int:
+        """Size of the equivalent dense int64 crosstab."""
+        return self.n_transactions * self.n_items * 8
+
+    def item_counts(self) -> np.ndarray:
+        """Number of invoices containing each item."""
+        return np.bincount(self.matrix.indices, minlength=self.n_items)
+
+
+def build_sparse_basket(df_filtered: pd.DataFrame) -> SparseBasket:
+    """Build a sparse basket matrix from filtered transaction lines.
+
+    Rows and columns are sorted by invoice number and description, matching
+    the layout of ``pd.crosstab``.
+    """
+    invoice_codes, invoices = pd.factorize(df_filtered['InvoiceNo'], sort=True)
+    item_codes, items = pd.factorize(df_filtered['Description'], sort=True)
+    valid = (invoice_codes >= 0) & (item_codes >= 0)
+    invoice_codes = invoice_codes[valid].astype('int64')
+    item_codes = item_codes[valid].astype('int64')
+
+    n_transactions, n_items = len(invoices), len(items)
+
+    # Satu produk bisa muncul beberapa kali di invoice yang sama, cukup dihitung sekali
+    pairs = np.unique(invoice_codes * n_items + item_codes)
+    rows = pairs // n_items
+    columns = (pairs % n_items).astype('int32')
+    indptr = np.searchsorted(rows, np.arange(n_transactions + 1)).astype('int32')
+
+    matrix = sp.csr_matrix(
+        (np.ones(len(pairs), dtype=bool), columns, indptr),
+        shape=(n_transactions, n_items)
+    )
+    return SparseBasket(matrix, pd.Index(np.asarray(invoices)), pd.Index(np.asarray(items)))
+
+
+def concat_baskets(first: SparseBasket, second: SparseBasket) -> SparseBasket:
+    """Append the invoices of ``second`` below those of ``first``.
+
+    Products are aligned by name; the result has the sorted union of both
+    product sets as columns.
+
+    Raises:
+        ValueError: If both baskets contain the same invoice number
+    """
+    overlap = first.invoices.intersection(second.invoices)
+    if len(overlap):
+        raise ValueError(f"{len(overlap):,} invoice(s) already exist in the basket, e.g. {overlap[0]}")
+
+    items = first.items.union(second.items)
+    blocks = []
+    for basket in (first, second):
+        # Petakan kolom lama ke posisi produk pada gabungan
+        positions = items.get_indexer(basket.items).astype('int32')
+        matrix = basket.matrix
+        blocks.append(sp.csr_matrix(
+            (matrix.data, positions[matrix.indices], matrix.indptr),
+            shape=(matrix.shape[0], len(items))
+        ))
+    matrix = sp.vstack(blocks, format='csr')
+    matrix.sort_indices()
+    return SparseBasket(matrix, first.invoices.append(second.invoices), items)
@@ -0,0 +1,286 @@
+"""Headless batch run of the dashboard analyses.
+
+Loads one or more transaction CSVs with the dashboard's cleaning, runs the
+RFM, churn, CLV and market basket calculations without any UI, and writes
+the result tables plus a JSON timing report to an output directory.
+
+Usage:
+    python -m components.batch data/ --output results/ --workers 4
+    python -m components.batch OnlineRetail.csv --output results/ --format csv --analyses rfm churn
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Union
+
+import pandas as pd
+
+from . import settings
+from .aggregates import TransactionAggregates, build_aggregates
+from .analysis.churn_analysis import churn_table
+from .analysis.clv_analysis import calculate_clv
+from .analysis.itemsets import choose_engine
+from .analysis.market_basket import build_basket, filter_rules, mine_pair_rules, mine_rules
+from .analysis.rfm_analysis import calculate_rfm
+from .data_loader import load_transactions
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ['parquet', 'csv']
+
+# Jumlah file yang analisisnya boleh berjalan bersamaan. Setiap task yang belum
+# selesai menahan data file-nya di memori, jadi file berikutnya baru di-load
+# setelah file terlama selesai
+MAX_FILES_IN_FLIGHT = 2
+
+
+def _run_rfm(aggregates: TransactionAggregates, options: dict) -> Dict[str, pd.DataFrame]:
+    return {'rfm': calculate_rfm(aggregates)}
+
+
+def _run_churn(aggregates: TransactionAggregates, options: dict) -> Dict[str, pd.DataFrame]:
+    return {'churn': churn_table(aggregates, options['churn_days'])}
+
+
+def _run_clv(aggregates: TransactionAggregates, options: dict) -> Dict[str, pd.DataFrame]:
+    return {'clv': calculate_clv(aggregates)}
+
+
+def _run_basket(df: pd.DataFrame, options: dict) -> Dict[str, pd.DataFrame]:
+    item_stats, summary, basket, mining_basket = build_basket(df)
+    floor_support = min(settings.BASKET_SUPPORT_FLOOR, options['min_support'])
+    if options['rule_mode'] == 'pairs':
+        rules, _ = mine_pair_rules(basket, floor_support)
+    else:
+        # Satu proses per analisis, jadi mining di dalamnya tidak diparalelkan lagi
+        _, rules, _ = mine_rules(mining_basket, floor_support, choose_engine(mining_basket, floor_support), 1)
+    if rules is not None:
+        rules = filter_rules(rules, options['min_support'], options['min_confidence'], options['min_lift'])
+    return {'basket_items': item_stats.reset_index(), 'basket_rules': rules}
+
+
+# Nama analisis -> fungsi yang menghasilkan tabel output (nama file -> frame)
+ANALYSES = {
+    'rfm': _run_rfm,
+    'churn': _run_churn,
+    'clv': _run_clv,
+    'basket': _run_basket
+}
+
+# Analisis yang butuh frame transaksi; yang lain cukup menerima agregat per
+# customer yang dibangun sekali per file (jauh lebih kecil untuk di-pickle)
+TRANSACTION_ANALYSES = {'basket'}
+
+
+def find_inputs(paths: List[str]) -> List[str]:
+    """Expand directories to the CSV files they contain (sorted)."""
+    inputs = []
+    for path in paths:
+        if os.path.isdir(path):
+            inputs.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.csv')
+            ))
+        else:
+            inputs.append(path)
+    return inputs
+
+
+def write_table(frame: pd.DataFrame, path: str, output_format: str) -> str:
+    """Write one result table; itemset columns are stored as comma-separated text."""
+    frame = frame.copy(deep=False)
+    for column in frame.columns:
+        if frame[column].dtype == object and len(frame) and isinstance(frame[column].iloc[0], frozenset):
+            frame[column] = frame[column].map(lambda itemset: ', '.join(sorted(itemset)))
+
+    path = f"{path}.{output_format}"
+    if output_format == 'parquet':
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+
+def run_analysis(name: str, data: Union[pd.DataFrame, TransactionAggregates], output_dir: str,
+                 output_format: str, options: dict) -> dict:
+    """Run one analysis and write its tables (executed in a worker process).
+
+    Args:
+        data: Transaction frame for ``TRANSACTION_ANALYSES``, the file's
+            customer aggregates for the others
+    """
+    start = time.perf_counter()
+    outputs = {}
+    for table, frame in ANALYSES[name](data, options).items():
+        if frame is None:
+            continue
+        outputs[table] = {
+            'path': write_table(frame, os.path.join(output_dir, table), output_format),
+            'rows': len(frame)
+        }
+    return {'seconds': time.perf_counter() - start, 'outputs': outputs}
+
+
+def _dataset_name(path: str, used: set) -> str:
+    """Output directory name for an input file, unique within the run."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name, suffix = stem, 2
+    while name in used:
+        name, suffix = f"{stem}-{suffix}", suffix + 1
+    used.add(name)
+    return name
+
+
+def _collect(dataset: dict, tasks: list):
+    """Wait for the analyses of one file and record their results in ``dataset``."""
+    for analysis, future in tasks:
+        try:
+            dataset['analyses'][analysis] = future.result()
+            logger.info("%s/%s done in %.2fs", dataset['name'], analysis, dataset['analyses'][analysis]['seconds'])
+        except Exception as e:
+            logger.error("%s/%s failed: %s", dataset['name'], analysis, e)
+            dataset['errors'][analysis] = str(e)
+
+
+def run_batch(inputs: List[str], output_dir: str, analyses: List[str] = None,
+              output_format: str = 'parquet', workers: int = None, options: dict = None,
+              max_files_in_flight: int = MAX_FILES_IN_FLIGHT) -> dict:
+    """Load every input file and run the analyses in a process pool.
+
+    Files are loaded one at a time (through the dataset cache) and the
+    customer aggregates are built once per file; every (file, analysis)
+    pair is then a separate task, so the analyses of one file run in
+    parallel. RFM, churn and CLV receive the aggregates, only the basket
+    task receives the transaction frame. At most ``max_files_in_flight``
+    files have unfinished tasks, which bounds peak memory for directory runs.
+
+    Returns:
+        dict: Timing report, also written to ``batch_report.json``
+    """
+    analyses = analyses or list(ANALYSES)
+    workers = workers or os.cpu_count() or 1
+    max_files_in_flight = max(1, max_files_in_flight)
+    options = {
+        'churn_days': 90, 'min_support': 0.02, 'min_confidence': 0.0, 'min_lift': 1.0, 'rule_mode': 'itemsets',
+        **(options or {})
+    }
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    report = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'workers': workers,
+        'max_files_in_flight': max_files_in_flight,
+        'format': output_format,
+        'options': options,
+        'datasets': []
+    }
+    used_names = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for path in inputs:
+            # Tunggu file terlama selesai sebelum me-load file berikutnya
+            while len(pending) >= max_files_in_flight:
+                _collect(*pending.popleft())
+
+            name = _dataset_name(path, used_names)
+            dataset = {'source': path, 'name': name, 'analyses': {}, 'errors': {}}
+            report['datasets'].append(dataset)
+            try:
+                with open(path, 'rb') as file_obj:
+                    df = load_transactions(file_obj)
+            except Exception as e:
+                logger.error("Failed to load %s: %s", path, e)
+                dataset['errors']['load'] = str(e)
+                continue
+
+            load_report = df.attrs['load_report']
+            dataset.update(rows=len(df), load_seconds=load_report['load_seconds'], load_source=load_report['source'])
+            logger.info("Loaded %s: %s rows from %s in %.2fs", path, f"{len(df):,}", load_report['source'],
+                        load_report['load_seconds'])
+
+            try:
+                aggregates = build_aggregates(df) if set(analyses) - TRANSACTION_ANALYSES else None
+            except Exception as e:
+                logger.error("Failed to aggregate %s: %s", path, e)
+                dataset['errors']['aggregate'] = str(e)
+                continue
+
+            dataset_dir = os.path.join(output_dir, name)
+            os.makedirs(dataset_dir, exist_ok=True)
+            tasks = []
+            for analysis in analyses:
+                data = df if analysis in TRANSACTION_ANALYSES else aggregates
+                future = executor.submit(run_analysis, analysis, data, dataset_dir, output_format, options)
+                tasks.append((analysis, future))
+            pending.append((dataset, tasks))
+            # Setelah ini data hanya ditahan oleh task yang belum selesai
+            del df, aggregates, data
+
+        while pending:
+            _collect(*pending.popleft())
+
+    report['total_seconds'] = time.perf_counter() - start
+    with open(os.path.join(output_dir, 'batch_report.json'), 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help="CSV files or directories with CSV files")
+    parser.add_argument('--output', '-o', required=True, help="Output directory")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='parquet')
+    parser.add_argument('--analyses', nargs='+', choices=list(ANALYSES), default=list(ANALYSES))
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--max-files-in-flight', type=int, default=MAX_FILES_IN_FLIGHT,
+                        help="Files whose analyses may run at the same time (bounds memory)")
+    parser.add_argument('--churn-days', type=int, default=90)
+    parser.add_argument('--min-support', type=float, default=0.02)
+    parser.add_argument('--min-confidence', type=float, default=0.0)
+    parser.add_argument('--min-lift', type=float, default=1.0)
+    parser.add_argument('--rule-mode', choices=['itemsets', 'pairs'], default='itemsets')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s %(levelname)s %(message)s")
+    logger.setLevel(logging.INFO)
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        parser.error("no CSV files found")
+
+    report = run_batch(
+        inputs,
+        args.output,
+        analyses=args.analyses,
+        output_format=args.format,
+        workers=args.workers,
+        max_files_in_flight=args.max_files_in_flight,
+        options={
+            'churn_days': args.churn_days,
+            'min_support': args.min_support,
+            'min_confidence': args.min_confidence,
+            'min_lift': args.min_lift,
+            'rule_mode': args.rule_mode
+        }
+    )
+
+    print(f"{'dataset':<24}{'step':<10}{'seconds':>10}")
+    for dataset in report['datasets']:
+        if 'load_seconds' in dataset:
+            print(f"{dataset['name']:<24}{'load':<10}{dataset['load_seconds']:>10.2f}")
+        for analysis, result in dataset['analyses'].items():
+            print(f"{dataset['name']:<24}{analysis:<10}{result['seconds']:>10.2f}")
+        for step, error in dataset['errors'].items():
+            print(f"{dataset['name']:<24}{step:<10}{'FAILED':>10}  {error}")
+    print(f"total {report['total_seconds']:.2f}s · report: {os.path.join(args.output, 'batch_report.json')}")
+    return 1 if any(dataset['errors'] for dataset in report['datasets']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Server-side chart data for Altair.
+
+Altair serializes every row of a chart's data to JSON and aggregates in the
+browser. The helpers here bin, average and sample per-customer or per-rule
+frames on the server, so the size of a chart's data depends on the number of
+bins or points shown instead of the number of customers.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from . import settings
+
+
+def _nice_step(span: float, maxbins: int) -> float:
+    """Smallest 1/2/5 x 10^k step that covers ``span`` in at most ``maxbins`` bins (as Vega-Lite bins)."""
+    raw = span / maxbins
+    magnitude = 10 ** np.floor(np.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw:
+            return float(factor * magnitude)
+
+
+def bin_edges(values, maxbins: int = 30) -> np.ndarray:
+    """Evenly spaced bin edges with a rounded step, covering all finite values."""
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.array([0.0, 1.0])
+    low, high = values.min(), values.max()
+    if low == high:
+        return np.array([low - 0.5, high + 0.5])
+    step = _nice_step(high - low, maxbins)
+    start = np.floor(low / step) * step
+    n_bins = int(np.ceil((high - start) / step))
+    # Nilai maksimum yang tepat di batas bin masuk ke bin terakhir
+    if start + n_bins * step <= high:
+        n_bins += 1
+    return start + step * np.arange(n_bins + 1)
+
+
+def histogram(values, maxbins: int = 30) -> pd.DataFrame:
+    """Counts per bin, for ``alt.X(..., bin='binned')`` with ``x2='bin_end'``.
+
+    Returns:
+        pd.DataFrame: bin_start, bin_end, count
+    """
+    values = np.asarray(values, dtype=float)
+    edges = bin_edges(values, maxbins)
+    counts, _ = np.histogram(values[np.isfinite(values)], bins=edges)
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+
+def mean_value(values) -> pd.DataFrame:
+    """One-row frame with the mean of the finite values, for a rule layer."""
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    return pd.DataFrame({'mean': [values.mean() if len(values) else np.nan]})
+
+
+def density_grid(x, y, value=None, maxbins: int = 40) -> pd.DataFrame:
+    """2D binned counts of a scatter, with the mean of ``value`` per cell.
+
+    Empty cells are dropped, so the frame has at most ``maxbins ** 2`` rows.
+
+    Returns:
+        pd.DataFrame: x_start, x_end, y_start, y_end, count and value_mean
+        (if ``value`` is given)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    x_edges, y_edges = bin_edges(x, maxbins), bin_edges(y, maxbins)
+
+    # Index sel per titik, lalu satu bincount untuk jumlah dan total nilai
+    x_index = np.clip(np.searchsorted(x_edges, x, side='right') - 1, 0, len(x_edges) - 2)
+    y_index = np.clip(np.searchsorted(y_edges, y, side='right') - 1, 0, len(y_edges) - 2)
+    n_y = len(y_edges) - 1
+    cells = x_index * n_y + y_index
+    size = (len(x_edges) - 1) * n_y
+    counts = np.bincount(cells, minlength=size)
+    occupied = np.flatnonzero(counts)
+
+    grid = pd.DataFrame({
+        'x_start': x_edges[occupied // n_y],
+        'x_end': x_edges[occupied // n_y + 1],
+        'y_start': y_edges[occupied % n_y],
+        'y_end': y_edges[occupied % n_y + 1],
+        'count': counts[occupied]
+    })
+    if value is not None:
+        value = np.asarray(value, dtype=float)[finite]
+        totals = np.bincount(cells, weights=np.nan_to_num(value), minlength=size)
+        grid['value_mean'] = totals[occupied] / counts[occupied]
+    return grid
+
+
+def stratified_sample(df: pd.DataFrame, max_points: Optional[int] = None,
+                      strata: Optional[str] = None, seed: int = 0) -> pd.DataFrame:
+    """About ``max_points`` rows, sampled proportionally from every stratum.
+
+    Each non-empty stratum keeps at least one row, so small groups stay
+    visible (the result can exceed ``max_points`` by the number of
+    strata). Sampling is seeded, so the same frame always gives the same
+    points.
+    """
+    if max_points is None:
+        max_points = settings.CHART_MAX_POINTS
+    if len(df) <= max_points:
+        return df
+
+    rng = np.random.default_rng(seed)
+    if strata is None:
+        positions = rng.choice(len(df), size=max_points, replace=False)
+    else:
+        codes, _ = pd.factorize(df[strata], use_na_sentinel=False)
+        sizes = np.bincount(codes)
+        quotas = np.maximum(1, np.floor(sizes * max_points / len(df)).astype(np.int64))
+        # Urutan acak, lalu ambil `quota` baris pertama dari tiap stratum
+        shuffled = rng.permutation(len(df))
+        shuffled = shuffled[np.argsort(codes[shuffled], kind='stable')]
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        rank = np.arange(len(df)) - np.repeat(starts, sizes)
+        positions = shuffled[rank < np.repeat(quotas, sizes)]
+    return df.iloc[np.sort(positions)]
@@ -0,0 +1,78 @@
+"""Encoding and delimiter detection for uploaded CSV files."""
+
+import codecs
+import csv
+import time
+
+# Jumlah byte awal file yang dibaca untuk deteksi
+SNIFF_BYTES = 1024 * 1024
+
+DELIMITERS = ',;\t|'
+
+# Byte yang tidak terdefinisi di cp1252; jika muncul, file lebih cocok dibaca sebagai latin1
+_CP1252_UNDEFINED = frozenset(b'\x81\x8d\x8f\x90\x9d')
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Pick the most likely encoding for a byte prefix.
+
+    UTF-8 is tried strictly first because latin1 accepts any byte sequence
+    and would silently mis-decode UTF-8 text.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    # Decoder incremental supaya karakter multi-byte yang terpotong di akhir sample tidak dianggap error
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
+    try:
+        decoder.decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if _CP1252_UNDEFINED.isdisjoint(sample):
+        return 'cp1252'
+    return 'latin1'
+
+
+def detect_delimiter(text: str) -> str:
+    """Detect the field delimiter from decoded sample text."""
+    # Baris terakhir sample mungkin terpotong, jadi tidak ikut dianalisis
+    lines = text.splitlines()[:-1] or text.splitlines()
+    try:
+        return csv.Sniffer().sniff('\n'.join(lines[:50]), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        return ','
+
+
+def sniff_csv(file_obj, sample_bytes: int = SNIFF_BYTES) -> dict:
+    """Sniff encoding and delimiter from the first bytes of ``file_obj``.
+
+    The file cursor is restored afterwards so the caller can parse the file
+    exactly once with the detected settings.
+
+    Returns:
+        dict: ``encoding``, ``delimiter``, ``sniff_bytes`` and ``sniff_seconds``
+    """
+    start = time.perf_counter()
+    position = file_obj.tell()
+    file_obj.seek(0)
+    try:
+        sample = file_obj.read(sample_bytes)
+    finally:
+        file_obj.seek(position)
+
+    if isinstance(sample, str):
+        # Stream teks sudah ter-decode, encoding tidak relevan lagi
+        encoding = None
+        text = sample
+    else:
+        encoding = detect_encoding(sample)
+        text = sample.decode(encoding, errors='replace')
+
+    return {
+        'encoding': encoding,
+        'delimiter': detect_delimiter(text),
+        'sniff_bytes': len(sample),
+        'sniff_seconds': time.perf_counter() - start,
+    }
@@ -1,8 +1,20 @@
 """Data loader component."""
 
+import logging
+import os
+import tempfile
+import time
+from typing import Union
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from . import dataset_cache, memo, polars_engine, settings, sql_backend
+from .profiling import profiled, stage
+from .aggregates import AggregateAccumulator, TransactionAggregates
+from .csv_sniffer import sniff_csv
+from .date_formats import merge_stats, parse_dates
+
+logger = logging.getLogger(__name__)
 
 def format_date_safely(date_value):
     """Format date safely, handling both datetime and string inputs."""
@@ -13,6 +25,249 @@ def format_date_safely(date_value):
     except:
         return str(date_value)
 
+# Tipe kolom yang dipaksa saat membaca CSV
+CSV_DTYPES = {
+    'InvoiceNo': str,
+    'StockCode': str,
+    'Description': str,
+    'Quantity': float,
+    'UnitPrice': float,
+    'CustomerID': str,
+    'Country': str
+}
+
+# Encoding cadangan yang selalu berhasil men-decode byte apa pun
+FALLBACK_ENCODING = 'latin1'
+
+def _file_size(file_obj):
+    """Return the size of a seekable file object in bytes."""
+    position = file_obj.tell()
+    file_obj.seek(0, 2)
+    size = file_obj.tell()
+    file_obj.seek(position)
+    return size
+
+def _read_csv(file_obj, encoding, delimiter, **kwargs):
+    """Parse a transaction CSV from the start of ``file_obj``."""
+    file_obj.seek(0)
+    return pd.read_csv(
+        file_obj,
+        encoding=encoding,
+        sep=delimiter,
+        on_bad_lines='skip',
+        low_memory=False,
+        dtype=CSV_DTYPES,
+        **kwargs
+    )
+
+def _sniff_file(file_obj):
+    """Sniff encoding and delimiter and record the file size."""
+    report = sniff_csv(file_obj)
+    report['file_bytes'] = _file_size(file_obj)
+    report['fallback'] = False
+    return report
+
+def read_transactions(file_obj):
+    """Read a transaction CSV, sniffing encoding and delimiter first.
+    
+    The file is parsed once with the detected settings. Only when the sniffed
+    prefix was valid UTF-8 but a later byte is not, the file is parsed a
+    second time with a single-byte encoding.
+    
+    Args:
+        file_obj: Seekable binary file object
+        
+    Returns:
+        tuple: (raw DataFrame, dict with encoding, delimiter, bytes and timings)
+    """
+    report = _sniff_file(file_obj)
+    
+    start = time.perf_counter()
+    with stage('read csv') as record:
+        try:
+            df = _read_csv(file_obj, report['encoding'], report['delimiter'])
+        except UnicodeDecodeError:
+            # Prefix valid UTF-8 tapi bagian file berikutnya tidak
+            report['fallback'] = True
+            report['encoding'] = FALLBACK_ENCODING
+            df = _read_csv(file_obj, report['encoding'], report['delimiter'])
+        record['rows'] = len(df)
+    report['parse_seconds'] = time.perf_counter() - start
+    report['raw_rows'] = len(df)
+    return df, report
+
+@profiled('clean')
+def clean_transactions(df: pd.DataFrame, report: dict = None):
+    """Clean a raw transaction frame and derive TotalAmount.
+    
+    Args:
+        df: Raw transaction frame
+        report: Load report; the InvoiceDate parse statistics are added
+            to ``report['date_parse']``
+    """
+    # Bersihkan data
+    df = df.dropna(subset=['InvoiceNo', 'Description', 'Quantity', 'UnitPrice'])
+    
+    # Convert InvoiceDate to datetime (format dideteksi sekali, tiap string unik di-parse sekali)
+    with stage('parse dates', rows=len(df)):
+        df['InvoiceDate'], stats = parse_dates(df['InvoiceDate'])
+    if report is not None:
+        report['date_parse'] = merge_stats(report.get('date_parse'), stats)
+    df = df.dropna(subset=['InvoiceDate'])  # Hapus baris dengan tanggal invalid
+    
+    # Calculate TotalAmount
+    df['TotalAmount'] = df['Quantity'] * df['UnitPrice']
+    
+    # Filter data yang valid
+    df = df[
+        (df['Quantity'] > 0) &  # Hanya quantity positif
+        (df['UnitPrice'] > 0)   # Hanya harga positif
+    ]
+    return df
+
+def _polars_source(file_obj, report):
+    """File content as UTF-8 for Polars, with the same encoding fallback as ``read_transactions``."""
+    try:
+        return polars_engine.utf8_source(file_obj, report['encoding'])
+    except UnicodeDecodeError:
+        report['fallback'] = True
+        report['encoding'] = FALLBACK_ENCODING
+        return polars_engine.utf8_source(file_obj, report['encoding'])
+
+def read_clean_polars(file_obj):
+    """Read and clean a transaction CSV with the Polars engine.
+    
+    Returns:
+        tuple or None: (cleaned DataFrame, report) like ``read_transactions``
+        followed by ``clean_transactions``; None when the engine is off or
+        cannot read the file like pandas does (then use the pandas path)
+    """
+    if not polars_engine.enabled():
+        return None
+    
+    report = _sniff_file(file_obj)
+    start = time.perf_counter()
+    try:
+        with stage('polars: read + clean') as record:
+            df, report['raw_rows'], report['date_parse'] = polars_engine.read_clean(
+                _polars_source(file_obj, report), report['delimiter']
+            )
+            record['rows'] = len(df)
+    except polars_engine.ENGINE_ERRORS as e:
+        logger.warning("Polars engine cannot read the file, using pandas: %s", e)
+        return None
+    report['parse_seconds'] = time.perf_counter() - start
+    report['engine'] = 'polars'
+    return df, report
+
+# Kolom teks yang nilainya banyak berulang, disimpan sebagai categorical (kode integer)
+CATEGORICAL_COLUMNS = ['InvoiceNo', 'StockCode', 'Description', 'CustomerID', 'Country']
+
+@profiled('compact')
+def compact_transactions(df: pd.DataFrame):
+    """Convert a cleaned frame to a compact dtype layout.
+    
+    Repeating text columns become categoricals (integer codes into a
+    dictionary of unique values) and Quantity is downcast to the smallest
+    integer type when every value is whole. UnitPrice and TotalAmount stay
+    float64 so monetary totals are unchanged.
+    
+    The columns are replaced in place, one at a time, so only one column
+    exists twice at any moment; pass a frame the caller owns (the result
+    of ``clean_transactions`` or the Polars reader).
+    
+    Returns:
+        tuple: (compact DataFrame, dict with memory before and after in bytes)
+    """
+    memory_before = int(df.memory_usage(deep=True).sum())
+    
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    
+    quantity = df['Quantity']
+    if (quantity % 1 == 0).all():
+        df['Quantity'] = pd.to_numeric(quantity.astype('int64'), downcast='integer')
+    
+    memory_after = int(df.memory_usage(deep=True).sum())
+    return df, {'memory_before_bytes': memory_before, 'memory_after_bytes': memory_after}
+
+def _load_dataset(file_obj, warn):
+    """Shared body of ``load_data`` and ``load_transactions``.
+    
+    Returns the Parquet dataset cache entry of the file when there is one,
+    otherwise reads, cleans and compacts the file and stores it in the cache.
+    
+    Args:
+        file_obj: Seekable binary file object
+        warn: Called with a message for problems that do not stop the load
+        
+    Returns:
+        pd.DataFrame: Processed DataFrame with the load report in ``attrs``
+        
+    Raises:
+        ValueError: When the file cannot be read or cleaned (message is
+            ready to show to the user)
+    """
+    start = time.perf_counter()
+    
+    # Cek cache di disk berdasarkan hash isi file
+    key = dataset_cache.cache_key(dataset_cache.content_hash(file_obj))
+    df = dataset_cache.get(key)
+    if df is not None:
+        report = dict(df.attrs.get('load_report', {}))
+        report['source'] = 'cache'
+        report['load_seconds'] = time.perf_counter() - start
+        df.attrs['load_report'] = report
+        df.attrs['source_digest'] = key
+        return df
+    
+    try:
+        # Engine Polars membaca dan membersihkan dalam satu query
+        result = read_clean_polars(file_obj)
+        df, report = result if result is not None else read_transactions(file_obj)
+    except Exception as e:
+        raise ValueError(f"Failed to read the file: {str(e)}") from e
+    
+    if report['fallback']:
+        warn(f"File is not valid UTF-8, read with {report['encoding']} encoding instead")
+    
+    try:
+        if result is None:
+            df = clean_transactions(df, report)
+        df, memory = compact_transactions(df)
+        report.update(memory)
+    except Exception as e:
+        raise ValueError(f"Error preprocessing data: {str(e)}") from e
+    
+    report['source'] = 'csv'
+    report['load_seconds'] = time.perf_counter() - start
+    df.attrs['load_report'] = report
+    # Dipakai memo sebagai fingerprint dataset, dihitung sekali saat load
+    df.attrs['source_digest'] = key
+    
+    # Simpan hasil cleaning ke cache untuk load berikutnya
+    try:
+        dataset_cache.put(key, df)
+    except Exception as e:
+        warn(f"Failed to write dataset cache: {str(e)}")
+    
+    return df
+
+def load_transactions(file_obj):
+    """Load a transaction CSV without the UI (batch jobs).
+
+    Same dataset cache, cleaning and compact layout as ``load_data``, but
+    errors are raised and warnings are logged instead of shown.
+
+    Args:
+        file_obj: Seekable binary file object
+
+    Returns:
+        pd.DataFrame: Processed DataFrame with the load report in ``attrs``
+    """
+    return _load_dataset(file_obj, logger.warning)
+
 @st.cache_data
 def load_data(uploaded_file):
     """Load and preprocess data from uploaded file.
@@ -23,71 +278,197 @@ def load_data(uploaded_file):
     Returns:
         pd.DataFrame or None: Processed DataFrame if successful, None if failed
     """
-    if uploaded_file is not None:
-        # Coba beberapa encoding yang umum digunakan
-        encodings = ['latin1', 'iso-8859-1', 'cp1252', 'utf-8']
+    if uploaded_file is None:
+        return None
+    
+    try:
+        return _load_dataset(uploaded_file, st.warning)
+    except ValueError as e:
+        st.error(str(e))
+        return None
+
+def _accumulate_chunks(file_obj, report, chunksize):
+    """Read, clean and aggregate the file chunk by chunk."""
+    accumulator = AggregateAccumulator()
+    raw_rows = 0
+    reader = _read_csv(file_obj, report['encoding'], report['delimiter'], chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            raw_rows += len(chunk)
+            accumulator.update(clean_transactions(chunk, report))
+    report['raw_rows'] = raw_rows
+    return accumulator.result()
+
+def _spool_utf8(file_obj, report, path):
+    """Copy the file to ``path`` as UTF-8, with the same encoding fallback as ``read_transactions``."""
+    try:
+        sql_backend.spool_csv(file_obj, report['encoding'], path)
+    except UnicodeDecodeError:
+        # Prefix valid UTF-8 tapi bagian file berikutnya tidak
+        report['fallback'] = True
+        report['encoding'] = FALLBACK_ENCODING
+        sql_backend.spool_csv(file_obj, report['encoding'], path)
+
+def _temp_csv_path():
+    """New empty file in ``settings.SQL_TEMP_DIR`` for a spooled UTF-8 copy."""
+    os.makedirs(settings.SQL_TEMP_DIR, exist_ok=True)
+    handle, path = tempfile.mkstemp(suffix='.csv', dir=settings.SQL_TEMP_DIR)
+    os.close(handle)
+    return path
+
+def _polars_aggregates(file_obj, report):
+    """Streaming aggregates from one fused Polars plan, or None to use the chunked pandas path.
+    
+    Polars scans the file from disk: UTF-8 files directly, other uploads
+    through a UTF-8 copy in ``settings.SQL_TEMP_DIR``, so memory stays
+    independent of the file size.
+    """
+    encoding = report['encoding']
+    path = polars_engine.local_utf8_path(file_obj, encoding)
+    spool_path = _temp_csv_path() if path is None else None
+    try:
+        with stage('polars: stream aggregates') as record:
+            if spool_path is not None:
+                _spool_utf8(file_obj, report, spool_path)
+            aggregates, report['raw_rows'], report['date_parse'] = polars_engine.aggregates(
+                path or spool_path, report['delimiter']
+            )
+            record['rows'] = report['raw_rows']
+    except polars_engine.ENGINE_ERRORS as e:
+        logger.warning("Polars engine cannot read the file, using pandas: %s", e)
+        # Jalur pandas mengulang deteksi encoding sendiri
+        report['fallback'] = False
+        report['encoding'] = encoding
+        return None
+    finally:
+        if spool_path is not None:
+            os.remove(spool_path)
+    report['engine'] = 'polars'
+    return aggregates
+
+def stream_aggregates(file_obj, chunksize: int = None):
+    """Build per-customer aggregates without materializing the whole file.
+    
+    Args:
+        file_obj: Seekable binary file object
+        chunksize: Rows per chunk, defaults to ``settings.STREAM_CHUNK_ROWS``
         
-        for encoding in encodings:
-            try:
-                # Baca CSV dengan encoding tertentu
-                df = pd.read_csv(
-                    uploaded_file,
-                    encoding=encoding,
-                    on_bad_lines='skip',
-                    low_memory=False,
-                    dtype={
-                        'InvoiceNo': str,
-                        'StockCode': str,
-                        'Description': str,
-                        'Quantity': float,
-                        'UnitPrice': float,
-                        'CustomerID': str,
-                        'Country': str
-                    }
-                )
-                
-                # Jika berhasil membaca file, lakukan preprocessing
-                try:
-                    # Bersihkan data
-                    df = df.dropna(subset=['InvoiceNo', 'Description', 'Quantity', 'UnitPrice'])
-                    
-                    # Convert InvoiceDate to datetime
-                    df['InvoiceDate'] = pd.to_datetime(df['InvoiceDate'], errors='coerce')
-                    df = df.dropna(subset=['InvoiceDate'])  # Hapus baris dengan tanggal invalid
-                    
-                    # Calculate TotalAmount
-                    df['TotalAmount'] = df['Quantity'] * df['UnitPrice']
-                    
-                    # Filter data yang valid
-                    df = df[
-                        (df['Quantity'] > 0) &  # Hanya quantity positif
-                        (df['UnitPrice'] > 0)   # Hanya harga positif
-                    ]
-                    
-                    # Jika preprocessing berhasil, return DataFrame
-                    return df
-                    
-                except Exception as e:
-                    st.error(f"Error preprocessing data: {str(e)}")
-                    continue
-                    
-            except UnicodeDecodeError:
-                # Jika encoding ini gagal, coba encoding berikutnya
-                st.warning(f"Failed to read with {encoding} encoding, trying next...")
-                continue
-                
-            except Exception as e:
-                # Jika ada error lain, tampilkan error dan coba encoding berikutnya
-                st.warning(f"Error with {encoding} encoding: {str(e)}")
-                continue
+    Returns:
+        TransactionAggregates: Aggregates with the load report in ``attrs``
+    """
+    chunksize = chunksize or settings.STREAM_CHUNK_ROWS
+    report = _sniff_file(file_obj)
+    
+    start = time.perf_counter()
+    aggregates = _polars_aggregates(file_obj, report) if polars_engine.enabled() else None
+    if aggregates is None:
+        try:
+            aggregates = _accumulate_chunks(file_obj, report, chunksize)
+        except UnicodeDecodeError:
+            # Mulai ulang dari awal dengan encoding cadangan
+            report['fallback'] = True
+            report['encoding'] = FALLBACK_ENCODING
+            report.pop('date_parse', None)
+            aggregates = _accumulate_chunks(file_obj, report, chunksize)
+        report['chunk_rows'] = chunksize
+    report['parse_seconds'] = time.perf_counter() - start
+    
+    aggregates.attrs['load_report'] = report
+    return aggregates
+
+@st.cache_data
+def load_data_streaming(uploaded_file):
+    """Load an uploaded file in streaming mode.
+    
+    Args:
+        uploaded_file: File object from st.file_uploader
         
-        # Jika semua encoding gagal
-        st.error("Failed to read the file with any supported encoding")
+    Returns:
+        TransactionAggregates or None: Aggregates if successful, None if failed
+    """
+    if uploaded_file is None:
+        return None
+    
+    start = time.perf_counter()
+    try:
+        aggregates = stream_aggregates(uploaded_file)
+    except Exception as e:
+        st.error(f"Failed to read the file: {str(e)}")
+        return None
+    
+    report = aggregates.attrs['load_report']
+    if report['fallback']:
+        st.warning(f"File is not valid UTF-8, read with {report['encoding']} encoding instead")
+    report['source'] = 'stream'
+    report['load_seconds'] = time.perf_counter() - start
+    return aggregates
+
+def sql_aggregates(file_obj):
+    """Build the aggregates with the SQL engine, out of core.
+
+    Queries the Parquet dataset cache entry of the file when there is one,
+    otherwise a UTF-8 copy of the CSV in ``settings.SQL_TEMP_DIR``.
+
+    Args:
+        file_obj: Seekable binary file object
+
+    Returns:
+        TransactionAggregates: Aggregates with the load report in ``attrs``
+    """
+    key = dataset_cache.cache_key(dataset_cache.content_hash(file_obj))
+    cached_path = dataset_cache.lookup(key)
+
+    start = time.perf_counter()
+    with sql_backend.connect() as con:
+        if cached_path is not None:
+            report = {'sql_input': 'cache'}
+            sql_backend.load_parquet(con, cached_path)
+        else:
+            report = _sniff_file(file_obj)
+            report['sql_input'] = 'csv'
+            path = _temp_csv_path()
+            try:
+                with stage('sql: spool upload'):
+                    _spool_utf8(file_obj, report, path)
+                report['raw_rows'], report['date_parse'] = sql_backend.load_csv(con, path, report['delimiter'])
+            finally:
+                os.remove(path)
+            report['parse_seconds'] = time.perf_counter() - start
+        aggregates = sql_backend.build_aggregates(con)
+
+    report['sql_threads'] = settings.SQL_THREADS
+    report['sql_memory_limit_mb'] = settings.SQL_MEMORY_LIMIT_MB
+    aggregates.attrs['load_report'] = report
+    return aggregates
+
+@st.cache_data
+def load_data_sql(uploaded_file):
+    """Load an uploaded file with the SQL engine.
+
+    Args:
+        uploaded_file: File object from st.file_uploader
+
+    Returns:
+        TransactionAggregates or None: Aggregates if successful, None if failed
+    """
+    if uploaded_file is None:
+        return None
+
+    start = time.perf_counter()
+    try:
+        aggregates = sql_aggregates(uploaded_file)
+    except Exception as e:
+        st.error(f"Failed to read the file: {str(e)}")
         return None
-            
-    return None
 
-def display_data_preview(df: pd.DataFrame):
+    report = aggregates.attrs['load_report']
+    if report.get('fallback'):
+        st.warning(f"File is not valid UTF-8, read with {report['encoding']} encoding instead")
+    report['source'] = 'sql'
+    report['load_seconds'] = time.perf_counter() - start
+    return aggregates
+
+def display_data_preview(df: Union[pd.DataFrame, TransactionAggregates]):
     """Display data preview section."""
     st.markdown("## 📊 Data Preview")
     
@@ -107,21 +488,122 @@ def display_data_preview(df: pd.DataFrame):
         """)
     
     if df is not None:
+        if isinstance(df, TransactionAggregates):
+            # Mode streaming: statistik diambil dari agregat
+            overview = df.overview
+            total_records = overview['records']
+            min_date, max_date = overview['min_date'], overview['max_date']
+            total_customers = overview['customers']
+            sample, summary = overview['head'], overview['describe']
+        else:
+            total_records = len(df)
+            min_date, max_date = df['InvoiceDate'].min(), df['InvoiceDate'].max()
+            total_customers = df['CustomerID'].nunique()
+            sample, summary = df.head(), df.describe()
+        
         # Display basic information
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Total Records", f"{len(df):,}")
+            st.metric("Total Records", f"{total_records:,}")
         with col2:
-            min_date = format_date_safely(df['InvoiceDate'].min())
-            max_date = format_date_safely(df['InvoiceDate'].max())
-            st.metric("Time Period", f"{min_date} to {max_date}")
+            st.metric("Time Period", f"{format_date_safely(min_date)} to {format_date_safely(max_date)}")
         with col3:
-            st.metric("Total Customers", f"{df['CustomerID'].nunique():,}")
+            st.metric("Total Customers", f"{total_customers:,}")
+        
+        display_load_report(df)
         
         # Show sample data
         st.markdown("### 📋 Sample Data")
-        st.dataframe(df.head(), width='stretch')
+        st.dataframe(sample, width='stretch')
         
         # Show summary statistics
         st.markdown("### 📈 Summary Statistics")
-        st.dataframe(df.describe(), width='stretch')
\ No newline at end of file
+        st.dataframe(summary, width='stretch')
+        if isinstance(df, TransactionAggregates) and 'sample_rows' in df.overview:
+            st.caption(f"Kuartil diestimasi dari sample acak {df.overview['sample_rows']:,} baris")
+
+def display_load_report(df: Union[pd.DataFrame, TransactionAggregates]):
+    """Display how the dataset was read: encoding, delimiter, bytes and timings."""
+    report = df.attrs.get('load_report')
+    if not report:
+        return
+    
+    with st.expander("⏱️ Load Details"):
+        source = {
+            'cache': "Dataset cache",
+            'stream': "Streaming CSV parse",
+            'sql': "SQL engine (DuckDB)"
+        }.get(report.get('source'), "CSV parse")
+        st.markdown(
+            f"**Source**: {source} · **Total load time**: {report.get('load_seconds', 0):.2f}s"
+            + (" · **Engine**: Polars" if report.get('engine') == 'polars' else "")
+        )
+        if 'sql_input' in report:
+            st.markdown(
+                f"**SQL input**: {'Parquet dataset cache' if report['sql_input'] == 'cache' else 'CSV'} · "
+                f"**Threads**: {report['sql_threads']} · "
+                f"**Memory limit**: {report['sql_memory_limit_mb']:,} MB (sisanya di-spill ke disk)"
+            )
+        if 'encoding' in report:
+            delimiter = {'\t': 'tab'}.get(report['delimiter'], report['delimiter'])
+            st.markdown(
+                f"**Encoding**: `{report['encoding']}`"
+                f"{' (fallback)' if report.get('fallback') else ''} · "
+                f"**Delimiter**: `{delimiter}` · "
+                f"**Sniffed**: {report['sniff_bytes']:,} bytes in {report['sniff_seconds'] * 1000:.1f} ms"
+            )
+            megabytes = report['file_bytes'] / (1024 * 1024)
+            throughput = megabytes / report['parse_seconds'] if report['parse_seconds'] else 0
+            st.markdown(
+                f"**File size**: {megabytes:,.1f} MB · "
+                f"**Parse time**: {report['parse_seconds']:.2f}s ({throughput:,.1f} MB/s) · "
+                f"**Rows read**: {report['raw_rows']:,}"
+                + (f" · **Chunk size**: {report['chunk_rows']:,} rows" if 'chunk_rows' in report else "")
+            )
+        if 'date_parse' in report:
+            dates = report['date_parse']
+            parts = [f"**Date format**: `{dates['format']}`" if dates['format'] else "**Date format**: not detected"]
+            if dates.get('seconds'):
+                parts.append(
+                    f"**Date parse**: {dates['seconds']:.2f}s ({dates['rows'] / dates['seconds']:,.0f} rows/s, "
+                    f"{dates['unique_values']:,} unique values)"
+                )
+            parts.append(f"**Fallback parse**: {dates['fallback_rows']:,} rows")
+            parts.append(f"**Invalid dates dropped**: {dates['coerced_rows']:,} rows")
+            st.markdown(" · ".join(parts))
+        if 'memory_before_bytes' in report:
+            before = report['memory_before_bytes'] / (1024 * 1024)
+            after = report['memory_after_bytes'] / (1024 * 1024)
+            st.markdown(
+                f"**Memory footprint**: {before:,.1f} MB → {after:,.1f} MB "
+                f"({before / after if after else 0:.1f}x smaller)"
+            )
+
+def display_cache_info():
+    """Display dataset cache statistics."""
+    info = dataset_cache.cache_info()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Cache Hits", f"{info['hits']:,}")
+    with col2:
+        st.metric("Cache Misses", f"{info['misses']:,}")
+    
+    st.caption(
+        f"{info['entries']} dataset(s), {info['size_mb']:,.1f} / {info['max_size_mb']:,} MB "
+        f"· hit rate {info['hit_rate'] * 100:.0f}% · {info['evictions']} eviction(s)"
+    )
+    
+    # Memo hasil analisis (RFM, Churn, CLV, Market Basket)
+    memo_stats = memo.memo_info()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Memo Hits", f"{memo_stats['hits']:,}")
+    with col2:
+        st.metric("Memo Misses", f"{memo_stats['misses']:,}")
+    
+    st.caption(
+        f"{memo_stats['entries']} / {memo_stats['max_entries']} hasil analisis, "
+        f"{memo_stats['size_mb']:,.1f} / {memo_stats['max_size_mb']:,} MB · "
+        f"hit rate {memo_stats['hit_rate'] * 100:.0f}% · {memo_stats['evictions']} eviction(s)"
+    )
\ No newline at end of file
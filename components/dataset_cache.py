@@ -0,0 +1,171 @@
+"""Content-addressed columnar cache for cleaned datasets.
+
+A cleaned transaction frame is written once as Parquet, keyed by a hash of
+the uploaded bytes. Later loads of the same file (after a restart, or by
+another user) become a memory-mapped read instead of a full CSV parse.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import settings
+from .profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+# Naikkan versi ini setiap kali logika cleaning di data_loader berubah,
+# supaya entry cache lama tidak dipakai lagi.
+CACHE_FORMAT_VERSION = 3
+
+_HASH_BLOCK_SIZE = 8 * 1024 * 1024
+_SUFFIX = '.parquet'
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+
+@profiled('hash file')
+def content_hash(file_obj) -> str:
+    """Hash the full content of a file-like object without moving its cursor."""
+    digest = hashlib.blake2b(digest_size=20)
+    position = file_obj.tell()
+    file_obj.seek(0)
+    try:
+        for block in iter(lambda: file_obj.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    finally:
+        file_obj.seek(position)
+    return digest.hexdigest()
+
+
+def cache_key(digest: str) -> str:
+    """Build the cache key for a content digest and the current format version."""
+    return f"{digest}-v{CACHE_FORMAT_VERSION}"
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(settings.CACHE_DIR, key + _SUFFIX)
+
+
+def _count(event: str, amount: int = 1):
+    with _lock:
+        _stats[event] += amount
+
+
+@profiled('dataset cache read')
+def get(key: str) -> Optional[pd.DataFrame]:
+    """Return the cached frame for ``key``, or None on a miss."""
+    path = _cache_path(key)
+    try:
+        table = pq.read_table(path, memory_map=True)
+    except (FileNotFoundError, OSError, pa.ArrowInvalid):
+        _count('misses')
+        logger.info("dataset cache miss: %s", key)
+        return None
+
+    # Perbarui waktu akses untuk kebijakan eviction LRU
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    _count('hits')
+    logger.info("dataset cache hit: %s", key)
+    return table.to_pandas()
+
+
+def lookup(key: str) -> Optional[str]:
+    """Return the Parquet file of ``key`` for direct queries, or None on a miss."""
+    path = _cache_path(key)
+    try:
+        os.utime(path)
+    except OSError:
+        _count('misses')
+        return None
+
+    _count('hits')
+    logger.info("dataset cache hit: %s", key)
+    return path
+
+
+@profiled('dataset cache write')
+def put(key: str, df: pd.DataFrame):
+    """Store a cleaned frame under ``key`` and enforce the size limit."""
+    os.makedirs(settings.CACHE_DIR, exist_ok=True)
+    path = _cache_path(key)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        pq.write_table(pa.Table.from_pandas(df), tmp_path)
+        # Tulis ke file sementara lalu rename supaya pembaca tidak melihat file setengah jadi
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    _count('writes')
+    evict()
+
+
+def _entries():
+    """List cache entries as (path, size, last_access) tuples, oldest first."""
+    if not os.path.isdir(settings.CACHE_DIR):
+        return []
+
+    entries = []
+    for name in os.listdir(settings.CACHE_DIR):
+        if not name.endswith(_SUFFIX):
+            continue
+        path = os.path.join(settings.CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((path, stat.st_size, stat.st_mtime))
+    return sorted(entries, key=lambda entry: entry[2])
+
+
+def evict(max_bytes: Optional[int] = None):
+    """Remove least recently used entries until the cache fits in ``max_bytes``."""
+    if max_bytes is None:
+        max_bytes = settings.CACHE_MAX_MB * 1024 * 1024
+
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    for path, size, _ in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        _count('evictions')
+        logger.info("dataset cache evicted: %s", os.path.basename(path))
+
+
+def clear():
+    """Remove every cache entry."""
+    evict(max_bytes=0)
+
+
+def cache_info() -> dict:
+    """Return hit/miss counters and the current on-disk footprint."""
+    entries = _entries()
+    with _lock:
+        info = dict(_stats)
+    lookups = info['hits'] + info['misses']
+    info['hit_rate'] = info['hits'] / lookups if lookups else 0.0
+    info['entries'] = len(entries)
+    info['size_mb'] = sum(size for _, size, _ in entries) / (1024 * 1024)
+    info['max_size_mb'] = settings.CACHE_MAX_MB
+    info['directory'] = settings.CACHE_DIR
+    return info
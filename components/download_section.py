@@ -1,64 +1,12 @@
 """Download section component for the dashboard."""
 import streamlit as st
-import pandas as pd
-import io
-from datetime import datetime, timedelta
-import numpy as np
+from datetime import datetime
+from .sample_data import SampleDataGenerator
 
-def generate_sample_data(num_records=1000):
+def generate_sample_data(num_records=1000, customers=200, products=10):
     """Generate sample e-commerce transaction data."""
-    # Set random seed for reproducibility
-    np.random.seed(42)
-    
-    # Generate dates
-    end_date = datetime(2023, 12, 31)
-    start_date = end_date - timedelta(days=365)
-    dates = [start_date + timedelta(
-        days=np.random.randint(0, 365),
-        hours=np.random.randint(0, 24),
-        minutes=np.random.randint(0, 60)
-    ) for _ in range(num_records)]
-    
-    # Sample products
-    products = [
-        ("PRD001", "Coffee Mug", 15.99),
-        ("PRD002", "Laptop Sleeve", 25.99),
-        ("PRD003", "Water Bottle", 12.99),
-        ("PRD004", "Notebook Set", 9.99),
-        ("PRD005", "Phone Charger", 19.99),
-        ("PRD006", "Desk Lamp", 29.99),
-        ("PRD007", "Mouse Pad", 7.99),
-        ("PRD008", "Backpack", 45.99),
-        ("PRD009", "Wireless Mouse", 34.99),
-        ("PRD010", "Keyboard", 59.99)
-    ]
-    
-    # Generate customer IDs
-    customer_ids = [f"CUST{str(i).zfill(4)}" for i in range(1, 201)]
-    
-    # Generate countries
-    countries = ["USA", "UK", "Canada", "Australia", "Germany", "France", "Spain", "Italy"]
-    
-    # Create the data
-    data = []
-    for _ in range(num_records):
-        product = products[np.random.randint(0, len(products))]
-        quantity = np.random.randint(1, 6)
-        
-        data.append({
-            'InvoiceNo': f"INV{str(np.random.randint(10000, 99999))}",
-            'StockCode': product[0],
-            'Description': product[1],
-            'Quantity': quantity,
-            'InvoiceDate': dates[_],
-            'UnitPrice': product[2],
-            'CustomerID': np.random.choice(customer_ids),
-            'Country': np.random.choice(countries)
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    return df
+    # Generator vektor; dataset besar ditulis langsung ke file dengan `python -m components.sample_data`
+    return SampleDataGenerator(customers=customers, products=products, seed=42).generate(num_records)
 
 def display_download_section():
     """Display the download section with sample data option."""
@@ -68,12 +16,16 @@ def display_download_section():
         st.markdown("""
         If you don't have your own dataset, you can download our sample e-commerce transaction data.
         
-        The sample data includes:
+        The sample data includes (records, products and customers are configurable):
         - 1,000 transaction records
         - 10 different products
         - 200 unique customers
         - 8 countries
-        - 1 year of transaction history
+        - 1 year of transaction history with a year-end peak
+        - Products that are often bought together, and ~2% cancelled invoices
+        
+        For load testing with millions of rows, write the file directly:
+        `python -m components.sample_data sample.csv --rows 10000000`
         
         The data format matches what's required for the analysis:
         - InvoiceNo: Unique transaction ID
@@ -103,9 +55,12 @@ def display_download_section():
         """, unsafe_allow_html=True)
     
     with col2:
+        num_records = st.number_input("Records", min_value=100, max_value=1000000, value=1000, step=1000)
+        customers = st.number_input("Customers", min_value=1, max_value=100000, value=200)
+        products = st.number_input("Products", min_value=1, max_value=10000, value=10)
         if st.button("🔄 Generate & Download Sample", type="primary"):
             # Generate sample data
-            df = generate_sample_data()
+            df = generate_sample_data(int(num_records), int(customers), int(products))
             
             # Convert to CSV
             csv = df.to_csv(index=False)
@@ -0,0 +1,270 @@
+"""In-process memoization of analysis results.
+
+Results are keyed by the function, a content fingerprint of the dataset
+arguments and the remaining parameters. Unlike ``st.cache_data`` results
+are not copied on every hit: cached results are shared and must be treated
+as read-only.
+
+Frames with a ``source_digest`` attribute are fingerprinted cheaply:
+``load_data`` sets it to the file hash and memoized functions set it to
+their key on the frames they return, so the digest already identifies the
+content. pandas carries attrs over to filtered and derived frames, so the
+full index hash (subsets), the shape and dtypes and an evenly spaced row
+sample are added to it. Other frames hash every column. Fingerprints are
+remembered per frame object, and the shallow copies handed to memoized
+functions reuse the fingerprint of their parent; a frame passed to a
+memoized function must not be changed in place afterwards.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from . import profiling, settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# key -> (hasil, ukuran dalam byte)
+_entries = OrderedDict()
+_total_bytes = 0
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'oversized': 0}
+_function_stats = {}
+
+# Jumlah baris (tersebar merata) yang ikut di-hash untuk frame dengan source_digest
+FINGERPRINT_SAMPLE_ROWS = 1000
+
+# Fingerprint per objek DataFrame: id -> (weakref, layout, fingerprint). Entri dihapus
+# saat frame-nya di-garbage-collect, jadi id yang dipakai ulang tidak tertukar
+_fingerprints = {}
+
+
+def _buffer(values: pd.Series):
+    """Identity of the data behind a column; changes when the column is replaced."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.cat.codes
+    if isinstance(values.dtype, np.dtype):
+        # View tanpa copy, alamat datanya tetap selama kolom tidak diganti
+        return values.to_numpy().__array_interface__['data'][0]
+    return id(values.array)
+
+
+def _layout(df: pd.DataFrame) -> tuple:
+    """Shape, columns, dtypes and column buffers; cheap to compute on every call."""
+    return (
+        df.shape,
+        tuple(df.columns),
+        tuple(str(dtype) for dtype in df.dtypes),
+        tuple(_buffer(values) for _, values in df.items())
+    )
+
+
+def _remember(df: pd.DataFrame, fingerprint: str, layout: tuple = None):
+    key = id(df)
+    _fingerprints[key] = (
+        weakref.ref(df, lambda _, key=key: _fingerprints.pop(key, None)),
+        _layout(df) if layout is None else layout,
+        fingerprint
+    )
+
+
+def _hash_sample(values: pd.Series) -> bytes:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Hash nilai sample saja; hash kolom kategori akan ikut meng-hash semua kategorinya
+        codes = values.cat.codes.to_numpy()
+        values = pd.Series(np.where(codes >= 0, np.asarray(values.cat.categories, dtype=object)[codes], None))
+    return pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes()
+
+
+def _hash_index(index: pd.Index) -> bytes:
+    if isinstance(index, pd.RangeIndex):
+        return repr((index.start, index.stop, index.step)).encode()
+    return pd.util.hash_pandas_object(index, index=False).to_numpy().tobytes()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content fingerprint of a DataFrame, see the module docstring.
+
+    Remembered per frame object while its columns are not replaced.
+    """
+    layout = _layout(df)
+    cached = _fingerprints.get(id(df))
+    if cached is not None and cached[0]() is df and cached[1] == layout:
+        return cached[2]
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr(layout[:3]).encode())
+    digest.update(_hash_index(df.index))
+    source_digest = df.attrs.get('source_digest')
+    if source_digest is not None:
+        digest.update(str(source_digest).encode())
+        if len(df):
+            positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), FINGERPRINT_SAMPLE_ROWS)).astype('int64'))
+            for _, values in df.iloc[positions].items():
+                digest.update(_hash_sample(values))
+    else:
+        for _, values in df.items():
+            digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().tobytes())
+    fingerprint = digest.hexdigest()
+
+    _remember(df, fingerprint, layout)
+    return fingerprint
+
+
+def result_bytes(value, _seen: set = None) -> int:
+    """Approximate memory footprint of a memoized result in bytes.
+
+    Frames, series and indexes count ``memory_usage(deep=True)``, arrays
+    ``nbytes``; tuples, lists, dicts and plain objects (aggregates, sparse
+    baskets) the sum of their items and attributes.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(result_bytes(item, seen) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(result_bytes(item, seen) for item in value.values())
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + result_bytes(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+def _key_part(value):
+    """Hashable cache key part for one argument."""
+    if isinstance(value, pd.DataFrame):
+        return ('frame', frame_fingerprint(value))
+    if hasattr(value, 'fingerprint'):
+        # TransactionAggregates, SparseBasket, ItemsetState
+        return (type(value).__name__, value.fingerprint)
+    if isinstance(value, (tuple, list)):
+        return tuple(_key_part(item) for item in value)
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot memoize argument of type {type(value).__name__}")
+
+
+def _read_only(value):
+    """Shallow view of a DataFrame argument, so column assignments do not reach the caller's frame.
+
+    The view shares the fingerprint of the argument, so nested memoized
+    calls do not fingerprint the same data again.
+    """
+    if isinstance(value, pd.DataFrame):
+        view = value.copy(deep=False)
+        _remember(view, frame_fingerprint(value))
+        return view
+    return value
+
+
+def _tag(result, digest: str):
+    """Store the memo key digest on returned frames, see the module docstring."""
+    for value in result if isinstance(result, tuple) else (result,):
+        if isinstance(value, pd.DataFrame):
+            value.attrs['source_digest'] = digest
+
+
+def memoize(func):
+    """Memoize an analysis function.
+
+    Parameters whose name starts with an underscore are not part of the key
+    (same convention as ``st.cache_data``).
+    """
+    signature = inspect.signature(func)
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Setiap panggilan (hit atau miss) tercatat sebagai stage di panel profiling
+        with profiling.stage(func.__name__) as record:
+            return profiling.record_rows(record, _call(record, *args, **kwargs))
+
+    def _call(record, *args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name,) + tuple(
+            (parameter, _key_part(value))
+            for parameter, value in bound.arguments.items()
+            if not parameter.startswith('_')
+        )
+
+        with _lock:
+            counters = _function_stats.setdefault(name, {'hits': 0, 'misses': 0})
+            record['cached'] = key in _entries
+            if key in _entries:
+                _entries.move_to_end(key)
+                _stats['hits'] += 1
+                counters['hits'] += 1
+                return _entries[key][0]
+            _stats['misses'] += 1
+            counters['misses'] += 1
+
+        logger.info("memo miss: %s", name)
+        result = func(*(_read_only(value) for value in bound.args), **{
+            parameter: _read_only(value) for parameter, value in bound.kwargs.items()
+        })
+
+        _tag(result, hashlib.blake2b(repr(key).encode(), digest_size=20).hexdigest())
+        size = result_bytes(result)
+        _store(key, result, size)
+        return result
+
+    return wrapper
+
+
+def _store(key, result, size: int):
+    """Add a result and evict the least recently used ones beyond the entry and byte limits."""
+    global _total_bytes
+    max_bytes = settings.MEMO_MAX_MB * 1024 * 1024
+    with _lock:
+        if size > max_bytes:
+            # Satu hasil melebihi seluruh budget: tidak disimpan, daripada mengosongkan memo
+            logger.info("memo: result of %.1f MB exceeds the memo budget, not cached", size / 1024 / 1024)
+            _stats['oversized'] += 1
+            return
+        if key in _entries:
+            # Thread lain sudah menyimpan hasil yang sama
+            _total_bytes -= _entries.pop(key)[1]
+        _entries[key] = (result, size)
+        _total_bytes += size
+        while len(_entries) > settings.MEMO_MAX_ENTRIES or _total_bytes > max_bytes:
+            _, (_, evicted_size) = _entries.popitem(last=False)
+            _total_bytes -= evicted_size
+            _stats['evictions'] += 1
+
+
+def clear():
+    """Drop every memoized result."""
+    global _total_bytes
+    with _lock:
+        _entries.clear()
+        _total_bytes = 0
+
+
+def memo_info() -> dict:
+    """Return hit/miss counters, overall and per function."""
+    with _lock:
+        info = dict(_stats)
+        info['functions'] = {name: dict(counters) for name, counters in _function_stats.items()}
+        info['entries'] = len(_entries)
+        info['size_mb'] = _total_bytes / 1024 / 1024
+    lookups = info['hits'] + info['misses']
+    info['hit_rate'] = info['hits'] / lookups if lookups else 0.0
+    info['max_entries'] = settings.MEMO_MAX_ENTRIES
+    info['max_size_mb'] = settings.MEMO_MAX_MB
+    return info
@@ -0,0 +1,121 @@
+"""Paginated table component for large per-customer frames.
+
+Sorting and search run on the server over memoized indexes, and only the
+visible page is styled and sent to the browser, so the cost of a rerun
+depends on the page size instead of the number of customers.
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from .memo import memoize
+from .profiling import stage
+
+# Pilihan jumlah baris per halaman
+PAGE_SIZES = [25, 50, 100, 500]
+
+
+@memoize
+def sort_order(df: pd.DataFrame, column: str, ascending: bool = True) -> np.ndarray:
+    """Row positions of ``df`` sorted by ``column`` (stable, missing values last in both directions)."""
+    values = df[column].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+
+
+@memoize
+def search_index(df: pd.DataFrame, column: str):
+    """Sorted text keys of ``column`` with their row positions, for prefix search.
+
+    Returns:
+        tuple: (sorted keys, row positions in key order)
+    """
+    keys = df[column].astype(str).to_numpy()
+    order = np.argsort(keys, kind='stable')
+    return keys[order], order
+
+
+def search_rows(df: pd.DataFrame, column: str, prefix: str) -> np.ndarray:
+    """Row positions whose ``column`` starts with ``prefix`` (binary search on the index)."""
+    keys, order = search_index(df[[column]], column)
+    start = np.searchsorted(keys, prefix, side='left')
+    end = np.searchsorted(keys, prefix + '\U0010ffff', side='left')
+    return np.sort(order[start:end])
+
+
+def page_rows(df: pd.DataFrame, sort_column: Optional[str] = None, ascending: bool = True,
+              search_column: Optional[str] = None, search: str = '') -> np.ndarray:
+    """Row positions of the filtered and sorted view, in display order."""
+    if sort_column is None:
+        order = np.arange(len(df))
+    else:
+        # Key memo hanya kolom yang di-sort, jadi index tetap dipakai ulang saat kolom lain
+        # berubah (misalnya label churn per window)
+        order = sort_order(df[[sort_column]], sort_column, ascending)
+
+    if search_column is not None and search:
+        matches = search_rows(df, search_column, search)
+        # Pertahankan urutan sort: ambil posisi yang cocok sesuai ranking-nya
+        rank = np.empty(len(df), dtype=np.int64)
+        rank[order] = np.arange(len(df))
+        order = matches[np.argsort(rank[matches], kind='stable')]
+    return order
+
+
+def display_paged_table(df: pd.DataFrame, key: str, formats: Optional[dict] = None,
+                        styles: Optional[Dict[str, Callable[[pd.Series], np.ndarray]]] = None,
+                        search_column: Optional[str] = None, default_sort: Optional[str] = None):
+    """Display a large frame one sorted, searchable page at a time.
+
+    Args:
+        df: Frame to display (not modified)
+        key: Unique widget key prefix
+        formats: ``Styler.format`` formatters, applied to the visible page only
+        styles: Column -> vectorized function returning one CSS string per value
+        search_column: Column for the prefix search box, None to disable search
+        default_sort: Column sorted on by default, None for the frame order
+    """
+    columns = list(df.columns)
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        search = ''
+        if search_column is not None:
+            search = st.text_input(f"Cari {search_column}", key=f"{key}_search").strip()
+    with col2:
+        sort_options = [None] + columns
+        sort_column = st.selectbox(
+            "Urutkan berdasarkan",
+            sort_options,
+            index=sort_options.index(default_sort) if default_sort in columns else 0,
+            format_func=lambda column: "(urutan asli)" if column is None else column,
+            key=f"{key}_sort"
+        )
+    with col3:
+        descending = st.toggle("Descending", key=f"{key}_descending")
+
+    rows = page_rows(df, sort_column, not descending, search_column, search)
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        page_size = st.selectbox("Baris per halaman", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    n_pages = max(1, -(-len(rows) // page_size))
+    with col2:
+        page = st.number_input("Halaman", min_value=1, max_value=n_pages, value=1, key=f"{key}_page")
+
+    start = (min(page, n_pages) - 1) * page_size
+    visible = df.iloc[rows[start:start + page_size]]
+
+    with stage('render table', rows=len(visible)):
+        styler = visible.style
+        if formats:
+            styler = styler.format({column: fmt for column, fmt in formats.items() if column in columns})
+        for column, style in (styles or {}).items():
+            styler = styler.apply(lambda values, style=style: np.asarray(style(values)), subset=[column])
+
+        st.dataframe(styler, width='stretch')
+    st.caption(
+        f"Menampilkan {start + 1 if len(visible) else 0:,}–{start + len(visible):,} "
+        f"dari {len(rows):,} baris · halaman {min(page, n_pages):,} / {n_pages:,}"
+    )
@@ -0,0 +1,368 @@
+"""Optional Polars engine for the transaction pipeline.
+
+With ``settings.ENGINE = 'polars'`` the CSV is read and cleaned by one lazy
+Polars query: the cleaning filters and the ``TotalAmount`` derivation are
+fused into the scan, so no intermediate frame is materialized. The
+per-customer aggregation runs on Polars' multi-threaded group-by, and in
+streaming mode a single plan goes from the scan to the customer table on
+the streaming engine. Results are identical to the pandas engine (streamed
+sums up to floating point rounding, as with chunked pandas streaming).
+
+Files Polars cannot read the way ``pd.read_csv`` does (lines with extra
+fields) raise one of ``ENGINE_ERRORS``; the caller then falls back to
+pandas. Polars is not a required dependency.
+"""
+
+import codecs
+import io
+import logging
+import os
+from typing import Optional, Union
+
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+from . import settings
+from .aggregates import CUSTOMER_AGGREGATIONS, NUMERIC_COLUMNS, TransactionAggregates
+from .date_formats import SAMPLE_ROWS, detect_format, parse_fallback
+
+logger = logging.getLogger(__name__)
+
+try:
+    import polars as pl
+except ImportError:  # Dependensi opsional
+    pl = None
+
+AVAILABLE = pl is not None
+
+# Nilai settings.ENGINE yang dikenal
+ENGINES = ['pandas', 'polars']
+
+# Error yang berarti file harus dibaca ulang dengan engine pandas
+ENGINE_ERRORS = (pl.exceptions.PolarsError,) if pl is not None else ()
+
+if settings.ENGINE == 'polars' and not AVAILABLE:
+    logger.warning("DASHBOARD_ENGINE=polars but polars is not installed, using pandas")
+
+# Kolom yang wajib terisi, sama dengan dropna di clean_transactions
+_REQUIRED_COLUMNS = ['InvoiceNo', 'Description', 'Quantity', 'UnitPrice']
+
+_ROW_INDEX = '__row'
+
+_PARSED_DATE = '__parsed_date'
+
+_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Baris tabel describe(), urutan sama dengan pandas
+_STATISTICS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def enabled() -> bool:
+    """True when the Polars engine is configured and installed."""
+    return settings.ENGINE == 'polars' and AVAILABLE
+
+
+def utf8_source(file_obj, encoding: str) -> bytes:
+    """Return the file content as UTF-8, the only encoding the Polars CSV reader supports.
+
+    Raises:
+        UnicodeDecodeError: If a byte is not valid in ``encoding``
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    file_obj.seek(0)
+    if encoding == 'utf-8':
+        # Hanya validasi; byte asli sudah UTF-8
+        data = file_obj.read()
+        decoder.decode(data, final=True)
+        return data
+
+    out = io.BytesIO()
+    for block in iter(lambda: file_obj.read(_BLOCK_SIZE), b''):
+        out.write(decoder.decode(block).encode('utf-8'))
+    out.write(decoder.decode(b'', final=True).encode('utf-8'))
+    return out.getvalue()
+
+
+def local_utf8_path(file_obj, encoding: str) -> Optional[str]:
+    """Path of ``file_obj`` when it is a UTF-8 file on disk that Polars can scan directly.
+
+    The content is validated block by block, so memory does not grow with
+    the file size. Returns None for in-memory uploads and other encodings
+    (those are spooled to a UTF-8 copy first).
+    """
+    if encoding != 'utf-8' or not isinstance(file_obj, (io.BufferedReader, io.FileIO)):
+        return None
+    path = getattr(file_obj, 'name', None)
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return None
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    file_obj.seek(0)
+    try:
+        for block in iter(lambda: file_obj.read(_BLOCK_SIZE), b''):
+            decoder.decode(block)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return None
+    return path
+
+
+def scan_transactions(source: Union[str, bytes], delimiter: str):
+    """Lazy scan of a UTF-8 transaction CSV with the dtypes and NA values of ``pd.read_csv``."""
+    return pl.scan_csv(
+        source,
+        separator=delimiter,
+        infer_schema=False,
+        schema_overrides={'Quantity': pl.Float64, 'UnitPrice': pl.Float64},
+        null_values=sorted(STR_NA_VALUES),
+        row_index_name=_ROW_INDEX
+    )
+
+
+def _required():
+    """Rows kept by the dropna of ``clean_transactions``."""
+    return pl.all_horizontal([pl.col(column).is_not_null() for column in _REQUIRED_COLUMNS])
+
+
+def _dated():
+    return _required() & pl.col('InvoiceDate').is_not_null()
+
+
+def detect_date_format(transactions):
+    """Date format of the sample ``parse_dates`` uses: the first dates after the dropna."""
+    sample = transactions.filter(_dated()).select('InvoiceDate').head(SAMPLE_ROWS).collect()
+    return detect_format(sample['InvoiceDate'].to_list())
+
+
+def parse_plan(transactions, date_format):
+    """Rows kept by the dropna, with the dates that match ``date_format`` parsed.
+
+    The parsed dates go to a separate column, the original strings stay in
+    InvoiceDate for the fallback. The plan is cached, so the plans built
+    on it share one scan of the file.
+    """
+    if date_format is None:
+        dates = pl.lit(None, dtype=pl.Datetime('ns'))
+    else:
+        dates = pl.col('InvoiceDate').str.strptime(pl.Datetime('ns'), date_format, strict=False)
+    return transactions.filter(_required()).with_columns(dates.alias(_PARSED_DATE)).cache()
+
+
+def failed_dates(parsed):
+    """Date strings that do not match the format, with their row counts."""
+    return (
+        parsed.filter(pl.col('InvoiceDate').is_not_null() & pl.col(_PARSED_DATE).is_null())
+        .group_by('InvoiceDate')
+        .agg(pl.len().alias('rows'))
+    )
+
+
+def date_fallback(failed, date_format, rows: int):
+    """Parse the failed strings with ``parse_fallback``.
+
+    Returns:
+        tuple: (dict string -> timestamp of the strings the fallback could
+        parse, parse statistics like ``parse_dates`` without timings)
+    """
+    parsed = parse_fallback(failed['InvoiceDate'].to_list())
+    counts = failed['rows'].to_numpy()
+    valid = ~parsed.isna()
+    stats = {
+        'format': date_format,
+        'rows': rows,
+        'fallback_rows': int(counts.sum()),
+        'coerced_rows': int(counts[~valid].sum())
+    }
+    strings = failed['InvoiceDate'].to_numpy()[valid]
+    return dict(zip(strings, parsed[valid])), stats
+
+
+def clean_plan(parsed, fallback: dict = None):
+    """Apply the remaining rules of ``clean_transactions`` to ``parse_plan``.
+
+    Strings that did not match the format take their timestamp from
+    ``fallback`` (see ``date_fallback``); the others become null and are
+    dropped.
+    """
+    dates = pl.col(_PARSED_DATE)
+    if fallback:
+        dates = pl.coalesce(dates, pl.col('InvoiceDate').replace_strict(
+            list(fallback), list(fallback.values()), default=None, return_dtype=pl.Datetime('ns')
+        ))
+    return (
+        parsed
+        .with_columns(dates.alias('InvoiceDate'))
+        .drop(_PARSED_DATE)
+        .filter(pl.col('InvoiceDate').is_not_null())
+        .with_columns(TotalAmount=pl.col('Quantity') * pl.col('UnitPrice'))
+        .filter((pl.col('Quantity') > 0) & (pl.col('UnitPrice') > 0))
+    )
+
+
+def _collect_clean(transactions, plans, **options):
+    """Collect the plans built by ``plans(cleaned)`` together with the date checks.
+
+    The plans run once with the format alone; only when the fallback
+    parser recovers some dates they run a second time with them.
+
+    Returns:
+        tuple: (collected plans, raw row count, date parse statistics)
+    """
+    date_format = detect_date_format(transactions)
+    parsed = parse_plan(transactions, date_format)
+    *results, failed, raw_rows, rows = pl.collect_all([
+        *plans(clean_plan(parsed)),
+        failed_dates(parsed),
+        transactions.select(pl.len()),
+        parsed.select(pl.col('InvoiceDate').is_not_null().sum())
+    ], **options)
+    fallback, stats = date_fallback(failed, date_format, rows.item())
+    if fallback:
+        results = pl.collect_all(plans(clean_plan(parsed, fallback)), **options)
+    return results, raw_rows.item(), stats
+
+
+def _to_pandas(frame) -> pd.DataFrame:
+    """Convert a collected frame, restoring the original row numbers as index like pandas."""
+    df = frame.to_pandas()
+    index = df.pop(_ROW_INDEX).astype('int64') if _ROW_INDEX in df.columns else None
+    if index is not None:
+        df.index = pd.Index(index.to_numpy())
+    return df
+
+
+def read_clean(source: bytes, delimiter: str):
+    """Read and clean a transaction CSV in one query.
+
+    Returns:
+        tuple: (cleaned DataFrame, same as ``clean_transactions``; raw row
+        count; date parse statistics)
+    """
+    transactions = scan_transactions(source, delimiter)
+    (cleaned,), raw_rows, date_stats = _collect_clean(transactions, lambda cleaned: [cleaned])
+    return _to_pandas(cleaned), raw_rows, date_stats
+
+
+def _aggregations():
+    """Polars expressions of ``CUSTOMER_AGGREGATIONS``."""
+    functions = {
+        'min': lambda column: pl.col(column).min(),
+        'max': lambda column: pl.col(column).max(),
+        'count': lambda column: pl.col(column).count().cast(pl.Int64),
+        'sum': lambda column: pl.col(column).sum()
+    }
+    return [
+        functions[function](source).alias(column)
+        for column, (source, function) in CUSTOMER_AGGREGATIONS.items()
+    ]
+
+
+def _column(series: pd.Series):
+    """Polars column of a pandas column; categoricals become their integer codes (null if missing)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = pl.Series(series.name, series.cat.codes.to_numpy())
+        return pl.select(pl.when(codes >= 0).then(codes).alias(series.name)).to_series()
+    return pl.from_pandas(series)
+
+
+def customer_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Polars version of ``aggregates.customer_table``, same index, columns and order."""
+    if 'TotalAmount' not in df.columns:
+        df = df.assign(TotalAmount=df['Quantity'] * df['UnitPrice'])
+    sources = {'CustomerID'} | {source for source, _ in CUSTOMER_AGGREGATIONS.values()}
+    frame = pl.DataFrame([_column(df[column]) for column in sorted(sources)])
+
+    # Kode categorical urut sama dengan kategori, jadi sort kode = sort groupby pandas.
+    # Engine in-memory menjumlah per grup sesuai urutan baris, hasilnya sama persis dengan pandas.
+    customers = (
+        frame.lazy()
+        .filter(pl.col('CustomerID').is_not_null())
+        .group_by('CustomerID')
+        .agg(_aggregations())
+        .sort('CustomerID')
+        .collect(engine='in-memory')
+        .to_pandas()
+    )
+    key = customers.pop('CustomerID')
+    if isinstance(df['CustomerID'].dtype, pd.CategoricalDtype):
+        index = pd.CategoricalIndex(
+            pd.Categorical.from_codes(key.to_numpy(), dtype=df['CustomerID'].dtype), name='CustomerID'
+        )
+    else:
+        index = pd.Index(key.to_numpy(dtype=object), name='CustomerID')
+    customers.index = index
+    return customers
+
+
+def _describe_expressions():
+    """One expression per (numeric column, statistic) of ``DataFrame.describe``."""
+    expressions = []
+    for column in NUMERIC_COLUMNS:
+        values = pl.col(column).cast(pl.Float64)
+        statistics = [
+            values.count().cast(pl.Float64),
+            values.mean(),
+            values.std(),
+            values.min(),
+            values.quantile(0.25, 'linear'),
+            values.quantile(0.5, 'linear'),
+            values.quantile(0.75, 'linear'),
+            values.max()
+        ]
+        expressions += [
+            expression.alias(f'{column}|{statistic}') for expression, statistic in zip(statistics, _STATISTICS)
+        ]
+    return expressions
+
+
+def aggregates(source: Union[str, bytes], delimiter: str):
+    """Build the streaming-mode aggregates with one fused plan on the streaming engine.
+
+    ``source`` should be the path of a UTF-8 CSV, so the streaming engine
+    reads the file in batches instead of holding it in memory.
+
+    Scan, cleaning, customer group-by and overview statistics share the
+    same scan; only the customer table and the summary rows are kept.
+    Like the chunked pandas path, Monetary sums are merged from partial
+    sums and may differ from the in-memory result in the last digit.
+
+    Returns:
+        tuple: (TransactionAggregates with exact summary statistics, raw row
+        count, date parse statistics)
+    """
+    def plans(cleaned):
+        customers = (
+            cleaned.filter(pl.col('CustomerID').is_not_null())
+            .group_by('CustomerID')
+            .agg(_aggregations())
+            .sort('CustomerID')
+        )
+        overview = cleaned.select(
+            pl.len().alias('records'),
+            pl.col('InvoiceDate').min().alias('min_date'),
+            pl.col('InvoiceDate').max().alias('max_date'),
+            *_describe_expressions()
+        )
+        return [customers, overview, cleaned.head(5)]
+
+    transactions = scan_transactions(source, delimiter)
+    (customers, overview, head), raw_rows, date_stats = _collect_clean(transactions, plans, engine='streaming')
+    overview = overview.row(0, named=True)
+    if not overview['records']:
+        raise ValueError("No valid transactions found")
+
+    summary = pd.DataFrame({
+        column: [overview[f'{column}|{statistic}'] for statistic in _STATISTICS]
+        for column in NUMERIC_COLUMNS
+    }, index=_STATISTICS)
+    customers = customers.to_pandas()
+    customers['CustomerID'] = customers['CustomerID'].astype(object)
+    result = TransactionAggregates(customers, {
+        'records': overview['records'],
+        'min_date': pd.Timestamp(overview['min_date']),
+        'max_date': pd.Timestamp(overview['max_date']),
+        'customers': len(customers),
+        'describe': summary,
+        'head': _to_pandas(head)
+    })
+    return result, raw_rows, date_stats
@@ -0,0 +1,220 @@
+"""Per-stage timing and memory instrumentation.
+
+Hot paths wrap their stages in ``stage``; every stage records its wall
+time, the rows it processed and the change in resident memory. Stages are
+collected in the current ``ProfileRun`` (one per Streamlit rerun or
+fragment rerun), shown in the sidebar profiling panel and, when
+``settings.PROFILE_LOG`` is on, logged as one JSON line per stage.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+import streamlit as st
+
+from . import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+_current_run = contextvars.ContextVar('profile_run', default=None)
+_depth = contextvars.ContextVar('profile_depth', default=0)
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident memory of the process (peak RSS where /proc is not available)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        pass
+    if resource is not None:
+        # ru_maxrss: KB di Linux, byte di macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+    return None
+
+
+def _row_count(value) -> Optional[int]:
+    """Rows of a DataFrame result (or of the first element of a tuple)."""
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    return None
+
+
+class ProfileRun:
+    """Stages recorded during one rerun.
+
+    Attributes:
+        run_id: Unique id, shared by the log lines of this run
+        label: What triggered the run ('rerun' or 'fragment')
+        stages: One dict per finished stage, in completion order
+    """
+
+    def __init__(self, label: str):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.started = datetime.now()
+        self.stages = []
+        self.seconds = None
+        self._start = time.perf_counter()
+
+    @property
+    def finished(self) -> bool:
+        return self.seconds is not None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Stages as a table, in the order they started."""
+        columns = ['stage', 'depth', 'seconds', 'rows', 'memory_delta_mb', 'cached']
+        if not self.stages:
+            return pd.DataFrame(columns=columns)
+        frame = pd.DataFrame(self.stages).sort_values('offset', kind='stable')
+        return frame[columns].reset_index(drop=True)
+
+    def log_records(self) -> list:
+        """One JSON-serializable dict per stage, for monitoring."""
+        return [
+            {'run_id': self.run_id, 'run': self.label, 'started': self.started.isoformat(timespec='seconds'), **stage}
+            for stage in self.stages
+        ]
+
+
+def start_run(label: str = 'rerun') -> ProfileRun:
+    """Start collecting stages for a new run."""
+    run = ProfileRun(label)
+    _current_run.set(run)
+    return run
+
+
+def finish_run(run: ProfileRun) -> ProfileRun:
+    """Close a run and emit its structured log lines."""
+    run.seconds = time.perf_counter() - run._start
+    if settings.PROFILE_LOG:
+        for record in run.log_records():
+            logger.info(json.dumps(record, default=str))
+    return run
+
+
+@contextlib.contextmanager
+def run_scope(label: str):
+    """Join the active run, or start and finish a new one (fragment reruns).
+
+    Yields:
+        tuple: (ProfileRun, True if the run was started here)
+    """
+    run = _current_run.get()
+    if run is not None and not run.finished:
+        yield run, False
+        return
+    run = start_run(label)
+    try:
+        yield run, True
+    finally:
+        finish_run(run)
+
+
+@contextlib.contextmanager
+def stage(name: str, rows: Optional[int] = None, cached: Optional[bool] = None):
+    """Record wall time, rows and memory delta of a block.
+
+    The yielded dict can be updated inside the block, e.g. to set
+    ``rows`` once the result is known.
+    """
+    record = {'stage': name, 'rows': rows, 'cached': cached}
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    memory_before = rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - start
+        memory_after = rss_bytes()
+        _depth.reset(token)
+        run = _current_run.get()
+        if run is not None and not run.finished:
+            record.update(
+                depth=depth,
+                offset=start - run._start,
+                seconds=seconds,
+                memory_delta_mb=(memory_after - memory_before) / (1024 * 1024)
+                if memory_before is not None and memory_after is not None else None
+            )
+            run.stages.append(record)
+
+
+def record_rows(record: dict, result):
+    """Set ``rows`` of a stage record from a DataFrame result (if not set yet)."""
+    if record.get('rows') is None:
+        record['rows'] = _row_count(result)
+    return result
+
+
+def profiled(name: Optional[str] = None):
+    """Decorator: record every call of a function as a stage, rows taken from its result."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__) as record:
+                return record_rows(record, func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def remember_run(run: ProfileRun):
+    """Keep a finished run in the session for the profiling panel."""
+    runs = st.session_state.setdefault('profile_runs', [])
+    runs.append(run)
+    del runs[:-settings.PROFILE_HISTORY]
+
+
+def display_profile_panel(runs):
+    """Sidebar panel with the stages of the recent runs (newest first)."""
+    runs = [run for run in reversed(runs) if run.finished]
+    if not runs:
+        st.caption("Belum ada run yang direkam.")
+        return
+
+    run = st.selectbox(
+        "Run",
+        runs,
+        format_func=lambda run: f"{run.started:%H:%M:%S} · {run.label} · {run.seconds:.2f}s",
+        key="profile_run"
+    )
+    stages = run.to_frame()
+    # Indentasi menunjukkan stage yang berada di dalam stage lain
+    stages['stage'] = [('· ' * depth) + name for name, depth in zip(stages['stage'], stages['depth'])]
+    st.dataframe(
+        stages.drop(columns='depth'),
+        hide_index=True,
+        column_config={
+            'seconds': st.column_config.NumberColumn("Seconds", format="%.3f"),
+            'rows': st.column_config.NumberColumn("Rows", format="%d"),
+            'memory_delta_mb': st.column_config.NumberColumn("Δ Memory (MB)", format="%.1f"),
+            'cached': st.column_config.CheckboxColumn("Memo hit")
+        }
+    )
+    st.download_button(
+        "⬇️ Export JSON lines",
+        data='\n'.join(json.dumps(record, default=str) for run in runs for record in run.log_records()),
+        file_name="dashboard_profile.jsonl",
+        mime="application/x-ndjson",
+        key="profile_export"
+    )
@@ -0,0 +1,273 @@
+"""Synthetic transaction data in the dashboard's CSV layout.
+
+Every step is vectorized over invoices or rows, and data is produced in
+chunks, so datasets of tens of millions of rows can be written to disk
+without holding them in memory. The generator models:
+
+- a product catalog with skewed popularity and fixed unit prices;
+- customers with skewed activity and a fixed country;
+- basket sizes from a configurable distribution;
+- products that are often bought together (bundles);
+- yearly seasonality of the invoice dates;
+- cancelled invoices (``C`` prefix, negative quantities).
+
+Usage:
+    python -m components.sample_data sample.csv --rows 10000000 --customers 100000 --products 5000
+"""
+
+import argparse
+import gzip
+import sys
+import time
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+# Nomor invoice pertama, sama seperti dataset Online Retail
+FIRST_INVOICE = 536365
+
+# Format tanggal seperti file ekspor asli
+DATE_FORMAT = '%m/%d/%Y %H:%M'
+
+COUNTRIES = ['United Kingdom', 'Germany', 'France', 'EIRE', 'Spain', 'Netherlands', 'Belgium', 'Switzerland']
+COUNTRY_WEIGHTS = [0.82, 0.05, 0.04, 0.03, 0.02, 0.02, 0.01, 0.01]
+
+_COLOURS = ['WHITE', 'RED', 'BLUE', 'PINK', 'GREEN', 'BLACK', 'VINTAGE', 'RETRO']
+_PRODUCTS = [
+    'COFFEE MUG', 'LAPTOP SLEEVE', 'WATER BOTTLE', 'NOTEBOOK SET', 'PHONE CHARGER',
+    'DESK LAMP', 'MOUSE PAD', 'BACKPACK', 'WIRELESS MOUSE', 'KEYBOARD',
+    'LUNCH BAG', 'CANDLE HOLDER', 'PHOTO FRAME', 'WALL CLOCK', 'CUSHION COVER'
+]
+
+
+def _geometric_sizes(rng, n, mean):
+    return rng.geometric(1 / mean, n)
+
+
+def _poisson_sizes(rng, n, mean):
+    return 1 + rng.poisson(mean - 1, n)
+
+
+def _lognormal_sizes(rng, n, mean):
+    # Ekor panjang: sebagian kecil invoice sangat besar (pembeli grosir)
+    sigma = 1.0
+    return np.maximum(1, np.rint(rng.lognormal(np.log(mean) - sigma ** 2 / 2, sigma, n))).astype(np.int64)
+
+
+# Nama distribusi -> fungsi (rng, jumlah invoice, rata-rata) -> ukuran basket (>= 1)
+BASKET_SIZE_DISTRIBUTIONS = {
+    'geometric': _geometric_sizes,
+    'poisson': _poisson_sizes,
+    'lognormal': _lognormal_sizes
+}
+
+
+def product_names(products: int) -> list:
+    """Unique product descriptions, e.g. ``WHITE COFFEE MUG``."""
+    combinations = len(_COLOURS) * len(_PRODUCTS)
+    names = []
+    for i in range(products):
+        name = f"{_COLOURS[(i // len(_PRODUCTS)) % len(_COLOURS)]} {_PRODUCTS[i % len(_PRODUCTS)]}"
+        if i >= combinations:
+            name = f"{name} {i // combinations + 1}"
+        names.append(name)
+    return names
+
+
+class SampleDataGenerator:
+    """Vectorized generator of synthetic transactions.
+
+    The catalog and customer base are drawn once in the constructor; rows
+    are then produced chunk by chunk with ``chunks``. The same seed and
+    chunk size always give the same data.
+
+    Args:
+        customers: Number of customers
+        products: Catalog size
+        basket_size_mean: Average number of lines per invoice
+        basket_size_distribution: One of ``BASKET_SIZE_DISTRIBUTIONS``
+        seasonality: Relative amplitude of the yearly cycle (0 = flat)
+        peak_day: Day of year with the most invoices
+        cancellation_rate: Fraction of cancelled invoices
+        bundle_rate: Probability that a line is the usual companion of the previous line
+        popularity_skew: Zipf exponent of product popularity (0 = uniform)
+        start: First invoice date
+        days: Length of the period in days
+        seed: Random seed
+    """
+
+    def __init__(self, customers: int = 4000, products: int = 500, basket_size_mean: float = 8.0,
+                 basket_size_distribution: str = 'geometric', seasonality: float = 0.5, peak_day: int = 330,
+                 cancellation_rate: float = 0.02, bundle_rate: float = 0.2, popularity_skew: float = 1.0,
+                 start: str = '2010-12-01', days: int = 365, seed: int = 42):
+        if basket_size_distribution not in BASKET_SIZE_DISTRIBUTIONS:
+            raise ValueError(f"Unknown basket size distribution: {basket_size_distribution}")
+        if not 0 <= seasonality < 1:
+            raise ValueError("seasonality must be in [0, 1)")
+        if basket_size_mean < 1:
+            raise ValueError("basket_size_mean must be at least 1")
+
+        self.basket_size_mean = basket_size_mean
+        self.basket_size_distribution = basket_size_distribution
+        self.cancellation_rate = cancellation_rate
+        self.bundle_rate = bundle_rate
+        self.start = pd.Timestamp(start)
+        self.days = days
+        self._rng = np.random.default_rng(seed)
+        rng = self._rng
+
+        # Katalog: popularitas Zipf, harga log-normal, dan satu produk pasangan per produk
+        names = product_names(products)
+        self._descriptions = pd.Index(names)
+        self._stock_codes = pd.Index([str(10000 + i) for i in range(products)])
+        popularity = 1 / np.arange(1, products + 1) ** popularity_skew
+        self._product_p = popularity / popularity.sum()
+        self._prices = np.maximum(0.1, np.round(rng.lognormal(1.0, 0.8, products), 2))
+        self._companions = rng.permutation(products)
+
+        # Customer: aktivitas log-normal (sedikit customer sangat aktif), negara tetap
+        activity = rng.lognormal(0.0, 1.0, customers)
+        self._customer_p = activity / activity.sum()
+        self._customer_ids = pd.Index([str(12346 + i) for i in range(customers)])
+        self._customer_country = rng.choice(len(COUNTRIES), customers, p=COUNTRY_WEIGHTS)
+        self._countries = pd.Index(COUNTRIES)
+
+        # CDF tanggal per hari: 1 + seasonality * cos(jarak ke hari puncak)
+        day_of_year = (self.start.dayofyear + np.arange(days)) % 365
+        weights = 1 + seasonality * np.cos(2 * np.pi * (day_of_year - peak_day) / 365)
+        self._day_cdf = np.concatenate([[0.0], np.cumsum(weights) / weights.sum()])
+
+    def _basket_sizes(self, rows: int) -> np.ndarray:
+        """Invoice sizes that add up to exactly ``rows`` (the last invoice is cut)."""
+        sampler = BASKET_SIZE_DISTRIBUTIONS[self.basket_size_distribution]
+        sizes = sampler(self._rng, int(rows / self.basket_size_mean * 1.2) + 1, self.basket_size_mean)
+        while sizes.sum() < rows:
+            sizes = np.concatenate([sizes, sampler(self._rng, len(sizes) // 2 + 1, self.basket_size_mean)])
+        ends = np.cumsum(sizes)
+        last = int(np.searchsorted(ends, rows))
+        sizes = sizes[:last + 1].copy()
+        sizes[-1] -= ends[last] - rows
+        return sizes
+
+    def _invoice_dates(self, fractions: np.ndarray) -> np.ndarray:
+        """Map positions in the dataset (0-1) to dates, following the seasonal CDF."""
+        day = np.interp(fractions, self._day_cdf, np.arange(self.days + 1))
+        whole_days = np.minimum(np.floor(day), self.days - 1)
+        # Jam toko 08:00-20:00; urutan invoice tetap naik mengikuti waktu
+        minutes = whole_days * 24 * 60 + 8 * 60 + np.floor((day - whole_days) * 12 * 60)
+        return self.start.to_datetime64() + minutes.astype('timedelta64[m]')
+
+    def chunks(self, rows: int, chunk_rows: int = 1000000) -> Iterator[pd.DataFrame]:
+        """Yield ``rows`` transaction lines in frames of at most ``chunk_rows``."""
+        rng = self._rng
+        done = 0
+        next_invoice = FIRST_INVOICE
+        while done < rows:
+            n = min(chunk_rows, rows - done)
+            sizes = self._basket_sizes(n)
+            n_invoices = len(sizes)
+            starts = np.cumsum(sizes) - sizes
+            invoice_of_row = np.repeat(np.arange(n_invoices), sizes)
+            position = np.arange(n) - starts[invoice_of_row]
+
+            # Data per invoice
+            numbers = np.arange(next_invoice, next_invoice + n_invoices)
+            cancelled = rng.random(n_invoices) < self.cancellation_rate
+            labels = pd.Index(numbers.astype(str))
+            labels = labels.where(~cancelled, 'C' + labels)
+            customers = rng.choice(len(self._customer_p), n_invoices, p=self._customer_p)
+            dates = self._invoice_dates((done + starts) / rows)
+
+            # Data per baris: produk populer, sebagian diganti produk pasangan dari baris sebelumnya
+            product = rng.choice(len(self._product_p), n, p=self._product_p)
+            bundled = (position > 0) & (rng.random(n) < self.bundle_rate)
+            previous = np.concatenate([[0], product[:-1]])
+            product = np.where(bundled, self._companions[previous], product)
+            quantity = rng.geometric(0.4, n)
+            quantity = np.where(rng.random(n) < 0.03, quantity * 12, quantity)
+            quantity = np.where(cancelled[invoice_of_row], -quantity, quantity)
+
+            customer_of_row = customers[invoice_of_row]
+            yield pd.DataFrame({
+                'InvoiceNo': pd.Categorical.from_codes(invoice_of_row, labels),
+                'StockCode': pd.Categorical.from_codes(product, self._stock_codes),
+                'Description': pd.Categorical.from_codes(product, self._descriptions),
+                'Quantity': quantity,
+                'InvoiceDate': dates[invoice_of_row],
+                'UnitPrice': self._prices[product],
+                'CustomerID': pd.Categorical.from_codes(customer_of_row, self._customer_ids),
+                'Country': pd.Categorical.from_codes(self._customer_country[customer_of_row], self._countries)
+            })
+            done += n
+            next_invoice += n_invoices
+
+    def generate(self, rows: int) -> pd.DataFrame:
+        """All ``rows`` lines in one frame (small datasets)."""
+        return pd.concat(list(self.chunks(rows)), ignore_index=True)
+
+
+def _format_dates(dates: pd.Series) -> pd.Categorical:
+    """Format each distinct timestamp once; ``to_csv`` on datetimes formats every row."""
+    unique, codes = np.unique(dates.to_numpy(), return_inverse=True)
+    return pd.Categorical.from_codes(codes, pd.Index(pd.DatetimeIndex(unique).strftime(DATE_FORMAT)))
+
+
+def write_sample_csv(path: str, rows: int, chunk_rows: int = 1000000, **options) -> int:
+    """Stream synthetic transactions to a CSV file (gzip if ``path`` ends in .gz).
+
+    Only one chunk is in memory at a time.
+
+    Returns:
+        int: Number of rows written
+    """
+    generator = SampleDataGenerator(**options)
+    opener = gzip.open if path.endswith('.gz') else open
+    written = 0
+    with opener(path, 'wt', newline='') as f:
+        for chunk in generator.chunks(rows, chunk_rows):
+            chunk['InvoiceDate'] = _format_dates(chunk['InvoiceDate'])
+            chunk.to_csv(f, index=False, header=written == 0)
+            written += len(chunk)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help="Output CSV (.csv or .csv.gz)")
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--chunk-rows', type=int, default=1000000)
+    parser.add_argument('--customers', type=int, default=4000)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--basket-size-mean', type=float, default=8.0)
+    parser.add_argument('--basket-size-distribution', choices=list(BASKET_SIZE_DISTRIBUTIONS), default='geometric')
+    parser.add_argument('--seasonality', type=float, default=0.5)
+    parser.add_argument('--cancellation-rate', type=float, default=0.02)
+    parser.add_argument('--bundle-rate', type=float, default=0.2)
+    parser.add_argument('--start', default='2010-12-01')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = write_sample_csv(
+        args.path,
+        args.rows,
+        chunk_rows=args.chunk_rows,
+        customers=args.customers,
+        products=args.products,
+        basket_size_mean=args.basket_size_mean,
+        basket_size_distribution=args.basket_size_distribution,
+        seasonality=args.seasonality,
+        cancellation_rate=args.cancellation_rate,
+        bundle_rate=args.bundle_rate,
+        start=args.start,
+        days=args.days,
+        seed=args.seed
+    )
+    print(f"{written:,} rows written to {args.path} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
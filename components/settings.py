@@ -0,0 +1,79 @@
+"""Runtime settings for the dashboard.
+
+Every value can be overridden with an environment variable so a deployment
+can be tuned without touching the code.
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    return float(value)
+
+
+# Direktori cache dataset yang sudah dibersihkan (format Parquet)
+CACHE_DIR = os.environ.get(
+    'DASHBOARD_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'customer-behaviour-dashboard')
+)
+
+# Batas ukuran total cache di disk (MB), file paling lama tidak dipakai dihapus duluan
+CACHE_MAX_MB = _env_int('DASHBOARD_CACHE_MAX_MB', 2048)
+
+# Jumlah baris per chunk pada mode streaming
+STREAM_CHUNK_ROWS = _env_int('DASHBOARD_STREAM_CHUNK_ROWS', 200000)
+
+# File yang lebih besar dari batas ini (MB) otomatis dibaca dengan mode streaming
+STREAMING_THRESHOLD_MB = _env_int('DASHBOARD_STREAMING_THRESHOLD_MB', 256)
+
+# Budget memori (MB) untuk matriks basket; jika terlampaui, analisis dibatasi ke produk/transaksi teratas
+BASKET_MEMORY_BUDGET_MB = _env_int('DASHBOARD_BASKET_MEMORY_BUDGET_MB', 256)
+
+# Jumlah proses worker default untuk mining frequent itemset (1 = tanpa paralel).
+# Default 1: process pool di dalam server Streamlit hanya menguntungkan untuk basket
+# besar, jadi paralel harus dipilih sendiri lewat UI atau environment variable
+BASKET_WORKERS = _env_int('DASHBOARD_BASKET_WORKERS', 1)
+
+# Minimum support tempat frequent itemset di-mining dan di-cache; support yang lebih
+# tinggi difilter dari cache, hanya support di bawah batas ini yang memicu mining ulang
+BASKET_SUPPORT_FLOOR = _env_float('DASHBOARD_BASKET_SUPPORT_FLOOR', 0.01)
+
+# Jumlah titik maksimum per scatter chart; data yang lebih besar di-sample atau diagregasi di server
+CHART_MAX_POINTS = _env_int('DASHBOARD_CHART_MAX_POINTS', 5000)
+
+# 1 = tulis waktu dan memori per stage sebagai log JSON (logger components.profiling)
+PROFILE_LOG = _env_int('DASHBOARD_PROFILE_LOG', 0)
+
+# Jumlah run terakhir yang ditampilkan di panel profiling
+PROFILE_HISTORY = _env_int('DASHBOARD_PROFILE_HISTORY', 20)
+
+# Jumlah hasil analisis yang disimpan di memo (LRU)
+MEMO_MAX_ENTRIES = _env_int('DASHBOARD_MEMO_MAX_ENTRIES', 128)
+
+# Batas total ukuran hasil di memo (MB); hasil terlama dibuang lebih dulu
+MEMO_MAX_MB = _env_int('DASHBOARD_MEMO_MAX_MB', 1024)
+
+# Thread untuk SQL engine (DuckDB, opsional)
+SQL_THREADS = _env_int('DASHBOARD_SQL_THREADS', os.cpu_count() or 1)
+
+# Batas memori SQL engine (MB); di atas batas ini data di-spill ke SQL_TEMP_DIR
+SQL_MEMORY_LIMIT_MB = _env_int('DASHBOARD_SQL_MEMORY_LIMIT_MB', 2048)
+
+# Direktori spill SQL engine dan salinan sementara file upload (SQL engine dan
+# streaming Polars)
+SQL_TEMP_DIR = os.environ.get('DASHBOARD_SQL_TEMP_DIR', os.path.join(CACHE_DIR, 'sql-spill'))
+
+# Engine DataFrame untuk load dan agregasi: 'pandas' atau 'polars' (opsional, multi-thread)
+ENGINE = os.environ.get('DASHBOARD_ENGINE', 'pandas').strip().lower() or 'pandas'
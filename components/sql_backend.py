@@ -0,0 +1,304 @@
+"""Optional SQL backend: aggregates computed by an embedded DuckDB engine.
+
+The cleaned transactions are loaded into an in-process DuckDB database,
+either from the uploaded CSV or from its Parquet dataset cache entry, and
+every aggregate is a query on it. DuckDB runs the queries on all cores and
+spills to ``settings.SQL_TEMP_DIR`` above ``settings.SQL_MEMORY_LIMIT_MB``,
+so files larger than RAM can be analysed. The customer table is identical
+to the pandas path; the overview statistics are exact (no sampled
+quartiles) and the Market Basket item statistics are included.
+
+DuckDB is not a required dependency: check ``AVAILABLE`` before use.
+"""
+
+import codecs
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+from . import settings
+from .aggregates import CUSTOMER_AGGREGATIONS, NUMERIC_COLUMNS, TransactionAggregates
+from .date_formats import SAMPLE_ROWS, detect_format, parse_fallback
+from .profiling import stage
+
+try:
+    import duckdb
+except ImportError:  # Dependensi opsional
+    duckdb = None
+
+AVAILABLE = duckdb is not None
+
+# Fungsi agregasi pandas -> SQL. fsum (penjumlahan terkompensasi) memberi hasil
+# yang sama persis dengan sum groupby pandas, sum biasa berbeda di digit terakhir.
+_SQL_FUNCTIONS = {'min': 'min', 'max': 'max', 'count': 'count', 'sum': 'fsum'}
+
+# Nilai yang dibaca pandas.read_csv sebagai NaN
+NA_VALUES = sorted(STR_NA_VALUES)
+
+# Kolom yang wajib terisi, sama dengan dropna di clean_transactions
+_REQUIRED_COLUMNS = ['InvoiceNo', 'Description', 'Quantity', 'UnitPrice']
+
+_SPOOL_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+def connect():
+    """Open an in-memory DuckDB database with the configured threads, memory limit and spill directory."""
+    if duckdb is None:
+        raise ImportError("The SQL engine needs the 'duckdb' package: pip install duckdb")
+    os.makedirs(settings.SQL_TEMP_DIR, exist_ok=True)
+    return duckdb.connect(config={
+        'threads': settings.SQL_THREADS,
+        'memory_limit': f"{settings.SQL_MEMORY_LIMIT_MB}MB",
+        'temp_directory': settings.SQL_TEMP_DIR
+    })
+
+
+def spool_csv(file_obj, encoding: str, path: str):
+    """Copy a CSV upload to ``path`` as UTF-8, the encoding DuckDB reads natively.
+
+    Raises:
+        UnicodeDecodeError: If a byte is not valid in ``encoding``
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    file_obj.seek(0)
+    with open(path, 'w', encoding='utf-8', newline='') as out:
+        for block in iter(lambda: file_obj.read(_SPOOL_BLOCK_SIZE), b''):
+            out.write(decoder.decode(block))
+        out.write(decoder.decode(b'', final=True))
+
+
+def _literal(value: str) -> str:
+    """Quote a string as a SQL literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _date_fallback(con, required: str, fast_date: str, date_format):
+    """Parse the date strings that do not match the format, like ``parse_dates``.
+
+    The strings the fallback parser recovers are stored in the
+    ``date_fallback`` table, which only exists when there are any.
+
+    Returns:
+        dict: Date parse statistics like ``parse_dates`` without timings
+    """
+    rows = con.execute(f"SELECT count(*) FROM lines WHERE {required} AND InvoiceDate IS NOT NULL").fetchone()[0]
+    failed = con.execute(f"""
+        SELECT InvoiceDate, count(*) AS rows
+        FROM lines
+        WHERE {required} AND InvoiceDate IS NOT NULL AND {fast_date} IS NULL
+        GROUP BY InvoiceDate
+    """).df()
+    parsed = parse_fallback(failed['InvoiceDate'])
+    valid = ~parsed.isna()
+    if valid.any():
+        con.register('recovered_dates', pd.DataFrame({
+            'value': failed['InvoiceDate'].to_numpy()[valid],
+            'parsed': parsed[valid]
+        }))
+        con.execute("CREATE TABLE date_fallback AS SELECT value, CAST(parsed AS TIMESTAMP) AS parsed FROM recovered_dates")
+        con.unregister('recovered_dates')
+    return {
+        'format': date_format,
+        'rows': rows,
+        'fallback_rows': int(failed['rows'].sum()),
+        'coerced_rows': int(failed['rows'].to_numpy()[~valid].sum())
+    }
+
+
+def load_csv(con, path: str, delimiter: str):
+    """Parse and clean a UTF-8 transaction CSV into the ``transactions`` table.
+
+    Applies the rules of ``clean_transactions``: rows missing InvoiceNo,
+    Description, Quantity, UnitPrice or a valid InvoiceDate are dropped, as
+    are rows with a non-positive Quantity or UnitPrice. Malformed lines are
+    skipped like ``on_bad_lines='skip'``.
+
+    Returns:
+        tuple: (number of rows read from the file, date parse statistics)
+    """
+    # Kolom tetap dari header: baris dengan field berlebih dilewati, bukan menambah kolom
+    with open(path, encoding='utf-8', newline='') as f:
+        header = next(csv.reader(f, delimiter=delimiter), [])
+    columns = ', '.join(f"{_literal(name)}: 'VARCHAR'" for name in header)
+    null_values = ', '.join(_literal(value) for value in NA_VALUES)
+
+    with stage('sql: read csv') as record:
+        con.execute(f"""
+            CREATE TABLE lines AS
+            SELECT * REPLACE (
+                TRY_CAST(Quantity AS DOUBLE) AS Quantity,
+                TRY_CAST(UnitPrice AS DOUBLE) AS UnitPrice
+            )
+            FROM read_csv(
+                {_literal(path)}, header = true, delim = {_literal(delimiter)}, quote = '"', escape = '"',
+                columns = {{{columns}}}, auto_detect = false, nullstr = [{null_values}],
+                null_padding = true, ignore_errors = true
+            )
+        """)
+        raw_rows = con.execute("SELECT count(*) FROM lines").fetchone()[0]
+        record['rows'] = raw_rows
+
+    required = ' AND '.join(f"{column} IS NOT NULL" for column in _REQUIRED_COLUMNS)
+    # Format dideteksi dari sample yang sama dengan parse_dates: tanggal pertama setelah dropna
+    sample = con.execute(
+        f"SELECT InvoiceDate FROM lines WHERE {required} AND InvoiceDate IS NOT NULL LIMIT {SAMPLE_ROWS}"
+    ).fetchall()
+    date_format = detect_format(value for value, in sample)
+    if date_format is not None:
+        fast_date = f"try_strptime(lines.InvoiceDate, {_literal(date_format)})"
+    else:
+        fast_date = "CAST(NULL AS TIMESTAMP)"
+
+    with stage('sql: parse dates', rows=raw_rows):
+        date_stats = _date_fallback(con, required, fast_date, date_format)
+    if date_stats['fallback_rows'] > date_stats['coerced_rows']:
+        # Join mengacak urutan baris, jadi diurutkan kembali sesuai urutan file
+        invoice_date = f"coalesce({fast_date}, date_fallback.parsed)"
+        source = "lines LEFT JOIN date_fallback ON lines.InvoiceDate = date_fallback.value"
+        order = "ORDER BY file_row"
+    else:
+        invoice_date, source, order = fast_date, "lines", ""
+
+    with stage('sql: clean', rows=raw_rows):
+        con.execute(f"""
+            CREATE TABLE transactions AS
+            SELECT * EXCLUDE (file_row), Quantity * UnitPrice AS TotalAmount
+            FROM (
+                SELECT lines.* REPLACE ({invoice_date} AS InvoiceDate), lines.rowid AS file_row
+                FROM {source}
+                WHERE {required}
+            )
+            WHERE InvoiceDate IS NOT NULL AND Quantity > 0 AND UnitPrice > 0
+            {order}
+        """)
+        con.execute("DROP TABLE lines")
+    return raw_rows, date_stats
+
+
+def load_parquet(con, path: str):
+    """Expose a cleaned dataset from the Parquet dataset cache as ``transactions``."""
+    columns = [
+        row[0] for row in con.execute(f"DESCRIBE SELECT * FROM read_parquet({_literal(path)})").fetchall()
+        if not row[0].startswith('__index_level_')
+    ]
+    con.execute(
+        f"CREATE VIEW transactions AS SELECT {', '.join(columns)} FROM read_parquet({_literal(path)})"
+    )
+
+
+def customer_table(con) -> pd.DataFrame:
+    """Per-customer aggregates of ``CUSTOMER_AGGREGATIONS``, sorted by CustomerID like a pandas groupby."""
+    aggregations = ', '.join(
+        f"{_SQL_FUNCTIONS[function]}({source}) AS {column}"
+        for column, (source, function) in CUSTOMER_AGGREGATIONS.items()
+    )
+    with stage('sql: customers') as record:
+        customers = con.execute(f"""
+            SELECT CustomerID, {aggregations}
+            FROM transactions
+            WHERE CustomerID IS NOT NULL
+            GROUP BY CustomerID
+            ORDER BY CustomerID
+        """).df()
+        record['rows'] = len(customers)
+    for column in customers.columns:
+        if pd.api.types.is_datetime64_any_dtype(customers[column]):
+            customers[column] = customers[column].astype('datetime64[ns]')
+    return customers
+
+
+def describe(con) -> pd.DataFrame:
+    """Summary statistics of the numeric columns, in the layout of ``DataFrame.describe``."""
+    means = ', '.join(f"fsum({column}) / count({column}) AS mean_{column}" for column in NUMERIC_COLUMNS)
+    statistics = ', '.join(
+        f"count({column}), any_value(mean_{column}), "
+        f"sqrt(fsum(({column} - mean_{column}) ** 2) / (count({column}) - 1)), "
+        f"min({column}), quantile_cont({column}, [0.25, 0.5, 0.75]), max({column})"
+        for column in NUMERIC_COLUMNS
+    )
+    row = con.execute(f"""
+        WITH means AS (SELECT {means} FROM transactions)
+        SELECT {statistics} FROM transactions, means
+    """).fetchone()
+
+    stats = {}
+    for position, column in enumerate(NUMERIC_COLUMNS):
+        count, mean, std, minimum, quartiles, maximum = row[position * 6:(position + 1) * 6]
+        stats[column] = [
+            count,
+            mean,
+            std if count > 1 else np.nan,
+            minimum,
+            *quartiles,
+            maximum
+        ]
+    return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'], dtype='float64')
+
+
+def basket_stats(con, whole_quantity: bool):
+    """Item statistics and summary of the Market Basket tab.
+
+    Same values as ``prepare_basket_data`` and ``build_basket``; products
+    with an equal Transaction_Count are ordered by Description.
+
+    Returns:
+        tuple: (item_stats indexed by Description, summary dict)
+    """
+    basket = "FROM transactions WHERE Quantity > 0 AND NOT contains(InvoiceNo, 'C')"
+    with stage('sql: basket items') as record:
+        item_stats = con.execute(f"""
+            SELECT
+                Description,
+                count(Quantity) AS Total_Units,
+                CAST(sum(Quantity) AS DOUBLE) AS Total_Quantity,
+                count(DISTINCT InvoiceNo) AS Transaction_Count
+            {basket}
+            GROUP BY Description
+            ORDER BY Transaction_Count DESC, Description
+        """).df().set_index('Description')
+        record['rows'] = len(item_stats)
+    if whole_quantity:
+        # Sama dengan Quantity yang di-downcast ke integer oleh compact_transactions
+        item_stats['Total_Quantity'] = item_stats['Total_Quantity'].astype('int64')
+
+    total_transactions, avg_basket_size = con.execute(f"""
+        SELECT count(*), avg(items)
+        FROM (SELECT InvoiceNo, count(DISTINCT Description) AS items {basket} GROUP BY InvoiceNo)
+    """).fetchone()
+    summary = {
+        'total_transactions': total_transactions,
+        'total_products': len(item_stats),
+        'avg_basket_size': avg_basket_size
+    }
+    return item_stats, summary
+
+
+def build_aggregates(con) -> TransactionAggregates:
+    """Run every aggregate query on the ``transactions`` table or view."""
+    records, min_date, max_date, whole_quantity = con.execute("""
+        SELECT count(*), min(InvoiceDate), max(InvoiceDate), bool_and(Quantity = trunc(Quantity))
+        FROM transactions
+    """).fetchone()
+    if not records:
+        raise ValueError("No valid transactions found")
+
+    customers = customer_table(con)
+    with stage('sql: overview'):
+        summary_stats = describe(con)
+        head = con.execute("SELECT * FROM transactions LIMIT 5").df()
+    item_stats, basket_summary = basket_stats(con, whole_quantity)
+
+    overview = {
+        'records': records,
+        'min_date': pd.Timestamp(min_date),
+        'max_date': pd.Timestamp(max_date),
+        'customers': len(customers),
+        'describe': summary_stats,
+        'head': head,
+        'item_stats': item_stats,
+        'basket_summary': basket_summary
+    }
+    return TransactionAggregates(customers, overview)
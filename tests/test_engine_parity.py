@@ -0,0 +1,142 @@
+"""RFM, churn and CLV results must not depend on the engine.
+
+Each engine loads the same small synthetic CSV and its per-customer tables
+are compared with the in-memory pandas path. Scores, churn flags, counts
+and dates must be identical; monetary columns of the streamed engines are
+merged from partial sums and may differ in the last digit only.
+
+Run with ``python -m pytest tests``; the Polars and DuckDB cases are
+skipped when those optional packages are not installed.
+"""
+
+import contextlib
+
+import pandas as pd
+import pytest
+
+from components import memo, settings
+from components.analysis.churn_analysis import calculate_churn, churn_table
+from components.analysis.clv_analysis import calculate_clv
+from components.analysis.rfm_analysis import calculate_rfm
+from components.data_loader import load_transactions, sql_aggregates, stream_aggregates
+from components.sample_data import write_sample_csv
+
+# Toleransi relatif untuk jumlah uang dari engine yang menjumlahkan per bagian
+MONETARY_RTOL = 1e-12
+
+MONETARY_COLUMNS = ['Monetary', 'Avg_Order_Value', 'CLV']
+
+CHURN_DAYS = [30, 90, 180]
+
+
+@contextlib.contextmanager
+def use_engine(engine: str):
+    """Switch ``settings.ENGINE`` and start with an empty memo."""
+    previous = settings.ENGINE
+    settings.ENGINE = engine
+    memo.clear()
+    try:
+        yield
+    finally:
+        settings.ENGINE = previous
+        memo.clear()
+
+
+def customer_tables(data) -> dict:
+    """RFM, churn and CLV tables of a transaction frame or aggregates."""
+    tables = {
+        'rfm': calculate_rfm(data),
+        'churn': calculate_churn(data),
+        'clv': calculate_clv(data)
+    }
+    for churn_days in CHURN_DAYS:
+        tables[f'churn_{churn_days}'] = churn_table(data, churn_days)
+    return tables
+
+
+def load_pandas_stream(path):
+    with open(path, 'rb') as f:
+        return stream_aggregates(f)
+
+
+def load_polars(path):
+    pytest.importorskip('polars')
+    with open(path, 'rb') as f:
+        return load_transactions(f)
+
+
+def load_polars_stream(path):
+    pytest.importorskip('polars')
+    with open(path, 'rb') as f:
+        return stream_aggregates(f)
+
+
+def load_sql(path):
+    pytest.importorskip('duckdb')
+    with open(path, 'rb') as f:
+        return sql_aggregates(f)
+
+
+# Nama kasus -> (settings.ENGINE, loader, apakah jumlah uang dihitung per bagian)
+ENGINE_CASES = {
+    'pandas-stream': ('pandas', load_pandas_stream, True),
+    'polars': ('polars', load_polars, False),
+    'polars-stream': ('polars', load_polars_stream, True),
+    'sql': ('pandas', load_sql, True)
+}
+
+
+@pytest.fixture(scope='module')
+def transactions_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('data') / 'transactions.csv'
+    write_sample_csv(str(path), 20000, customers=400, products=150, seed=7)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Empty dataset cache per test, so every engine reads the CSV itself."""
+    monkeypatch.setattr(settings, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(settings, 'SQL_TEMP_DIR', str(tmp_path / 'spool'))
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    """Customers in CustomerID order with text and categorical columns as plain strings."""
+    frame = frame.copy()
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype) or frame[column].dtype == object:
+            frame[column] = frame[column].astype(str)
+    return frame.sort_values('CustomerID').reset_index(drop=True)
+
+
+@pytest.fixture
+def expected(transactions_csv):
+    with use_engine('pandas'), open(transactions_csv, 'rb') as f:
+        return customer_tables(load_transactions(f))
+
+
+@pytest.mark.parametrize('case', list(ENGINE_CASES))
+def test_customer_tables_match_pandas(case, transactions_csv, expected):
+    engine, load, partial_sums = ENGINE_CASES[case]
+    with use_engine(engine):
+        actual = customer_tables(load(transactions_csv))
+
+    assert set(actual) == set(expected)
+    for name, table in expected.items():
+        table, other = _normalize(table), _normalize(actual[name])
+        inexact = [column for column in MONETARY_COLUMNS if partial_sums and column in table.columns]
+        pd.testing.assert_frame_equal(
+            table.drop(columns=inexact), other.drop(columns=inexact), check_exact=True, obj=f"{case} {name}"
+        )
+        for column in inexact:
+            pd.testing.assert_series_equal(
+                table[column], other[column], rtol=MONETARY_RTOL, obj=f"{case} {name}.{column}"
+            )
+
+
+def test_fixture_covers_every_score(expected):
+    # Tanpa variasi skor, perbandingan di atas tidak menguji apa-apa
+    rfm = expected['rfm']
+    for column in ['R_Score', 'F_Score', 'M_Score']:
+        assert rfm[column].nunique() == 4
+    assert expected['churn_90']['Churned'].nunique() == 2